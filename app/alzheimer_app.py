@@ -1,13 +1,50 @@
+import time
+import importlib
+import threading
+START_TIME = time.perf_counter()
+
 import gradio as gr
 
 # Import configurations
-from config import IMAGES_DIRECTORY, MODELS_DIRECTORY
+from config import IMAGES_DIRECTORY, MODELS_DIRECTORY, PREWARM_TENSORFLOW, TTA_MAX_VIEWS
+
+# Import custom functions (jobs only needs the standard library)
+from jobs import submit_train_job, submit_eval_job, refresh_jobs, cancel_job, JOB_HEADERS
+from src.errors import PipelineError
+
+# Tab modules import TensorFlow, Keras applications, sklearn, seaborn... -> imported on first use
+TAB_MODULES = ["batch_creator", "train_val", "test_eval", "multi_test", "batch_predict"]
+
+# Pipeline errors are shown in the UI as gr.Error
+def lazy_function(module_name, function_name):
+    def wrapper(*args, **kwargs):
+        try:
+            return getattr(importlib.import_module(module_name), function_name)(*args, **kwargs)
+        except PipelineError as e:
+            raise gr.Error(str(e))
+    wrapper.__name__ = function_name
+    return wrapper
+
+# Import TensorFlow and the tab modules in the background once the UI is up
+def prewarm():
+    start = time.perf_counter()
+    for module_name in TAB_MODULES:
+        importlib.import_module(module_name)
+    print(f"🔥 Tab modules pre-warmed in {time.perf_counter() - start:.1f} s")
+
+batch_creator_func = lazy_function("batch_creator", "batch_creator_func")
+train_val_func = lazy_function("train_val", "train_val_func")
+test_eval_func = lazy_function("test_eval", "test_eval_func")
+multi_test_func = lazy_function("multi_test", "multi_test_func")
+batch_predict_func = lazy_function("batch_predict", "batch_predict_func")
+
+# Available models
+MODEL_NAMES = ["Inception", "ResNet50", "ResNet50V2",
+               "ResNet101", "ResNet101V2", "ResNet152",
+               "ResNet152V2", "VGG16", "VGG19", "Xception", "MobileNetV2"]
 
-# Import custom functions
-from batch_creator import batch_creator_func
-from train_val import train_val_func
-from test_eval import test_eval_func
-from multi_test import multi_test_func
+# Inference backends (TFLite models are exported with helper/tflite_export.py)
+BACKENDS = ["Keras", "TFLite (dynamic)", "TFLite (int8)"]
 
 # Load README.md
 def load_readme():
@@ -24,7 +61,9 @@ batch_creator = gr.Interface(
     fn=batch_creator_func,
     inputs=[gr.FileExplorer(label="Select image folder", file_count="single", root_dir=IMAGES_DIRECTORY, ignore_glob=("*.txt")),
             gr.Textbox(label="Name of the new dataset"),
-            gr.Number(label="Number of images per class", minimum=0, key=int)],
+            gr.Number(label="Number of images per class", minimum=0, key=int),
+            gr.Checkbox(label="Write packed shards (faster training and evaluation input)", value=False),
+            gr.Checkbox(label="Scan for unreadable and near-duplicate images before splitting", value=True)],
     outputs=gr.TextArea(label="Results"),
     description="# Image Dataset Creator",
     flagging_mode="never"
@@ -34,12 +73,14 @@ train_val = gr.Interface(
     fn=train_val_func,
     inputs=[gr.FileExplorer(label="Select image training folder", file_count="single", root_dir=IMAGES_DIRECTORY, glob=("*.csv")),
             gr.FileExplorer(label="Select image validation folder", file_count="single", root_dir=IMAGES_DIRECTORY, glob=("*.csv")),
-            gr.Radio(["Inception", "ResNet50", "ResNet50V2",
-                      "ResNet101", "ResNet101V2", "ResNet152",
-                      "ResNet152V2", "VGG16", "VGG19", "Xception"], label="Select a model to train"),
-            gr.Number(label="Number of training iterations", minimum=0, key=int)],
+            gr.Radio(MODEL_NAMES, label="Select a model to train"),
+            gr.Number(label="Number of training iterations", minimum=0, key=int),
+            gr.Radio(["Full", "Head-only"], value="Full", label="Training mode (Head-only trains the classifier on cached backbone features)"),
+            gr.Number(label="Fine-tuning iterations after head-only training", value=0, minimum=0, precision=0),
+            gr.FileExplorer(label="Resume an interrupted run (optional: select its resume/state.json)", file_count="single", root_dir=MODELS_DIRECTORY, glob=("*state.json"))],
     outputs=[gr.TextArea(label="Results"),
-             gr.Dataframe(label="Training History", headers=("loss", "accuracy", "val_loss", "val_accuracy", "lr")),
+             gr.Dataframe(label="Training History", headers=("loss", "accuracy", "val_loss", "val_accuracy", "data_wait_ms", "compute_ms",
+                                                              "input_bound_pct", "images_per_s", "rss_mb", "epoch_time_s", "lr")),
              gr.Image(label="Training Evolution", show_download_button=False)],
     description="# Model Training and Validation",
     flagging_mode="never"
@@ -48,7 +89,9 @@ train_val = gr.Interface(
 test_val = gr.Interface(
     fn=test_eval_func,
     inputs=[gr.FileExplorer(label="Select image testing folder", file_count="single", root_dir=IMAGES_DIRECTORY, glob=("*.csv")),
-            gr.FileExplorer(label="Select a trained model", file_count="single", root_dir=MODELS_DIRECTORY, glob=("*.keras"))],
+            gr.FileExplorer(label="Select a trained model", file_count="single", root_dir=MODELS_DIRECTORY, glob=("*.keras")),
+            gr.Radio(BACKENDS, value="Keras", label="Inference backend"),
+            gr.Slider(1, TTA_MAX_VIEWS, value=1, step=1, label="Test-time augmentation views (1 = off)")],
     outputs=[gr.TextArea(label="Results"),
              gr.Image(label="Training Evolution", show_download_button=False)],
     description="# Model Evaluation",
@@ -58,17 +101,68 @@ test_val = gr.Interface(
 multi_test = gr.Interface(
     fn=multi_test_func,
     inputs=[gr.Image(label= "Upload an image", sources="upload", type="pil"),
-            gr.FileExplorer(label="Select a trained model", file_count="single", root_dir=MODELS_DIRECTORY, glob=("*.keras"))],
+            gr.FileExplorer(label="Select a trained model", file_count="single", root_dir=MODELS_DIRECTORY, glob=("*.keras")),
+            gr.Radio(BACKENDS, value="Keras", label="Inference backend"),
+            gr.Slider(1, TTA_MAX_VIEWS, value=1, step=1, label="Test-time augmentation views (1 = off)")],
     outputs=gr.TextArea(label="Results"),
     description="# Single Image Prediction",
     flagging_mode="never"
 )
 
+batch_predict = gr.Interface(
+    fn=batch_predict_func,
+    inputs=[gr.FileExplorer(label="Select image folder or .csv", file_count="single", root_dir=IMAGES_DIRECTORY, ignore_glob=("*.txt")),
+            gr.FileExplorer(label="Select a trained model", file_count="single", root_dir=MODELS_DIRECTORY, glob=("*.keras")),
+            gr.Number(label="Batch size", value=16, minimum=1, precision=0),
+            gr.Radio(BACKENDS, value="Keras", label="Inference backend"),
+            gr.Slider(1, TTA_MAX_VIEWS, value=1, step=1, label="Test-time augmentation views (1 = off)")],
+    outputs=[gr.TextArea(label="Results"),
+             gr.File(label="Predictions CSV")],
+    description="# Batch Image Prediction",
+    flagging_mode="never"
+)
+
+with gr.Blocks() as jobs_tab:
+    gr.Markdown("# Background Jobs")
+    with gr.Accordion("Queue a training job", open=False):
+        job_train_set = gr.FileExplorer(label="Select image training folder", file_count="single", root_dir=IMAGES_DIRECTORY, glob=("*.csv"))
+        job_val_set = gr.FileExplorer(label="Select image validation folder", file_count="single", root_dir=IMAGES_DIRECTORY, glob=("*.csv"))
+        job_model = gr.Radio(MODEL_NAMES, label="Select a model to train")
+        job_epochs = gr.Number(label="Number of training iterations", minimum=0, precision=0)
+        job_mode = gr.Radio(["Full", "Head-only"], value="Full", label="Training mode")
+        job_fine_tune = gr.Number(label="Fine-tuning iterations after head-only training", value=0, minimum=0, precision=0)
+        job_resume = gr.FileExplorer(label="Resume an interrupted run (optional: select its resume/state.json)", file_count="single", root_dir=MODELS_DIRECTORY, glob=("*state.json"))
+        job_train_btn = gr.Button("Queue training")
+    with gr.Accordion("Queue an evaluation job", open=False):
+        job_test_set = gr.FileExplorer(label="Select image testing folder", file_count="single", root_dir=IMAGES_DIRECTORY, glob=("*.csv"))
+        job_trained_model = gr.FileExplorer(label="Select a trained model", file_count="single", root_dir=MODELS_DIRECTORY, glob=("*.keras"))
+        job_backend = gr.Radio(BACKENDS, value="Keras", label="Inference backend")
+        job_tta = gr.Slider(1, TTA_MAX_VIEWS, value=1, step=1, label="Test-time augmentation views (1 = off)")
+        job_eval_btn = gr.Button("Queue evaluation")
+
+    job_status = gr.Textbox(label="Status", interactive=False)
+    job_table = gr.Dataframe(label="Jobs", headers=JOB_HEADERS, interactive=False)
+    with gr.Row():
+        job_selected = gr.Dropdown(label="Job", choices=[], interactive=True)
+        job_cancel_btn = gr.Button("Cancel job", variant="stop")
+    job_log = gr.TextArea(label="Job log", interactive=False, max_lines=30)
+
+    job_outputs = [job_table, job_selected, job_log]
+    job_train_btn.click(submit_train_job, [job_train_set, job_val_set, job_model, job_epochs, job_mode, job_fine_tune, job_resume], [job_status] + job_outputs)
+    job_eval_btn.click(submit_eval_job, [job_test_set, job_trained_model, job_backend, job_tta], [job_status] + job_outputs)
+    job_cancel_btn.click(cancel_job, job_selected, [job_status] + job_outputs)
+    job_selected.input(refresh_jobs, job_selected, job_outputs)
+    gr.Timer(2).tick(refresh_jobs, job_selected, job_outputs)
+
 app = gr.TabbedInterface(
-    [info_tab, batch_creator, train_val, test_val, multi_test],
-    ["Introduction", "Batch Creator", "Training and Validation", "Model Evaluation", "Single Predictions"],
+    [info_tab, batch_creator, train_val, test_val, multi_test, batch_predict, jobs_tab],
+    ["Introduction", "Batch Creator", "Training and Validation", "Model Evaluation", "Single Predictions", "Batch Predictions", "Jobs"],
     title="🧠 Alzheimer Prediction App"
 )
 
 if __name__ == "__main__":
-    app.launch(inbrowser=True)
\ No newline at end of file
+    app.launch(inbrowser=True, prevent_thread_lock=True)
+    print(f"🚀 UI ready in {time.perf_counter() - START_TIME:.1f} s")
+    if PREWARM_TENSORFLOW:
+        threading.Thread(target=prewarm, daemon=True).start()
+    app.block_thread()
\ No newline at end of file
@@ -1,59 +1,84 @@
 # type: ignore
 import os
 import shutil
-import random
-import gradio as gr
 
 # Import configurations
 from config import IMAGES_DIRECTORY
 
 # Import custom modules
-from src.data_utils import split_data, save_images, create_dataframes
-
-def batch_creator_func(images_set, set_name, set_size):
-    final_msg = "⚠️ An error occurred during set creation."
-
+from src.data_utils import split_data, save_images
+from src.manifest_utils import build_manifest, sample_manifest
+from src.shard_utils import write_packed_split
+from src.integrity_utils import check_dataset
+from src.errors import PipelineError
+
+HOLDOUT_FRACTION = 0.2  # Test and Val share of the rows in split_data
+
+# integrity_scan: drop unreadable images and keep near-duplicate groups within a single split.
+# Writes <output_dir>/<set_name>/ -> dict with the summary message, the dataset folder and split sizes.
+def create_dataset(images_set, set_name, set_size, packed_shards=False, integrity_scan=True,
+                   output_dir=IMAGES_DIRECTORY):
     # Basic validations
     if not images_set or not os.path.isdir(images_set):
-        raise gr.Error("❌ Invalid directory selected.")
+        raise PipelineError("❌ Invalid directory selected.")
 
     if not set_name:
-        raise gr.Error("❌ Dataset name cannot be empty.")
+        raise PipelineError("❌ Dataset name cannot be empty.")
 
     # Validate invalid characters in the name
     invalid_chars = r'\/:*?"<>|'
     if any(c in set_name for c in invalid_chars):
-        raise gr.Error("❌ Invalid name. Avoid using / \\ : * ? \" < > |")
+        raise PipelineError("❌ Invalid name. Avoid using / \\ : * ? \" < > |")
 
-    random.seed(42)
-    class_images = {
-        cls: os.listdir(os.path.join(images_set, cls))
-        for cls in os.listdir(images_set)
-        if os.path.isdir(os.path.join(images_set, cls))
-    }
+    # Index the class folders (only folders changed since the last run are rescanned)
+    manifest = build_manifest(images_set)
 
-    if not class_images:
-        raise gr.Error("❌ No class folders found.")
+    if not manifest:
+        raise PipelineError("❌ No class folders found.")
 
-    min_count = min(len(imgs) for imgs in class_images.values() if imgs)
-    if min_count == 0:
-        raise gr.Error("❌ Some class folder is empty.")
+    if any(entry["count"] == 0 for entry in manifest.values()):
+        raise PipelineError("❌ Some class folder is empty.")
+    min_count = min(entry["count"] for entry in manifest.values())
 
     set_size_value = int(set_size) if set_size and int(set_size) > 0 else min_count
 
     # Create base output directory
-    output_base_dir = os.path.join(IMAGES_DIRECTORY, set_name)
+    output_base_dir = os.path.join(output_dir, set_name)
     if os.path.exists(output_base_dir):
         shutil.rmtree(output_base_dir)
     os.makedirs(output_base_dir, exist_ok=True)
 
-    # Create dataframe from original dataset
-    full_df = create_dataframes(images_set)
-
-    # Now sample per class
-    data_df = full_df.groupby('classes').apply(
-        lambda x: x.sample(min(set_size_value, len(x)), random_state=42)
-    ).reset_index(drop=True)
+    # Seeded per-class sampling streamed from the manifest
+    data_df = sample_manifest(images_set, manifest, set_size_value, seed=42)
+
+    # Decodability check + perceptual hashes (cached per file), before splitting
+    integrity_msg = ""
+    stats = None
+    if integrity_scan:
+        data_df, corrupt_df, stats = check_dataset(images_set, data_df)
+        if not corrupt_df.empty:
+            corrupt_df.to_csv(os.path.join(output_base_dir, 'corrupt_images.csv'), index=False)
+        group_sizes = data_df['group'].map(data_df['group'].value_counts())
+        if (group_sizes > 1).any():
+            data_df[group_sizes > 1].sort_values('group').to_csv(
+                os.path.join(output_base_dir, 'near_duplicates.csv'), index=False)
+        if data_df.empty:
+            raise PipelineError("❌ No readable images found.")
+        integrity_msg = (
+            f"\n🔍 Integrity scan: {stats['scanned']} scanned, {stats['cached']} unchanged (cached)"
+            f"\n🚫 Unreadable images excluded: {stats['corrupt']}"
+            f"\n👯 Near-duplicate groups: {stats['duplicate_groups']} ({stats['duplicate_images']} images, "
+            f"{stats['mixed_class_groups']} with mixed classes, largest {stats['largest_group']} images), "
+            f"each kept in a single split"
+        )
+        # Chained near-duplicates can merge into one big group; a group larger than a holdout skews the splits
+        holdout_size = int(len(data_df) * HOLDOUT_FRACTION)
+        if stats['largest_group'] > holdout_size:
+            warning = (f"⚠️ Largest near-duplicate group ({stats['largest_group']} images) exceeds a "
+                       f"{HOLDOUT_FRACTION:.0%} holdout ({holdout_size} images): split sizes will be skewed. "
+                       f"Check near_duplicates.csv or disable the integrity scan.")
+            print(warning)
+            integrity_msg += f"\n{warning}"
 
     train_df, val_df, test_df = split_data(data_df)
 
@@ -65,7 +90,14 @@ def batch_creator_func(images_set, set_name, set_size):
     # save_images(val_df, output_base_dir, "Val")
     # save_images(test_df, output_base_dir, "Test")
 
-    classes = ", ".join(sorted(class_images.keys()))
+    # Packed shards (resized to IMG_SHAPE), read by training and evaluation instead of the images
+    shards_msg = ""
+    if packed_shards:
+        for split_name, split_df in (("Train", train_df), ("Val", val_df), ("Test", test_df)):
+            meta = write_packed_split(split_df, os.path.join(output_base_dir, split_name))
+            shards_msg += f"\n📦 {split_name} shards: {len(meta['shards'])}"
+
+    classes = ", ".join(sorted(manifest.keys()))
 
     final_msg = (
         f"✅ Dataset created successfully.\n"
@@ -75,6 +107,12 @@ def batch_creator_func(images_set, set_name, set_size):
         f"🔹 Train size: {len(train_df)} images\n"
         f"🔹 Val size: {len(val_df)} images\n"
         f"🔹 Test size: {len(test_df)} images"
+        f"{integrity_msg}"
+        f"{shards_msg}"
     )
 
-    return final_msg
\ No newline at end of file
+    return {"message": final_msg, "dataset_directory": output_base_dir, "integrity": stats,
+            "splits": {"train": len(train_df), "val": len(val_df), "test": len(test_df)}}
+
+def batch_creator_func(images_set, set_name, set_size, packed_shards=False, integrity_scan=True):
+    return create_dataset(images_set, set_name, set_size, packed_shards, integrity_scan)["message"]
@@ -0,0 +1,128 @@
+# type: ignore
+import os
+import csv
+import time
+from collections import deque
+from datetime import datetime
+import pandas as pd
+import tensorflow as tf
+
+# Import custom modules
+from src.data_utils import load_image, preprocess_image, AUTOTUNE
+from src.model_cache import get_model
+from src.tflite_utils import resolve_backend
+from src.tta_utils import TTAModel
+from src.errors import PipelineError
+
+# Import configurations
+from config import MODELS_DIRECTORY, CLASS_NAMES, BATCH_SIZE
+
+IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif")
+
+# Folder (recursive) or CSV with a 'filepaths' column -> image paths, one at a time
+def iter_image_paths(images_source, chunksize=10000):
+    if os.path.isdir(images_source):
+        for root, _, files in os.walk(images_source):
+            for name in sorted(files):
+                if name.lower().endswith(IMAGE_EXTENSIONS):
+                    yield os.path.join(root, name)
+    else:
+        for chunk in pd.read_csv(images_source, usecols=["filepaths"], chunksize=chunksize):
+            yield from chunk["filepaths"].astype(str)
+
+# Streaming pipeline: paths are never fully listed, only a few batches are in memory.
+# pending (optional deque) receives every input path, in order, as the pipeline reads it.
+def create_prediction_dataset(images_source, batch_size=BATCH_SIZE, pending=None):
+    def paths():
+        for path in iter_image_paths(images_source):
+            if pending is not None:
+                pending.append(path)
+            yield path
+
+    data = tf.data.Dataset.from_generator(paths, output_signature=tf.TensorSpec(shape=(), dtype=tf.string))
+    data = data.map(lambda path: (path, preprocess_image(load_image(path))), num_parallel_calls=AUTOTUNE)
+    data = data.apply(tf.data.experimental.ignore_errors())  # Skip unreadable files
+    return data.batch(batch_size).prefetch(AUTOTUNE)
+
+# Predictions CSV in <output_dir>/<model>/predictions/<date>/ -> dict with the summary, CSV path and throughput
+def run_batch_prediction(images_source, mod, batch_size=BATCH_SIZE, backend="Keras", tta_views=1,
+                         output_dir=MODELS_DIRECTORY):
+    if not images_source or not os.path.exists(images_source):
+        raise PipelineError("❌ Invalid folder or CSV selected.")
+    if os.path.isfile(images_source) and not images_source.lower().endswith(".csv"):
+        raise PipelineError("❌ Select a folder of images or a .csv file.")
+    if not mod:
+        raise PipelineError("❌ No model selected.")
+
+    try:
+        model = get_model(resolve_backend(mod, backend))
+    except Exception as e:
+        raise PipelineError(f"❌ Error loading model: {e}")
+    if int(tta_views or 1) > 1:
+        model = TTAModel(model, int(tta_views))
+
+    # Create predictions directory
+    date_str = datetime.now().strftime("%Y-%m-%d_%H-%M")
+    model_og = os.path.basename(mod).split('.')[0]
+    predictions_directory = os.path.join(output_dir, model_og, "predictions", date_str)
+    os.makedirs(predictions_directory, exist_ok=True)
+    results_path = os.path.join(predictions_directory, "predictions.csv")
+    skipped_path = os.path.join(predictions_directory, "skipped.csv")
+
+    # The pipeline keeps the input order: inputs passed over before a predicted path were unreadable
+    pending = deque()
+    skipped = 0
+
+    def skip_until(path=None):
+        nonlocal skipped
+        while pending and pending[0] != path:
+            skipped_writer.writerow([pending.popleft()])
+            skipped += 1
+        if pending:
+            pending.popleft()
+
+    total = 0
+    start = time.perf_counter()
+    try:
+        with open(results_path, "w", newline="", encoding="utf-8") as f, \
+                open(skipped_path, "w", newline="", encoding="utf-8") as skipped_file:
+            writer = csv.writer(f)
+            writer.writerow(["filepaths", "predicted_class", "confidence"] + CLASS_NAMES)
+            skipped_writer = csv.writer(skipped_file)
+            skipped_writer.writerow(["filepaths"])
+
+            for paths, images in create_prediction_dataset(images_source, int(batch_size), pending):
+                preds = model.predict_on_batch(images)
+                for path, probs in zip(paths.numpy(), preds):
+                    path = path.decode("utf-8")
+                    skip_until(path)
+                    pred_index = int(probs.argmax())
+                    writer.writerow([path, CLASS_NAMES[pred_index], f"{probs[pred_index]:.5f}"] +
+                                    [f"{p:.5f}" for p in probs])
+                total += len(preds)
+            skip_until()  # Unreadable files at the end
+    except Exception as e:
+        raise PipelineError(f"❌ Unexpected error: {str(e)}") from e
+
+    if not skipped:
+        os.remove(skipped_path)
+
+    elapsed = time.perf_counter() - start
+    if total == 0:
+        raise PipelineError("❌ No readable images found.")
+
+    final_msg = (
+        f"✅ Batch prediction completed.\n"
+        f"🖼️ Images: {total}\n"
+        f"🚫 Unreadable images skipped: {skipped}" + (f" (listed in {skipped_path})" if skipped else "") + "\n"
+        f"⏱️ Time: {elapsed:.2f} s\n"
+        f"⚡ Throughput: {total / elapsed:.1f} images/sec\n"
+        f"📋 Results: {results_path}"
+    )
+
+    return {"message": final_msg, "results_path": results_path, "images": total, "skipped": skipped,
+            "skipped_path": skipped_path if skipped else None, "seconds": elapsed}
+
+def batch_predict_func(images_source, mod, batch_size=BATCH_SIZE, backend="Keras", tta_views=1):
+    result = run_batch_prediction(images_source, mod, batch_size, backend, tta_views)
+    return result["message"], result["results_path"]
@@ -0,0 +1,109 @@
+# type: ignore
+import sys
+import json
+import argparse
+import traceback
+from datetime import datetime
+
+# Import custom modules (no Gradio)
+import pipeline
+from src.errors import PipelineError
+
+# Import configurations
+from config import IMAGES_DIRECTORY, MODELS_DIRECTORY, BATCH_SIZE, TTA_MAX_VIEWS
+
+# Headless command line for the pipeline stages, e.g. for scheduled retraining or scoring on a cluster node.
+# Each stage prints one JSON summary line last on stdout (also appended to --summary).
+# Exit code: 0 success, 1 stage failure, 130 interrupted.
+# Usage: python app/cli.py batch <image folder> <dataset name> --size 500 --packed-shards
+#        python app/cli.py train images/<dataset>/train_df.csv images/<dataset>/val_df.csv ResNet50 --epochs 20
+#        python app/cli.py eval images/<dataset>/test_df.csv models/<model>/<date>/<model>.keras --tta-views 4
+#        python app/cli.py predict <image | folder | .csv> models/<model>/<date>/<model>.keras
+#        Common options: --threads 8 --batch-size 32 --output-dir /scratch/runs --summary runs.jsonl
+
+BACKENDS = ["Keras", "TFLite (dynamic)", "TFLite (int8)"]
+
+def parse_args(argv=None):
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument("--threads", type=int, help="TensorFlow intra-op threads (default: TensorFlow's choice)")
+    common.add_argument("--cpu-only", action="store_true", help="Hide the GPUs")
+    common.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+    common.add_argument("--output-dir", help=f"Output root (default: {IMAGES_DIRECTORY} for batch, "
+                                             f"{MODELS_DIRECTORY} otherwise)")
+    common.add_argument("--summary", help="Append the JSON summary line to this file")
+
+    parser = argparse.ArgumentParser(description="Alzheimer prediction pipeline (headless)")
+    stages = parser.add_subparsers(dest="stage", required=True)
+
+    batch = stages.add_parser("batch", parents=[common], help="Create a Train/Val/Test dataset")
+    batch.add_argument("images_set", help="Folder with one sub-folder of images per class")
+    batch.add_argument("set_name")
+    batch.add_argument("--size", type=int, default=0, help="Images per class (0: smallest class)")
+    batch.add_argument("--packed-shards", action="store_true")
+    batch.add_argument("--no-integrity-scan", action="store_true")
+
+    train = stages.add_parser("train", parents=[common], help="Train and validate a model")
+    train.add_argument("train_set")
+    train.add_argument("val_set")
+    train.add_argument("model", help="Architecture (e.g. ResNet50, MobileNetV2)")
+    train.add_argument("--epochs", type=int, required=True)
+    train.add_argument("--mode", choices=["Full", "Head-only"], default="Full")
+    train.add_argument("--fine-tune-epochs", type=int, default=0)
+    train.add_argument("--resume-from", help="resume/state.json of an interrupted run")
+
+    for name, help_text, source_help in (("eval", "Evaluate a trained model on a test CSV", "Test CSV"),
+                                         ("predict", "Predict an image, a folder of images or a CSV",
+                                          "Image file, image folder or CSV with a 'filepaths' column")):
+        stage = stages.add_parser(name, parents=[common], help=help_text)
+        stage.add_argument("source", help=source_help)
+        stage.add_argument("model_path", help="Trained .keras model")
+        stage.add_argument("--backend", choices=BACKENDS, default="Keras")
+        stage.add_argument("--tta-views", type=int, default=1, choices=range(1, TTA_MAX_VIEWS + 1))
+
+    args = parser.parse_args(argv)
+    if args.output_dir is None:
+        args.output_dir = IMAGES_DIRECTORY if args.stage == "batch" else MODELS_DIRECTORY
+    return args
+
+def run_stage(args):
+    if args.stage == "batch":
+        return pipeline.create_dataset(args.images_set, args.set_name, args.size, args.packed_shards,
+                                       not args.no_integrity_scan, output_dir=args.output_dir)
+    if args.stage == "train":
+        return pipeline.train(args.train_set, args.val_set, args.model, args.epochs, args.mode,
+                              args.fine_tune_epochs, args.resume_from, batch_size=args.batch_size,
+                              output_dir=args.output_dir)
+    if args.stage == "eval":
+        return pipeline.evaluate(args.source, args.model_path, args.backend, args.tta_views,
+                                 batch_size=args.batch_size, output_dir=args.output_dir)
+    return pipeline.predict(args.source, args.model_path, args.backend, args.tta_views,
+                            batch_size=args.batch_size, output_dir=args.output_dir)
+
+def emit(summary, summary_path=None):
+    line = json.dumps(summary, default=str)
+    if summary_path:
+        with open(summary_path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    print(line, flush=True)
+
+def main(argv=None):
+    args = parse_args(argv)
+    started = datetime.now().isoformat(timespec="seconds")
+    try:
+        pipeline.configure(threads=args.threads, cpu_only=args.cpu_only)
+        summary = run_stage(args)
+    except KeyboardInterrupt:
+        emit({"stage": args.stage, "status": "interrupted", "started": started}, args.summary)
+        return 130
+    except Exception as e:
+        if not isinstance(e, PipelineError):
+            traceback.print_exc()
+        print(str(e), file=sys.stderr)
+        emit({"stage": args.stage, "status": "failed", "started": started, "error": str(e)}, args.summary)
+        return 1
+
+    emit(summary, args.summary)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -11,5 +11,40 @@ MODELS_DIRECTORY = os.path.join(BASE_DIRECTORY, 'models')
 # Image size
 IMG_SHAPE = (256, 256, 3)
 
+# Input pipeline batch size
+BATCH_SIZE = 16
+
+# TensorFlow profiler trace of these global training steps, e.g. (10, 20), saved in <run>/profile (None: off)
+PROFILE_TRACE_STEPS = None
+
+# Resumable training state (weights, optimizer, epoch, callback counters) written every N epochs
+CHECKPOINT_EVERY_EPOCHS = 1
+
+# Decoded image cache (stored next to each dataset, see src/cache_utils.py)
+IMAGE_CACHE = True
+IMAGE_CACHE_MAX_GB = 20
+
+# Loaded models kept in memory (see src/model_cache.py)
+MODEL_CACHE_MAX_MB = 2048
+MODEL_WARMUP = True
+
+# Evaluation results memoized per (model file, test set) content (see src/eval_cache.py)
+EVAL_CACHE = True
+EVAL_CACHE_MAX_MB = 1024
+
+# Test-time augmentation: maximum number of views per image (see src/tta_utils.py)
+TTA_MAX_VIEWS = 8
+
+# Micro-batching of concurrent single predictions (see src/inference_server.py)
+INFERENCE_MAX_BATCH = 32
+INFERENCE_MAX_WAIT_MS = 5
+
+# Background jobs (see src/job_queue.py): concurrent jobs and TensorFlow threads per job
+JOB_MAX_CONCURRENT = 1
+JOB_THREADS = 4
+
+# Import TensorFlow and the tab modules in the background after the UI starts
+PREWARM_TENSORFLOW = True
+
 # Load class names
 CLASS_NAMES = ['Mild Demented', 'Moderate Demented', 'Non Demented', 'Very Mild Demented']
\ No newline at end of file
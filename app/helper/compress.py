@@ -0,0 +1,52 @@
+import os
+import sys
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.compress_utils import compress_model, VARIANTS
+
+# Pruned / weight-clustered variants of a trained model, saved beside it, + comparison report
+# Usage: python app/helper/compress.py models/<model>/<date>/<model>.keras images/<dataset>/train_df.csv \
+#            images/<dataset>/val_df.csv --test-csv images/<dataset>/test_df.csv --max-accuracy-drop 0.01
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("model", help="Trained .keras model")
+    parser.add_argument("train_csv", help="Training CSV used for the fine-tune")
+    parser.add_argument("val_csv")
+    parser.add_argument("--test-csv", help="Accuracy floor checked on this set (else on the validation set)")
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument("--sparsity", type=float, default=0.5, help="Fraction of kernel weights pruned")
+    parser.add_argument("--clusters", type=int, default=16, help="Distinct values per clustered kernel")
+    parser.add_argument("--epochs", type=int, default=2, help="Fine-tune epochs per variant")
+    parser.add_argument("--learning-rate", type=float, default=1e-4)
+    parser.add_argument("--accuracy-floor", type=float, help="Minimum accuracy (default: original - max drop)")
+    parser.add_argument("--max-accuracy-drop", type=float, default=0.01)
+    parser.add_argument("--latency-runs", type=int, default=50)
+    args = parser.parse_args()
+
+    report, report_path = compress_model(args.model, args.train_csv, args.val_csv, args.test_csv,
+                                         variants=args.variants, sparsity=args.sparsity, clusters=args.clusters,
+                                         fine_tune_epochs=args.epochs, learning_rate=args.learning_rate,
+                                         accuracy_floor=args.accuracy_floor,
+                                         max_accuracy_drop=args.max_accuracy_drop,
+                                         latency_runs=args.latency_runs)
+
+    metric = report["accuracy_metric"]
+    print(f"\n{'':<18}{'File (MB)':>11}{'Zip (MB)':>10}{'Load (s)':>10}{'p50 (ms)':>10}{'Sparsity':>10}"
+          f"{'Accuracy':>10}")
+    for name, row in report["models"].items():
+        flag = "" if row["meets_floor"] else "  ✗"
+        print(f"{name:<18}{row['file_size_mb']:>11.2f}{row['archive_size_mb']:>10.2f}{row['load_time_s']:>10.2f}"
+              f"{row['latency_p50_ms']:>10.2f}{row['sparsity'] * 100:>9.1f}%{row[metric] * 100:>9.2f}%{flag}")
+    print(f"\n🎯 Accuracy floor ({metric}): {report['accuracy_floor'] * 100:.2f}%")
+    if report["selected"]:
+        selected = report["models"][report["selected"]]
+        print(f"✅ Smallest model meeting the floor: {report['selected']} ({selected['path']}, "
+              f"x{selected['size_reduction']:.1f} smaller archive)")
+    else:
+        print("⚠️ No model meets the accuracy floor")
+    print(f"📋 Report: {report_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+import pandas as pd
+
+# Set before TensorFlow is imported (also inherited by the workers)
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import MODELS_DIRECTORY
+from src.cache_utils import CACHE_DIRNAME
+from src.cv_utils import cross_validate
+
+# Stratified k-fold cross-validation of one architecture, folds trained in parallel
+# Usage: python app/helper/cross_validate.py ResNet50 images/<dataset>/train_df.csv images/<dataset>/val_df.csv \
+#            --folds 5 --epochs 10 --workers 2 --threads 8
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("model", help="Architecture (MODEL_DICT key)")
+    parser.add_argument("csvs", nargs="+", help="Dataset CSVs whose rows are pooled and split into folds")
+    parser.add_argument("--folds", type=int, default=5)
+    parser.add_argument("--epochs", type=int, default=10)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--workers", type=int, help="Folds trained in parallel (default: all)")
+    parser.add_argument("--threads", type=int, default=os.cpu_count(), help="Total TensorFlow thread budget")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir")
+    args = parser.parse_args()
+
+    data_df = pd.concat([pd.read_csv(csv_path) for csv_path in args.csvs], ignore_index=True)
+    # Shared decoded images, next to the dataset (same location as the training image cache)
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(args.csvs[0])), CACHE_DIRNAME)
+    output_dir = args.output_dir or os.path.join(MODELS_DIRECTORY, args.model, "cv",
+                                                 datetime.now().strftime("%Y-%m-%d_%H-%M"))
+
+    summary, report, _ = cross_validate(data_df, cache_dir, args.model, output_dir, k=args.folds,
+                                        num_epochs=args.epochs, batch_size=args.batch_size, workers=args.workers,
+                                        thread_budget=args.threads, seed=args.seed)
+
+    print("\n📜 Classification Report (out-of-fold predictions):")
+    print(report)
+    print(f"🎯 Accuracy: {summary['val_accuracy_mean'] * 100:.2f}% ± {summary['val_accuracy_std'] * 100:.2f}%")
+    print(f"🎯 Macro F1: {summary['macro_f1_mean']:.4f} ± {summary['macro_f1_std']:.4f}")
+    print(f"✅ Cross-validation saved: {output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.distill_utils import distill
+
+# Distill a trained teacher into a small student (MobileNetV2 by default) for CPU serving
+# Usage: python app/helper/distill.py models/<model>/<date>/<model>.keras images/<dataset>/train_df.csv \
+#            images/<dataset>/val_df.csv --test-csv images/<dataset>/test_df.csv --epochs 20
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("teacher", help="Trained teacher .keras model")
+    parser.add_argument("train_csv")
+    parser.add_argument("val_csv")
+    parser.add_argument("--test-csv", help="Compare teacher and student accuracy on this set")
+    parser.add_argument("--student", default="MobileNetV2", help="Student architecture (MODEL_DICT key)")
+    parser.add_argument("--epochs", type=int, default=20)
+    parser.add_argument("--temperature", type=float, default=4.0)
+    parser.add_argument("--alpha", type=float, default=0.7, help="Weight of the soft-target loss")
+    parser.add_argument("--learning-rate", type=float, default=0.001)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--latency-runs", type=int, default=50)
+    args = parser.parse_args()
+
+    report, _, model_directory = distill(args.teacher, args.train_csv, args.val_csv, args.test_csv,
+                                         student_name=args.student, num_epochs=args.epochs,
+                                         temperature=args.temperature, alpha=args.alpha,
+                                         learning_rate=args.learning_rate, batch_size=args.batch_size,
+                                         latency_runs=args.latency_runs)
+
+    report_path = os.path.join(model_directory, "distillation_report.json")
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    costs = report["costs"]
+    print(f"\n⏱️ Latency p50: {costs['teacher']['latency_p50_ms']:.1f} ms -> {costs['student']['latency_p50_ms']:.1f} ms "
+          f"(x{report['speedup']:.1f})")
+    print(f"🧠 Weights: {costs['teacher']['memory_mb']:.0f} MB -> {costs['student']['memory_mb']:.0f} MB "
+          f"(x{report['memory_reduction']:.1f})")
+    if "test" in report:
+        print(f"🎯 Test accuracy: teacher {report['test']['teacher_accuracy'] * 100:.2f}% / "
+              f"student {report['test']['student_accuracy'] * 100:.2f}% "
+              f"(agreement {report['test']['agreement'] * 100:.1f}%)")
+    print(f"✅ Report saved: {report_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+import os
+import sys
+import time
+import argparse
+import threading
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import IMG_SHAPE
+from src.model_cache import get_model
+from src.inference_server import MicroBatcher
+
+# Latency (p50/p99) and throughput of concurrent single-image predictions,
+# direct batch-of-1 predict vs the micro-batching worker
+# Usage: python app/helper/inference_load_test.py models/<model>/<date>/<model>.keras --clients 8
+
+def run_load(predict_fn, clients, requests_per_client):
+    latencies = []
+    lock = threading.Lock()
+    rng = np.random.default_rng(42)
+    images = rng.uniform(-1, 1, size=(clients, 1) + tuple(IMG_SHAPE)).astype(np.float32)
+
+    def client(idx):
+        local = []
+        for _ in range(requests_per_client):
+            start = time.perf_counter()
+            predict_fn(images[idx])
+            local.append(time.perf_counter() - start)
+        with lock:
+            latencies.extend(local)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    latencies = np.array(latencies) * 1000
+    return np.percentile(latencies, 50), np.percentile(latencies, 99), len(latencies) / elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("model", help="Trained .keras model")
+    parser.add_argument("--clients", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=25, help="Requests per client")
+    parser.add_argument("--max-batch", type=int, default=32)
+    parser.add_argument("--max-wait-ms", type=float, default=5)
+    args = parser.parse_args()
+
+    model = get_model(args.model, warmup=True)
+    batcher = MicroBatcher(max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms)
+    batcher.predict(args.model, np.zeros((1,) + tuple(IMG_SHAPE), dtype=np.float32))  # Warm-up
+
+    results = {
+        "Direct (batch of 1)": run_load(lambda img: model.predict(img, verbose=0), args.clients, args.requests),
+        "Micro-batched": run_load(lambda img: batcher.predict(args.model, img), args.clients, args.requests),
+    }
+
+    print(f"\n{args.clients} clients x {args.requests} requests")
+    print(f"{'Mode':<22}{'p50 (ms)':>10}{'p99 (ms)':>10}{'Req/sec':>10}")
+    for name, (p50, p99, throughput) in results.items():
+        print(f"{name:<22}{p50:>10.1f}{p99:>10.1f}{throughput:>10.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+
+# Set before TensorFlow is imported (also inherited by the workers)
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import MODELS_DIRECTORY
+from src.search_utils import sample_configs, run_search
+
+# Successive-halving search over architectures, learning rates and batch sizes
+# Usage: python app/helper/model_search.py images/<dataset>/train_df.csv images/<dataset>/val_df.csv \
+#            --workers 2 --threads 8 --min-epochs 1 --max-epochs 27 --eta 3
+
+def main():
+    from src.model_utils import MODEL_DICT
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("train_csv")
+    parser.add_argument("val_csv")
+    parser.add_argument("--models", nargs="*", default=list(MODEL_DICT), help="Subset of MODEL_DICT")
+    parser.add_argument("--learning-rates", nargs="*", type=float, default=[1e-3, 3e-4, 1e-4])
+    parser.add_argument("--batch-sizes", nargs="*", type=int, default=[16, 32])
+    parser.add_argument("--trials", type=int, help="Random subset of the grid (default: whole grid)")
+    parser.add_argument("--min-epochs", type=int, default=1, help="Epochs of the first rung")
+    parser.add_argument("--max-epochs", type=int, default=27, help="Epochs of a fully trained trial")
+    parser.add_argument("--eta", type=int, default=3, help="Keep the best 1/eta trials per rung")
+    parser.add_argument("--hyperband", action="store_true", help="Run all Hyperband brackets")
+    parser.add_argument("--workers", type=int, default=2, help="Trials trained in parallel")
+    parser.add_argument("--threads", type=int, default=os.cpu_count(), help="Total TensorFlow thread budget")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir", default=os.path.join(MODELS_DIRECTORY, "search",
+                                                             datetime.now().strftime("%Y-%m-%d_%H-%M")))
+    args = parser.parse_args()
+
+    configs = sample_configs(args.models, args.learning_rates, args.batch_sizes, args.trials, args.seed)
+    report = run_search(configs, args.train_csv, args.val_csv, args.output_dir, min_epochs=args.min_epochs,
+                        max_epochs=args.max_epochs, eta=args.eta, workers=args.workers,
+                        thread_budget=args.threads, hyperband=args.hyperband, seed=args.seed)
+
+    print("\n🏆 Winner:")
+    print(json.dumps(report["winner"], indent=2))
+    print(f"⏱️ Epochs: {report['epochs_used']} trained vs {report['epochs_exhaustive']} exhaustive "
+          f"({report['epochs_saved_pct']:.1f}% saved)")
+    print(f"⏱️ Training time: {report['train_time_s'] / 60:.1f} min vs ~{report['exhaustive_time_estimate_s'] / 60:.1f} "
+          f"min exhaustive ({report['time_saved_pct']:.1f}% saved)")
+    print(f"✅ Search saved: {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,200 @@
+import os
+import sys
+import glob
+import json
+import time
+import argparse
+import tempfile
+import multiprocessing as mp
+from datetime import datetime
+
+# Deterministic CPU-only runs (set before TensorFlow is imported, also inherited by the workers)
+os.environ.setdefault("CUDA_VISIBLE_DEVICES", "-1")
+os.environ.setdefault("TF_CPP_MIN_LOG_LEVEL", "2")
+
+import numpy as np
+import pandas as pd
+import matplotlib
+matplotlib.use("Agg")  # Headless
+import matplotlib.pyplot as plt
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import MODELS_DIRECTORY, IMG_SHAPE
+from src.perf_utils import configure_tensorflow, peak_rss_mb, time_calls
+
+# Cost and accuracy of every architecture in MODEL_DICT on one dataset
+# Each architecture runs in its own process (clean cold-load time and peak RSS).
+# Usage: python app/helper/models_benchmark.py images/<dataset>/test_df.csv --threads 4
+
+# Line styles to differentiate models
+line_styles = ['-', '--', '-.', ':'] * 3  # Up to 12 styles
+
+# Newest trained checkpoint: models/<model>/<date>/<model>.keras
+def latest_trained_model(model_name):
+    candidates = glob.glob(os.path.join(MODELS_DIRECTORY, model_name, "*", f"{model_name}.keras"))
+    return max(candidates, key=os.path.getmtime) if candidates else None
+
+def benchmark_architecture(model_name, test_csv, batch_sizes, latency_runs, threads, seed):
+    configure_tensorflow(threads=threads, cpu_only=True, seed=seed)
+    from tensorflow.keras.models import load_model
+    from src.model_utils import MODEL_DICT, build_model
+    from src.data_utils import create_image_generators
+    from src.eval_utils import evaluate_model
+
+    model_path = latest_trained_model(model_name)
+    trained = model_path is not None
+    tmp_dir = None
+    if not trained:
+        # Untrained model: cost metrics only
+        test_df = pd.read_csv(test_csv)
+        tmp_dir = tempfile.mkdtemp()
+        model_path = os.path.join(tmp_dir, f"{model_name}.keras")
+        build_model(MODEL_DICT[model_name], test_df['classes'].nunique()).save(model_path)
+
+    start = time.perf_counter()
+    model = load_model(model_path)
+    cold_load_s = time.perf_counter() - start
+
+    single = np.zeros((1,) + tuple(IMG_SHAPE), dtype=np.float32)
+    latencies = time_calls(lambda: model.predict_on_batch(single), latency_runs, warmup=3)
+
+    throughput = {}
+    for batch_size in batch_sizes:
+        batch = np.zeros((batch_size,) + tuple(IMG_SHAPE), dtype=np.float32)
+        batch_latencies = time_calls(lambda: model.predict_on_batch(batch), max(3, latency_runs // 10), warmup=1)
+        throughput[f"throughput_bs{batch_size}"] = batch_size / (np.median(batch_latencies) / 1000)
+
+    test_accuracy = float("nan")
+    if trained:
+        test_gen = create_image_generators(pd.read_csv(test_csv))
+        test_accuracy = float(evaluate_model(model, test_gen, verbose=0).accuracy)
+
+    result = {
+        "model": model_name,
+        "trained_model": model_path if trained else None,
+        "params": int(model.count_params()),
+        "file_size_mb": os.path.getsize(model_path) / 1024 ** 2,
+        "cold_load_s": cold_load_s,
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p99_ms": float(np.percentile(latencies, 99)),
+        **throughput,
+        "peak_rss_mb": peak_rss_mb(),
+        "test_accuracy": test_accuracy,
+    }
+
+    if tmp_dir:
+        os.remove(model_path)
+        os.rmdir(tmp_dir)
+    return result
+
+def plot_benchmark(results_df, batch_sizes, output_dir):
+    fig, axes = plt.subplots(2, 2, figsize=(16, 10))
+    axes = axes.flatten()
+
+    axes[0].barh(results_df["model"], results_df["latency_p50_ms"], label="p50")
+    axes[0].barh(results_df["model"], results_df["latency_p99_ms"] - results_df["latency_p50_ms"],
+                 left=results_df["latency_p50_ms"], alpha=0.5, label="p99")
+    axes[0].set_title("Single-image latency (ms)")
+    axes[0].legend(fontsize='small')
+
+    for j, batch_size in enumerate(batch_sizes):
+        axes[1].plot(results_df["model"], results_df[f"throughput_bs{batch_size}"],
+                     line_styles[j % len(line_styles)], marker="o", label=f"batch {batch_size}")
+    axes[1].set_title("Throughput (images/sec)")
+    axes[1].tick_params(axis="x", rotation=45)
+    axes[1].legend(fontsize='small')
+
+    axes[2].barh(results_df["model"], results_df["file_size_mb"])
+    axes[2].set_title("Model file size (MB)")
+
+    axes[3].scatter(results_df["latency_p50_ms"], results_df["test_accuracy"])
+    for _, row in results_df.iterrows():
+        axes[3].annotate(row["model"], (row["latency_p50_ms"], row["test_accuracy"]), fontsize='small')
+    axes[3].set_title("Test accuracy vs latency")
+    axes[3].set_xlabel("p50 latency (ms)")
+    axes[3].set_ylabel("Test accuracy")
+
+    for ax in axes:
+        ax.grid(True)
+
+    plt.suptitle("Architecture Benchmark", fontsize=16)
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    image_path = os.path.join(output_dir, "models_benchmark.png")
+    plt.savefig(image_path)
+    plt.close()
+    return image_path
+
+# Loss/accuracy curves of the best registered training run of each model
+def plot_training_metrics(model_names, output_dir, dataset=None):
+    from src.run_registry import get_registry
+
+    registry = get_registry()
+    best_runs = registry.best_training_runs(dataset)
+    histories = {row.architecture: registry.epoch_history(row.run_id)
+                 for row in best_runs.itertuples() if row.architecture in model_names}
+    return plot_histories(histories, os.path.join(output_dir, "models_training_metrics.png"))
+
+def plot_histories(histories, image_path):
+    metrics = ["loss", "accuracy", "val_loss", "val_accuracy"]
+    histories = {name: df for name, df in histories.items() if not df.empty}
+    if not histories:
+        return None
+
+    fig, axes = plt.subplots(2, 2, figsize=(16, 10))
+    axes = axes.flatten()
+
+    for i, metric in enumerate(metrics):
+        ax = axes[i]
+        for j, (model_name, df) in enumerate(histories.items()):
+            if metric in df.columns:
+                ax.plot(df[metric], line_styles[j % len(line_styles)], label=model_name)
+
+        ax.set_title(f"{metric.replace('_', ' ').capitalize()}")
+        ax.set_xlabel("Epoch")
+        ax.set_ylabel(metric.replace('_', ' ').capitalize())
+        ax.grid(True)
+        ax.legend(fontsize='small')
+
+    plt.suptitle("Training Metrics Evolution by Model", fontsize=16)
+    plt.tight_layout(rect=[0, 0, 1, 0.96])
+    plt.savefig(image_path)
+    plt.close()
+    return image_path
+
+def main():
+    from src.model_utils import MODEL_DICT
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("test_csv", help="Test CSV created by the Batch Creator")
+    parser.add_argument("--models", nargs="*", default=list(MODEL_DICT), help="Subset of MODEL_DICT")
+    parser.add_argument("--batch-sizes", nargs="*", type=int, default=[1, 8, 32])
+    parser.add_argument("--latency-runs", type=int, default=100)
+    parser.add_argument("--threads", type=int, default=4, help="TensorFlow threads per benchmark")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output-dir", default=os.path.join(MODELS_DIRECTORY, "benchmarks",
+                                                             datetime.now().strftime("%Y-%m-%d_%H-%M")))
+    args = parser.parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    results = []
+    ctx = mp.get_context("spawn")
+    for model_name in args.models:
+        print(f"⏱️ Benchmarking {model_name}...")
+        with ctx.Pool(1) as pool:
+            result = pool.apply(benchmark_architecture, (model_name, args.test_csv, args.batch_sizes,
+                                                         args.latency_runs, args.threads, args.seed))
+        print(json.dumps(result))
+        results.append(result)
+
+    results_df = pd.DataFrame(results)
+    results_df.to_csv(os.path.join(args.output_dir, "models_benchmark.csv"), index=False)
+    with open(os.path.join(args.output_dir, "models_benchmark.json"), "w", encoding="utf-8") as f:
+        json.dump({"test_csv": os.path.abspath(args.test_csv), "threads": args.threads,
+                   "seed": args.seed, "results": results}, f, indent=2)
+
+    plot_benchmark(results_df, args.batch_sizes, args.output_dir)
+    plot_training_metrics(args.models, args.output_dir, dataset=os.path.basename(os.path.dirname(os.path.abspath(args.test_csv))))
+    print(f"✅ Benchmark saved: {args.output_dir}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+import tensorflow as tf
+from tensorflow.keras.preprocessing.image import ImageDataGenerator
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.data_utils import create_image_generators
+
+# Throughput (images/sec) of the legacy ImageDataGenerator vs the tf.data pipeline
+# Usage: python app/helper/pipeline_benchmark.py images/<dataset>/train_df.csv --batches 50
+
+def legacy_generator(data_df, batch_size):
+    image_gen = ImageDataGenerator(preprocessing_function=tf.keras.applications.mobilenet_v2.preprocess_input)
+    return image_gen.flow_from_dataframe(dataframe=data_df, x_col="filepaths", y_col="classes",
+                                         target_size=(256, 256), color_mode='rgb',
+                                         class_mode="categorical", batch_size=batch_size, shuffle=False)
+
+def measure(batches, num_batches):
+    images = 0
+    start = time.perf_counter()
+    for i, (x, _) in enumerate(batches):
+        if i >= num_batches:
+            break
+        images += len(x)
+    elapsed = time.perf_counter() - start
+    return images, elapsed
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("csv", help="Dataset CSV created by the Batch Creator")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--batches", type=int, default=50)
+    parser.add_argument("--cache-dir", help="Also measure the tf.data pipeline reading from an image cache")
+    args = parser.parse_args()
+
+    data_df = pd.read_csv(args.csv)
+    num_batches = min(args.batches, -(-len(data_df) // args.batch_size))
+
+    results = {
+        "ImageDataGenerator": measure(legacy_generator(data_df, args.batch_size), num_batches),
+        "tf.data": measure(create_image_generators(data_df, batch_size=args.batch_size), num_batches),
+    }
+    if args.cache_dir:
+        # First pass fills the cache, second pass measures reading from it
+        create_image_generators(data_df, batch_size=args.batch_size, cache_dir=args.cache_dir)
+        results["tf.data + cache"] = measure(create_image_generators(data_df, batch_size=args.batch_size,
+                                                                     cache_dir=args.cache_dir), num_batches)
+
+    print(f"\n{'Pipeline':<20}{'Images':>10}{'Seconds':>10}{'Images/sec':>14}")
+    for name, (images, elapsed) in results.items():
+        print(f"{name:<20}{images:>10}{elapsed:>10.2f}{images / elapsed:>14.1f}")
+
+    speedup = (results["tf.data"][0] / results["tf.data"][1]) / (results["ImageDataGenerator"][0] / results["ImageDataGenerator"][1])
+    print(f"\n⚡ Speedup: x{speedup:.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+import os
+import sys
+import argparse
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from config import MODELS_DIRECTORY
+from src.run_registry import get_registry
+from models_benchmark import plot_histories
+
+# Run registry queries: best run per architecture, test results and training curves
+# Usage: python app/helper/runs_report.py --import-existing --dataset <dataset>
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--import-existing", action="store_true", help="Register run folders found in MODELS_DIRECTORY")
+    parser.add_argument("--dataset", help="Only runs on this dataset (folder name under IMAGES_DIRECTORY)")
+    parser.add_argument("--output-dir", default=os.path.join(MODELS_DIRECTORY, "reports",
+                                                             datetime.now().strftime("%Y-%m-%d_%H-%M")))
+    args = parser.parse_args()
+
+    registry = get_registry()
+    if args.import_existing:
+        print(f"📥 Imported runs: {registry.import_existing_runs()}")
+
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    best_runs = registry.best_training_runs(args.dataset)
+    best_runs.to_csv(os.path.join(args.output_dir, "best_training_runs.csv"), index=False)
+    print("\n🏆 Best val_accuracy per architecture:")
+    print(best_runs[["architecture", "best_val_accuracy", "dataset", "created"]].to_string(index=False))
+
+    test_results = registry.test_results(args.dataset)
+    test_results.to_csv(os.path.join(args.output_dir, "test_results.csv"), index=False)
+    if not test_results.empty:
+        print("\n🧾 Test results:")
+        print(test_results[["architecture", "dataset", "created", "test_accuracy"]].to_string(index=False))
+
+    histories = {row.architecture: registry.epoch_history(row.run_id) for row in best_runs.itertuples()}
+    image_path = plot_histories(histories, os.path.join(args.output_dir, "models_training_metrics.png"))
+    print(f"\n✅ Report saved: {args.output_dir}" + (f" ({os.path.basename(image_path)})" if image_path else ""))
+
+if __name__ == "__main__":
+    main()
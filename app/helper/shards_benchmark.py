@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+import argparse
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.data_utils import create_image_generators, create_shard_dataset
+from src.shard_utils import packed_split_dir
+from src.model_utils import select_model_by_name, build_model
+
+# Epoch time reading loose image files vs packed shards written by the Batch Creator
+# Usage: python app/helper/shards_benchmark.py images/<dataset>/train_df.csv --epochs 2 [--model ResNet50]
+
+def input_epoch_time(data):
+    start = time.perf_counter()
+    images = sum(len(x) for x, _ in data)
+    return images, time.perf_counter() - start
+
+def fit_epoch_time(model, data):
+    start = time.perf_counter()
+    model.fit(data, epochs=1, verbose=0)
+    return time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("csv", help="Split CSV with packed shards (Batch Creator with packed shards enabled)")
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--epochs", type=int, default=2)
+    parser.add_argument("--model", help="Also time a training epoch with this architecture")
+    args = parser.parse_args()
+
+    data_df = pd.read_csv(args.csv)
+    split_dir = packed_split_dir(args.csv, data_df)
+    if split_dir is None:
+        sys.exit("❌ No up-to-date packed shards found for this CSV.")
+
+    pipelines = {
+        "Loose files": lambda: create_image_generators(data_df, batch_size=args.batch_size, shuffle=True),
+        "Packed shards": lambda: create_shard_dataset(split_dir, batch_size=args.batch_size, shuffle=True),
+    }
+
+    print(f"\n{'Input':<16}{'Epoch':>6}{'Images':>10}{'Seconds':>10}{'Images/sec':>14}")
+    input_times = {}
+    for name, create in pipelines.items():
+        data = create()
+        for epoch in range(1, args.epochs + 1):
+            images, elapsed = input_epoch_time(data)
+            input_times.setdefault(name, []).append(elapsed)
+            print(f"{name:<16}{epoch:>6}{images:>10}{elapsed:>10.2f}{images / elapsed:>14.1f}")
+
+    speedup = min(input_times["Loose files"]) / min(input_times["Packed shards"])
+    print(f"\n⚡ Input epoch speedup with packed shards: x{speedup:.2f}")
+
+    if args.model:
+        model_fn, _ = select_model_by_name(args.model)
+        model = build_model(model_fn, data_df['classes'].nunique())
+        print(f"\n{'Input':<16}{'Training epoch (s)':>20}")
+        for name, create in pipelines.items():
+            data = create()
+            fit_epoch_time(model, data.take(1))  # Trace the training step first
+            print(f"{name:<16}{fit_epoch_time(model, data):>20.2f}")
+
+if __name__ == "__main__":
+    main()
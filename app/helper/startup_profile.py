@@ -0,0 +1,57 @@
+import os
+import re
+import sys
+import time
+import argparse
+import subprocess
+
+# Startup time of the UI module vs eagerly importing every tab module, plus an import-time profile
+# Usage: python app/helper/startup_profile.py --top 20
+
+APP_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMPORTTIME_PATTERN = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+# Fresh interpreter: wall time of the statement + per-module import times (-X importtime)
+def profile(statement):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", statement], cwd=APP_DIRECTORY,
+                            capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode != 0:
+        sys.exit(result.stderr[-2000:])
+
+    modules = []
+    for line in result.stderr.splitlines():
+        match = IMPORTTIME_PATTERN.match(line)
+        if match:
+            modules.append((int(match.group(2)) / 1e6, len(match.group(3)) // 2, match.group(4)))
+    return elapsed, modules
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--top", type=int, default=15, help="Slowest top-level imports to show")
+    args = parser.parse_args()
+
+    runs = {
+        "UI (alzheimer_app)": "import alzheimer_app",
+        "Eager tab modules": "import alzheimer_app, batch_creator, train_val, test_eval, multi_test, batch_predict",
+    }
+
+    results = {}
+    for name, statement in runs.items():
+        results[name] = profile(statement)
+
+    print(f"\n{'Startup':<22}{'Seconds':>10}")
+    for name, (elapsed, _) in results.items():
+        print(f"{name:<22}{elapsed:>10.2f}")
+    ui_time, eager_time = results["UI (alzheimer_app)"][0], results["Eager tab modules"][0]
+    print(f"\n⚡ UI import takes {ui_time / eager_time * 100:.0f}% of the eager import time")
+
+    _, modules = results["UI (alzheimer_app)"]
+    top_level = sorted((m for m in modules if m[1] <= 1), reverse=True)[:args.top]
+    print("\n🐢 Slowest imports at UI startup (cumulative):")
+    for seconds, _, module in top_level:
+        print(f"{seconds:>8.3f} s  {module}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import json
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.tflite_utils import export_tflite, compare_backends, QUANTIZATION_MODES
+
+# Trained .keras checkpoint -> quantized .tflite next to it + float vs quantized report
+# Usage: python app/helper/tflite_export.py models/<model>/<date>/<model>.keras images/<dataset>/train_df.csv
+#        --mode int8 --eval-csv images/<dataset>/test_df.csv
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("model", help="Trained .keras model (ModelCheckpoint output)")
+    parser.add_argument("train_csv", help="Training CSV used for int8 calibration")
+    parser.add_argument("--mode", choices=QUANTIZATION_MODES, default="dynamic")
+    parser.add_argument("--samples", type=int, default=200, help="Calibration images")
+    parser.add_argument("--eval-csv", help="CSV used to compare float and quantized accuracy")
+    args = parser.parse_args()
+
+    print(f"🔄 Exporting {args.mode} TFLite model...")
+    tflite_path = export_tflite(args.model, args.train_csv, mode=args.mode, samples=args.samples)
+    print(f"💾 Saved: {tflite_path}")
+
+    report = compare_backends(args.model, tflite_path, eval_csv=args.eval_csv)
+    report_path = f"{tflite_path}.json"
+    with open(report_path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print(f"\n{'':<10}{'Size (MB)':>12}{'p50 (ms)':>10}{'p99 (ms)':>10}{'Load RSS (MB)':>15}{'Accuracy':>10}")
+    for name in ("float", "tflite"):
+        row = report[name]
+        accuracy = f"{row['accuracy'] * 100:.2f}%" if row["accuracy"] is not None else "-"
+        load_memory = f"{row['load_memory_mb']:.1f}" if row["load_memory_mb"] is not None else "-"
+        print(f"{name:<10}{row['file_size_mb']:>12.2f}{row['latency_p50_ms']:>10.2f}"
+              f"{row['latency_p99_ms']:>10.2f}{load_memory:>15}{accuracy:>10}")
+    print(f"\n📦 Size: x{report['size_reduction']:.2f} smaller, ⚡ latency: x{report['latency_speedup']:.2f} faster")
+    if "accuracy_delta" in report:
+        print(f"🎯 Accuracy difference: {report['accuracy_delta'] * 100:+.2f} points")
+    print(f"📋 Report: {report_path}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import json
+import time
+import argparse
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.data_utils import create_split_dataset
+from src.eval_utils import evaluate_model
+from src.model_cache import get_model
+from src.tta_utils import TTAModel
+
+# Accuracy gain vs throughput cost of test-time augmentation
+# Usage: python app/helper/tta_benchmark.py models/<model>/<date>/<model>.keras images/<dataset>/test_df.csv --views 1 2 4 8
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("model", help="Trained .keras (or .tflite) model")
+    parser.add_argument("test_csv")
+    parser.add_argument("--views", nargs="*", type=int, default=[1, 2, 4, 8])
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    test_df = pd.read_csv(args.test_csv)
+    model = get_model(args.model)
+    data = create_split_dataset(args.test_csv, test_df, batch_size=args.batch_size)
+    for _ in data:  # Fill the image cache before timing
+        pass
+
+    results = []
+    for num_views in args.views:
+        start = time.perf_counter()
+        evaluator = evaluate_model(TTAModel(model, num_views), data, verbose=0)
+        elapsed = time.perf_counter() - start
+        _, recall, f1, _ = evaluator.per_class_metrics()
+        result = {"views": num_views, "accuracy": float(evaluator.accuracy), "loss": float(evaluator.loss),
+                  "macro_f1": float(f1.mean()), "images_per_s": len(test_df) / elapsed,
+                  **{f"recall_{name}": float(value) for name, value in zip(evaluator.class_names, recall)}}
+        print(json.dumps(result))
+        results.append(result)
+
+    results_df = pd.DataFrame(results)
+    baseline = results_df.iloc[0]
+    results_df["accuracy_gain_pts"] = 100 * (results_df["accuracy"] - baseline["accuracy"])
+    results_df["throughput_cost_pct"] = 100 * (1 - results_df["images_per_s"] / baseline["images_per_s"])
+    print("\n" + results_df[["views", "accuracy", "accuracy_gain_pts", "images_per_s", "throughput_cost_pct"]]
+          .to_string(index=False))
+
+    output = args.output or os.path.join(os.path.dirname(os.path.abspath(args.model)), "tta_benchmark.csv")
+    results_df.to_csv(output, index=False)
+    print(f"✅ Benchmark saved: {output}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# type: ignore
+import gradio as gr
+
+# Import custom modules
+from src.job_queue import get_job_manager
+
+JOB_HEADERS = ["id", "kind", "inputs", "status", "epoch", "created", "started", "finished"]
+
+def submit_train_job(train_set, val_set, mod, num_epochs, training_mode="Full", fine_tune_epochs=0, resume_from=None):
+    if not train_set or not val_set or not mod:
+        raise gr.Error("❌ Select the training and validation sets and a model.")
+    if not num_epochs or int(num_epochs) <= 0:
+        raise gr.Error("❌ Number of training iterations must be greater than 0.")
+
+    job_id = get_job_manager().submit("train", train_set, val_set, mod, int(num_epochs),
+                                      training_mode, int(fine_tune_epochs or 0), resume_from or None)
+    return f"✅ Training job queued: {job_id}", *refresh_jobs(job_id)
+
+def submit_eval_job(test_set, mod, backend="Keras", tta_views=1):
+    if not test_set or not mod:
+        raise gr.Error("❌ Select a test set and a trained model.")
+
+    job_id = get_job_manager().submit("eval", test_set, mod, backend, int(tta_views or 1))
+    return f"✅ Evaluation job queued: {job_id}", *refresh_jobs(job_id)
+
+# Jobs table, job selector and the log of the selected job
+def refresh_jobs(job_id=None):
+    manager = get_job_manager()
+    job_ids = manager.job_ids()
+    if job_id not in job_ids:
+        job_id = job_ids[-1] if job_ids else None
+
+    log = manager.read_log(job_id) if job_id else ""
+    result = manager.result(job_id) if job_id else None
+    if result and isinstance(result[0], str):
+        log += f"\n{result[0]}"
+
+    return manager.list_jobs(), gr.Dropdown(choices=job_ids, value=job_id), log
+
+def cancel_job(job_id):
+    if not job_id:
+        raise gr.Error("❌ No job selected.")
+    if not get_job_manager().cancel(job_id):
+        raise gr.Error("❌ Only queued or running jobs can be cancelled.")
+    return f"🛑 Job cancelled: {job_id}", *refresh_jobs(job_id)
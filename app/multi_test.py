@@ -1,30 +1,38 @@
 # type: ignore
-import sys
 import numpy as np
-from tensorflow.keras.models import load_model
-from tensorflow.keras.preprocessing import image
+import tensorflow as tf
 
 # Import configurations
 from config import IMG_SHAPE, CLASS_NAMES
 
-def multi_test_func(single_image, mod):
-    final_msg = "⚠️ An error occurred during prediction."
+# Import custom modules
+from src.model_cache import get_model
+from src.inference_server import predict
+from src.tflite_utils import resolve_backend
+from src.tta_utils import predict_tta
+from src.data_utils import preprocess_image
+from src.errors import PipelineError
 
-    # Load the model
+# PIL image -> dict with the summary, predicted class, confidence and all class probabilities.
+# tta_views > 1: average of augmented views, sent to the model as one batch
+def run_prediction(single_image, mod, backend="Keras", tta_views=1):
+    if single_image is None:
+        raise PipelineError("❌ No image uploaded.")
+
+    # Load the model (cached between predictions)
     try:
-        model = load_model(mod)
+        mod = resolve_backend(mod, backend)
+        get_model(mod)
     except Exception as e:
         print(f"❌ Error loading model: {e}")
-        sys.exit()
+        raise PipelineError(f"❌ Error loading model: {e}") from e
 
-    # Preprocess the image as done during training
-    img = single_image.resize((IMG_SHAPE[0], IMG_SHAPE[1]))
-    img_array = image.img_to_array(img)
-    img_array = np.expand_dims(img_array, axis=0)
-    img_array = img_array / 255.0  # Normalize if applied during training
+    # Preprocess the image as done during training and batch prediction (load_image + preprocess_image)
+    img = tf.image.resize(np.asarray(single_image.convert("RGB")), IMG_SHAPE[:2], method='nearest')
+    img_array = np.expand_dims(preprocess_image(img).numpy(), axis=0)
 
-    # Predict
-    preds = model.predict(img_array)[0]
+    # Predict (batched with concurrent requests for the same model)
+    preds = predict_tta(lambda batch: predict(mod, batch), img_array, int(tta_views or 1))[0]
     pred_index = np.argmax(preds)
     pred_class = CLASS_NAMES[pred_index]
     confidence = float(preds[pred_index])
@@ -37,4 +45,8 @@ def multi_test_func(single_image, mod):
         "\n".join([f"- {label}: {float(prob) * 100:.2f}%" for label, prob in zip(CLASS_NAMES, preds)])
     )
     
-    return final_msg
\ No newline at end of file
+    return {"message": final_msg, "predicted_class": pred_class, "confidence": confidence,
+            "probabilities": {label: float(prob) for label, prob in zip(CLASS_NAMES, preds)}}
+
+def multi_test_func(single_image, mod, backend="Keras", tta_views=1):
+    return run_prediction(single_image, mod, backend, tta_views)["message"]
\ No newline at end of file
@@ -0,0 +1,99 @@
+# type: ignore
+import os
+import time
+from datetime import datetime
+
+# Import custom modules
+from src.errors import PipelineError
+from src.perf_utils import configure_tensorflow, peak_rss_mb
+
+# Import configurations
+from config import IMAGES_DIRECTORY, MODELS_DIRECTORY, BATCH_SIZE
+
+# Headless pipeline API: the stages of the UI tabs without Gradio. Each stage returns a JSON-serializable
+# summary (wall time, items processed, throughput, peak memory and its outputs) and raises PipelineError
+# on failure. The stage modules (TensorFlow) are imported on first use, after configure().
+
+SINGLE_IMAGE_EXTENSIONS = (".jpg", ".jpeg", ".png", ".bmp", ".gif")
+
+# Thread budget / CPU only / seed: call before the first stage
+def configure(threads=None, cpu_only=False, seed=None):
+    configure_tensorflow(threads=threads, cpu_only=cpu_only, seed=seed)
+
+def _summary(stage, started, start, items, **outputs):
+    seconds = time.perf_counter() - start
+    peak = peak_rss_mb()
+    return {
+        "stage": stage,
+        "status": "ok",
+        "started": started,
+        "seconds": round(seconds, 3),
+        "items": items,
+        "items_per_s": round(items / seconds, 2) if seconds > 0 else None,
+        "peak_rss_mb": round(peak, 1) if peak is not None else None,
+        **outputs,
+    }
+
+def _now():
+    return datetime.now().isoformat(timespec="seconds")
+
+# Batch Creator: items = images in the three splits
+def create_dataset(images_set, set_name, set_size=0, packed_shards=False, integrity_scan=True,
+                   output_dir=IMAGES_DIRECTORY):
+    started, start = _now(), time.perf_counter()
+    from batch_creator import create_dataset as run_dataset_creation
+
+    result = run_dataset_creation(images_set, set_name, set_size, packed_shards, integrity_scan, output_dir)
+    return _summary("batch", started, start, sum(result["splits"].values()),
+                    dataset_directory=result["dataset_directory"], splits=result["splits"],
+                    integrity=result["integrity"])
+
+# Training and Validation: items = training images x epochs
+def train(train_set, val_set, model_name, epochs, training_mode="Full", fine_tune_epochs=0, resume_from=None,
+          batch_size=BATCH_SIZE, output_dir=MODELS_DIRECTORY):
+    started, start = _now(), time.perf_counter()
+    from train_val import run_training
+
+    result = run_training(train_set, val_set, model_name, epochs, training_mode, fine_tune_epochs, resume_from,
+                          batch_size=batch_size, output_dir=output_dir)
+    history_df = result["history_df"]
+    return _summary("train", started, start, result["train_samples"] * result["epochs"],
+                    model=model_name, model_path=result["model_path"], model_directory=result["model_directory"],
+                    epochs=result["epochs"], best_val_accuracy=float(history_df["val_accuracy"].max()),
+                    history_plot=result["image_path"])
+
+# Model Evaluation: items = test images
+def evaluate(test_set, model_path, backend="Keras", tta_views=1, batch_size=BATCH_SIZE, output_dir=MODELS_DIRECTORY):
+    started, start = _now(), time.perf_counter()
+    from test_eval import run_evaluation
+
+    result = run_evaluation(test_set, model_path, backend, tta_views, batch_size=batch_size, output_dir=output_dir)
+    return _summary("eval", started, start, result["samples"], model_path=model_path, backend=backend,
+                    tta_views=int(tta_views), accuracy=result["accuracy"], cached=result["cached"],
+                    test_directory=result["test_directory"], confusion_matrix=result["image_path"])
+
+# Single image file -> Single Prediction; folder or .csv -> Batch Prediction (predictions CSV)
+def predict(source, model_path, backend="Keras", tta_views=1, batch_size=BATCH_SIZE, output_dir=MODELS_DIRECTORY):
+    started, start = _now(), time.perf_counter()
+    if os.path.isfile(source) and source.lower().endswith(SINGLE_IMAGE_EXTENSIONS):
+        from PIL import Image
+        from multi_test import run_prediction
+
+        try:
+            with Image.open(source) as img:
+                single_image = img.convert("RGB")
+        except OSError as e:
+            raise PipelineError(f"❌ Unreadable image: {e}") from e
+        result = run_prediction(single_image, model_path, backend, tta_views)
+        return _summary("predict", started, start, 1, model_path=model_path, backend=backend,
+                        tta_views=int(tta_views), image=source, predicted_class=result["predicted_class"],
+                        confidence=result["confidence"], probabilities=result["probabilities"])
+
+    from batch_predict import run_batch_prediction
+
+    result = run_batch_prediction(source, model_path, batch_size, backend, tta_views, output_dir=output_dir)
+    return _summary("predict", started, start, result["images"], model_path=model_path, backend=backend,
+                    tta_views=int(tta_views), predictions=result["results_path"],
+                    skipped=result["skipped"], skipped_list=result["skipped_path"],
+                    inference_seconds=round(result["seconds"], 3),
+                    inference_images_per_s=round(result["images"] / result["seconds"], 2))
@@ -0,0 +1,118 @@
+# type: ignore
+import os
+import re
+import time
+import hashlib
+import numpy as np
+
+# Import custom modules
+from src.file_utils import file_lock, unique_tmp_path, load_json, save_json
+
+# Import configurations
+from config import IMG_SHAPE, IMAGE_CACHE, IMAGE_CACHE_MAX_GB
+
+CACHE_DIRNAME = ".image_cache"
+INDEX_FILENAME = "index.json"
+SHARD_SIZE = 256  # Images per shard
+SHARD_PATTERN = re.compile(r"^[0-9a-f]{40}\.npy$")
+
+# .../images/<dataset>/train_df.csv -> .../images/<dataset>/.image_cache (None if disabled)
+def image_cache_dir(csv_path):
+    if not IMAGE_CACHE:
+        return None
+    return os.path.join(os.path.dirname(os.path.abspath(csv_path)), CACHE_DIRNAME)
+
+# Decoded uint8 images stored as memory-mappable .npy shards.
+# A shard key covers (path, mtime, size) of every source file plus the target shape,
+# so any change in a source file produces a new shard and the stale one is dropped.
+# Several processes may share a cache (UI, job subprocesses, worker pools): the index is reloaded,
+# merged and saved under a file lock, and every shard is written to its own tmp file.
+class ImageCache:
+    def __init__(self, cache_dir, max_bytes=None, shape=IMG_SHAPE):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes if max_bytes is not None else int(IMAGE_CACHE_MAX_GB * 1024 ** 3)
+        self.shape = tuple(shape)
+        self.index_path = os.path.join(cache_dir, INDEX_FILENAME)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _shard_path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.npy")
+
+    def _keys(self, filepaths):
+        content = hashlib.sha1(repr(self.shape).encode())
+        sources = hashlib.sha1(repr(self.shape).encode())
+        for path in filepaths:
+            stat = os.stat(path)
+            content.update(f"{os.path.abspath(path)}|{stat.st_mtime_ns}|{stat.st_size}\n".encode())
+            sources.update(f"{os.path.abspath(path)}\n".encode())
+        return content.hexdigest(), sources.hexdigest()
+
+    def _remove(self, index, key):
+        index.pop(key, None)
+        if os.path.exists(self._shard_path(key)):
+            os.remove(self._shard_path(key))
+
+    def _build_shard(self, key, filepaths, decode_fn):
+        shard_path = self._shard_path(key)
+        tmp_path = unique_tmp_path(shard_path, suffix=".tmp.npy")
+        try:
+            shard = np.lib.format.open_memmap(tmp_path, mode="w+", dtype=np.uint8,
+                                              shape=(len(filepaths),) + self.shape)
+            for i, img in enumerate(decode_fn(filepaths)):
+                shard[i] = img
+            shard.flush()
+            del shard
+            os.replace(tmp_path, shard_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return os.path.getsize(shard_path)
+
+    # Shard files missing from the index (e.g. written by a process that crashed) count towards the limit
+    def _adopt_untracked(self, index):
+        for name in os.listdir(self.cache_dir):
+            key = name[:-len(".npy")]
+            if SHARD_PATTERN.match(name) and key not in index:
+                stat = os.stat(os.path.join(self.cache_dir, name))
+                index[key] = {"sources": None, "count": None, "bytes": stat.st_size, "last_access": stat.st_mtime}
+
+    # Least recently used shards go first, shards needed by the current run are kept
+    def _evict(self, index, keep):
+        total = sum(entry["bytes"] for entry in index.values())
+        for key, entry in sorted(index.items(), key=lambda item: item[1]["last_access"]):
+            if total <= self.max_bytes:
+                break
+            if key in keep:
+                continue
+            total -= entry["bytes"]
+            self._remove(index, key)
+
+    # File paths -> list of shard files (built on first use), SHARD_SIZE images each
+    def get_shards(self, filepaths, decode_fn):
+        shards = []
+        used = {}
+        for start in range(0, len(filepaths), SHARD_SIZE):
+            chunk = filepaths[start:start + SHARD_SIZE]
+            key, sources = self._keys(chunk)
+            shard_path = self._shard_path(key)
+
+            # Decoding happens outside the lock; two builders of one key both produce the same file
+            if os.path.exists(shard_path):
+                size = os.path.getsize(shard_path)
+            else:
+                size = self._build_shard(key, chunk, decode_fn)
+            used[key] = {"sources": sources, "count": len(chunk), "bytes": size}
+            shards.append(shard_path)
+
+        with file_lock(self.index_path):
+            index = load_json(self.index_path, {})
+            self._adopt_untracked(index)
+            now = time.time()
+            for key, entry in used.items():
+                # Invalidate shards built from the same files before they changed
+                for stale in [k for k, e in index.items() if e["sources"] == entry["sources"] and k not in used]:
+                    self._remove(index, stale)
+                index[key] = {**entry, "last_access": now}
+            self._evict(index, used)
+            save_json(self.index_path, index)
+        return shards
@@ -0,0 +1,224 @@
+# type: ignore
+import os
+import json
+import glob
+import shutil
+import threading
+import numpy as np
+import tensorflow as tf
+from tensorflow.keras.callbacks import Callback, EarlyStopping, ReduceLROnPlateau
+
+# Import custom modules
+from src.log_utils import context_thread
+
+RESUME_DIRNAME = "resume"
+STATE_FILENAME = "state.json"
+
+# Single background thread writing checkpoints. Only the newest pending write of each kind is kept
+# (a newer best model makes an older one pointless), so at most one snapshot per kind waits in memory.
+class CheckpointWriter:
+    def __init__(self):
+        self._pending = {}
+        self._busy = False
+        self._running = False  # Changed under _cond, so a submit never relies on a thread that is exiting
+        self._error = None
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def submit(self, kind, write_fn):
+        with self._cond:
+            self._pending[kind] = write_fn
+            if not self._running:
+                self._running = True
+                self._thread = context_thread(self._run)  # Prints go to the submitting run's log
+                self._thread.start()
+            self._cond.notify_all()
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._running = False
+                    return
+                kind = next(iter(self._pending))
+                write_fn = self._pending.pop(kind)
+                self._busy = True
+            try:
+                write_fn()
+            except Exception as e:
+                self._error = e
+            with self._cond:
+                self._busy = False
+                self._cond.notify_all()
+
+    # Block until every submitted write is on disk
+    def flush(self):
+        with self._cond:
+            while self._pending or self._busy:
+                self._cond.wait()
+        if self._error is not None:
+            error, self._error = self._error, None
+            raise error
+
+# model.save() may write a file or a SavedModel folder depending on the Keras version
+def _replace(tmp_path, path):
+    if os.path.isdir(path):
+        shutil.rmtree(path)
+    os.replace(tmp_path, path)
+
+# Same behaviour as ModelCheckpoint(save_best_only=True), but the training loop only copies the weights;
+# a clone of the model loads them and is saved by the background writer.
+class AsyncModelCheckpoint(Callback):
+    def __init__(self, filepath, monitor='val_accuracy', mode='max', verbose=1, initial_value_threshold=None,
+                 writer=None):
+        super().__init__()
+        self.filepath = filepath
+        self.monitor = monitor
+        self.verbose = verbose
+        self.monitor_op = np.greater if mode == 'max' else np.less
+        if initial_value_threshold is not None:
+            self.best = initial_value_threshold
+        else:
+            self.best = -np.inf if mode == 'max' else np.inf
+        self.writer = writer or CheckpointWriter()
+        self._export_model = None
+
+    def _exporter(self):
+        if self._export_model is None:
+            self._export_model = tf.keras.models.clone_model(self.model)
+            optimizer = self.model.optimizer
+            self._export_model.compile(optimizer=optimizer.__class__.from_config(optimizer.get_config()),
+                                       loss=self.model.loss, metrics=['accuracy'])
+        return self._export_model
+
+    def _write(self, exporter, weights):
+        exporter.set_weights(weights)
+        tmp_path = self.filepath[:-len(".keras")] + ".tmp.keras"
+        exporter.save(tmp_path)
+        _replace(tmp_path, self.filepath)
+
+    def on_epoch_end(self, epoch, logs=None):
+        current = (logs or {}).get(self.monitor)
+        if current is None or not self.monitor_op(current, self.best):
+            return
+        if self.verbose:
+            print(f"\nEpoch {epoch + 1}: {self.monitor} improved from {self.best:.5f} to {current:.5f}, "
+                  f"saving model to {self.filepath} (background)")
+        self.best = float(current)
+        weights, exporter = self.model.get_weights(), self._exporter()
+        self.writer.submit("best", lambda: self._write(exporter, weights))
+
+    def on_train_end(self, logs=None):
+        self.writer.flush()
+
+# Callback attributes needed to continue a run exactly where it stopped
+CALLBACK_STATE = [
+    (EarlyStopping, ("wait", "best", "stopped_epoch", "best_epoch")),
+    (ReduceLROnPlateau, ("wait", "best", "cooldown_counter")),
+    (AsyncModelCheckpoint, ("best",)),
+]
+
+def _callback_key(callback):
+    return type(callback).__name__
+
+# Periodic resumable checkpoint in <model_directory>/resume: model and optimizer weights, epoch,
+# learning rate, callback counters and the history so far. Place it last in the callback list
+# (it saves the counters after the other callbacks updated them, and restores them after they reset).
+class ResumeCheckpoint(Callback):
+    def __init__(self, model_directory, callbacks, every=1, state=None, info=None, writer=None):
+        super().__init__()
+        self.resume_dir = os.path.join(model_directory, RESUME_DIRNAME)
+        self.callbacks = callbacks
+        self.every = max(1, int(every))
+        self.state = state  # Loaded state to restore (load_resume_state)
+        self.info = info or {}
+        self.history = {key: list(values) for key, values in (state or {}).get("history", {}).items()}
+        self.writer = writer or CheckpointWriter()
+        os.makedirs(self.resume_dir, exist_ok=True)
+
+    def on_train_begin(self, logs=None):
+        if not self.state:
+            return
+        arrays = self.state["arrays"]
+        self.model.set_weights(arrays["model"])
+        optimizer = self.model.optimizer
+        if arrays["optimizer"]:
+            optimizer._create_all_weights(self.model.trainable_variables)
+            optimizer.set_weights(arrays["optimizer"])
+        tf.keras.backend.set_value(optimizer.lr, self.state["lr"])
+
+        for callback in self.callbacks:
+            saved = self.state["callbacks"].get(_callback_key(callback), {})
+            for attr, value in saved.items():
+                setattr(callback, attr, value)
+            if isinstance(callback, EarlyStopping) and arrays["early_stopping_best"]:
+                callback.best_weights = arrays["early_stopping_best"]
+        print(f"♻️ Resumed after epoch {self.state['epoch']} (lr={self.state['lr']:.2e})")
+
+    def on_epoch_end(self, epoch, logs=None):
+        for key, value in (logs or {}).items():
+            self.history.setdefault(key, []).append(float(value))
+        if (epoch + 1) % self.every:
+            return
+
+        callbacks_state, early_stopping_best = {}, []
+        for callback in self.callbacks:
+            for callback_type, attrs in CALLBACK_STATE:
+                if isinstance(callback, callback_type):
+                    callbacks_state[_callback_key(callback)] = {
+                        attr: _to_json(getattr(callback, attr)) for attr in attrs if hasattr(callback, attr)}
+            if isinstance(callback, EarlyStopping) and callback.best_weights is not None:
+                early_stopping_best = callback.best_weights
+
+        optimizer = self.model.optimizer
+        state = {
+            **self.info,
+            "epoch": epoch + 1,
+            "lr": float(tf.keras.backend.get_value(optimizer.lr)),
+            "callbacks": callbacks_state,
+            "history": {key: list(values) for key, values in self.history.items()},
+        }
+        arrays = {"model": self.model.get_weights(),
+                  "optimizer": optimizer.get_weights() if hasattr(optimizer, "get_weights") else [],
+                  "early_stopping_best": early_stopping_best}
+        self.writer.submit("resume", lambda: self._write(state, arrays))
+
+    def _write(self, state, arrays):
+        weights_file = f"state-{state['epoch']:05d}.npz"
+        tmp_path = os.path.join(self.resume_dir, weights_file[:-len(".npz")] + ".tmp.npz")
+        np.savez(tmp_path, **{f"{group}_{i}": array for group, values in arrays.items()
+                              for i, array in enumerate(values)},
+                 **{f"{group}__count": np.int64(len(values)) for group, values in arrays.items()})
+        os.replace(tmp_path, os.path.join(self.resume_dir, weights_file))
+
+        state_path = os.path.join(self.resume_dir, STATE_FILENAME)
+        with open(state_path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump({**state, "weights_file": weights_file}, f, indent=2)
+        os.replace(state_path + ".tmp", state_path)
+
+        # Older snapshots are no longer referenced
+        for old in glob.glob(os.path.join(self.resume_dir, "state-*.npz")):
+            if os.path.basename(old) != weights_file:
+                os.remove(old)
+
+    def on_train_end(self, logs=None):
+        self.writer.flush()
+
+def _to_json(value):
+    if isinstance(value, (np.floating, np.integer)):
+        return value.item()
+    return value
+
+# <model_directory>/resume/state.json (or the folder itself) -> state dict with the arrays loaded
+def load_resume_state(path):
+    if os.path.isdir(path):
+        path = os.path.join(path, RESUME_DIRNAME, STATE_FILENAME) if os.path.basename(path) != RESUME_DIRNAME \
+            else os.path.join(path, STATE_FILENAME)
+    with open(path, "r", encoding="utf-8") as f:
+        state = json.load(f)
+    resume_dir = os.path.dirname(os.path.abspath(path))
+    with np.load(os.path.join(resume_dir, state["weights_file"])) as data:
+        state["arrays"] = {group: [data[f"{group}_{i}"] for i in range(int(data[f"{group}__count"]))]
+                           for group in ("model", "optimizer", "early_stopping_best")}
+    state["model_directory"] = os.path.dirname(resume_dir)
+    return state
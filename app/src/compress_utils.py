@@ -0,0 +1,245 @@
+# type: ignore
+import os
+import json
+import time
+import zipfile
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from tensorflow.keras.callbacks import Callback
+from tensorflow.keras.models import load_model
+
+# Import custom modules
+from src.data_utils import create_split_dataset
+from src.eval_utils import evaluate_model
+from src.model_utils import compile_model
+from src.perf_utils import time_calls
+
+# Import configurations
+from config import IMG_SHAPE
+
+# Magnitude pruning and weight clustering of a trained model, each followed by a short fine-tune.
+# Variants are saved beside the original (<model>.pruned.keras, ...) with a deflate archive of each,
+# since pruned zeros and shared cluster values only shrink the file once compressed.
+
+VARIANTS = ("pruned", "clustered", "pruned_clustered")
+MIN_WEIGHTS = 1024  # Smaller kernels (and biases, BatchNorm) are left untouched
+KMEANS_ITERATIONS = 10
+
+# .../VGG16.keras -> .../VGG16.pruned.keras
+def variant_path_for(model_path, variant):
+    return f"{os.path.splitext(model_path)[0]}.{variant}.keras"
+
+# Conv/Dense kernels worth compressing
+def compressible_kernels(model):
+    kernels = []
+    for layer in model.layers:
+        for attr in ("kernel", "depthwise_kernel"):
+            variable = getattr(layer, attr, None)
+            if variable is not None and int(np.prod(variable.shape)) >= MIN_WEIGHTS:
+                kernels.append(variable)
+    return kernels
+
+# Keep the largest (1 - sparsity) fraction of the weights by magnitude
+def magnitude_mask(weights, sparsity):
+    count = int(weights.size * sparsity)
+    if count <= 0:
+        return np.ones_like(weights, dtype=np.float32)
+    threshold = np.partition(np.abs(weights).ravel(), count - 1)[count - 1]
+    return (np.abs(weights) > threshold).astype(np.float32)
+
+# 1-D k-means with linearly spaced initial centroids -> (cluster of each weight, centroids).
+# Zero (pruned) weights get the extra cluster `clusters`, whose value stays 0.
+def kmeans_weights(weights, clusters, iterations=KMEANS_ITERATIONS):
+    flat = weights.ravel()
+    nonzero = flat != 0
+    values = flat[nonzero]
+    labels = np.full(flat.shape, clusters, dtype=np.int32)
+    if values.size == 0:
+        return labels, np.zeros(clusters, dtype=np.float32)
+
+    centroids = np.linspace(values.min(), values.max(), clusters)
+    for _ in range(iterations):
+        # Sorted centroids: the nearest one is found from the midpoints between neighbours
+        centroids.sort()
+        assigned = np.searchsorted((centroids[1:] + centroids[:-1]) / 2, values)
+        counts = np.bincount(assigned, minlength=clusters)
+        sums = np.bincount(assigned, weights=values, minlength=clusters)
+        centroids = np.where(counts > 0, sums / np.maximum(counts, 1), centroids)
+    centroids.sort()
+    labels[nonzero] = np.searchsorted((centroids[1:] + centroids[:-1]) / 2, values)
+    return labels, centroids.astype(np.float32)
+
+# Keeps the compression in place while fine-tuning: after every batch pruned weights are zeroed again
+# and each cluster is reset to the mean of its weights (the shared value moves with the average update).
+# Pruning ramps up to the final sparsity (cubic schedule) over all epochs but the last.
+class CompressionConstraint(Callback):
+    def __init__(self, kernels, sparsity=0.0, clusters=0, ramp_epochs=1):
+        super().__init__()
+        self.kernels = kernels
+        self.sparsity = sparsity
+        self.clusters = clusters
+        self.ramp_epochs = max(1, int(ramp_epochs))
+        self._masks = {}
+        self._labels = {}
+        if clusters:
+            for variable in kernels:
+                labels, _ = kmeans_weights(variable.numpy(), clusters)
+                self._labels[variable.ref()] = tf.constant(labels)
+        self._apply()
+
+    def sparsity_at(self, epoch):
+        progress = min(1.0, (epoch + 1) / self.ramp_epochs)
+        return self.sparsity * (1 - (1 - progress) ** 3)
+
+    # Masks recomputed from the current magnitudes (already pruned weights stay pruned)
+    def prune(self, sparsity):
+        for variable in self.kernels:
+            self._masks[variable.ref()] = tf.constant(magnitude_mask(variable.numpy(), sparsity))
+        self._apply()
+
+    def on_epoch_begin(self, epoch, logs=None):
+        if self.sparsity and not self.clusters:
+            self.prune(self.sparsity_at(epoch))
+
+    def on_train_batch_end(self, batch, logs=None):
+        self._apply()
+
+    def on_train_end(self, logs=None):
+        self._apply()
+
+    def _apply(self):
+        for variable in self.kernels:
+            labels = self._labels.get(variable.ref())
+            if labels is not None:
+                flat = tf.reshape(variable, [-1])
+                centroids = tf.math.unsorted_segment_mean(flat, labels, self.clusters + 1)
+                centroids = tf.concat([centroids[:self.clusters], tf.zeros([1], flat.dtype)], axis=0)
+                variable.assign(tf.reshape(tf.gather(centroids, labels), variable.shape))
+            elif variable.ref() in self._masks:
+                variable.assign(variable * self._masks[variable.ref()])
+
+# Size of a .keras file (or SavedModel folder, depending on the Keras version) in bytes
+def disk_size(path):
+    if os.path.isdir(path):
+        return sum(os.path.getsize(os.path.join(root, name)) for root, _, files in os.walk(path) for name in files)
+    return os.path.getsize(path)
+
+# Deflate archive of a saved model -> <path>.zip
+def archive_model(path):
+    archive_path = f"{path}.zip"
+    with zipfile.ZipFile(archive_path + ".tmp", "w", zipfile.ZIP_DEFLATED, compresslevel=9) as archive:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in files:
+                    full_path = os.path.join(root, name)
+                    archive.write(full_path, os.path.relpath(full_path, os.path.dirname(path)))
+        else:
+            archive.write(path, os.path.basename(path))
+    os.replace(archive_path + ".tmp", archive_path)
+    return archive_path
+
+# Fraction of exact zeros and largest number of distinct values over the compressed kernels
+def weight_stats(model):
+    kernels = [variable.numpy() for variable in compressible_kernels(model)]
+    total = sum(kernel.size for kernel in kernels)
+    zeros = sum(int((kernel == 0).sum()) for kernel in kernels)
+    return {"sparsity": zeros / total if total else 0.0,
+            "max_unique_values": max((len(np.unique(kernel)) for kernel in kernels), default=0)}
+
+# Original or compressed model: file/archive size, load time, single-image latency, accuracy
+def measure_model(path, eval_sets, latency_runs=50):
+    start = time.perf_counter()
+    model = load_model(path)
+    load_time = time.perf_counter() - start
+
+    single = np.zeros((1,) + tuple(IMG_SHAPE), dtype=np.float32)
+    latencies = time_calls(lambda: model.predict_on_batch(single), latency_runs, warmup=3)
+    archive_path = archive_model(path)
+    row = {
+        "path": path,
+        "file_size_mb": disk_size(path) / 1024 ** 2,
+        "archive_size_mb": os.path.getsize(archive_path) / 1024 ** 2,
+        "load_time_s": load_time,
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p99_ms": float(np.percentile(latencies, 99)),
+        **weight_stats(model),
+    }
+    for name, (csv_path, data_df) in eval_sets.items():
+        row[f"{name}_accuracy"] = float(evaluate_model(model, create_split_dataset(csv_path, data_df),
+                                                       verbose=0).accuracy)
+    return row
+
+# Load source_path, compress, fine-tune on the train CSV and save as the variant's file
+def compress_variant(source_path, output_path, train_csv, val_csv, train_df, val_df, sparsity=0.0, clusters=0,
+                     fine_tune_epochs=2, learning_rate=1e-4):
+    model = compile_model(load_model(source_path), learning_rate=learning_rate)
+    constraint = CompressionConstraint(compressible_kernels(model), sparsity=sparsity, clusters=clusters,
+                                       ramp_epochs=max(1, fine_tune_epochs - 1))
+    if fine_tune_epochs > 0:
+        model.fit(create_split_dataset(train_csv, train_df, shuffle=True), epochs=fine_tune_epochs,
+                  validation_data=create_split_dataset(val_csv, val_df), callbacks=[constraint], verbose=2)
+    elif sparsity:
+        constraint.prune(sparsity)
+    model.save(output_path)
+    return output_path
+
+# Compress a trained model into the requested variants and compare them with the original.
+# The selected variant is the smallest archive whose accuracy (test if given, else validation) reaches
+# accuracy_floor; by default the floor is the original accuracy minus max_accuracy_drop.
+def compress_model(model_path, train_csv, val_csv, test_csv=None, variants=VARIANTS, sparsity=0.5, clusters=16,
+                   fine_tune_epochs=2, learning_rate=1e-4, accuracy_floor=None, max_accuracy_drop=0.01,
+                   latency_runs=50):
+    for variant in variants:
+        if variant not in VARIANTS:
+            raise ValueError(f"Unknown compression variant: {variant}")
+    # pruned_clustered clusters the pruned variant
+    variants = [variant for variant in VARIANTS if variant in variants or
+                (variant == "pruned" and "pruned_clustered" in variants)]
+    train_df, val_df = pd.read_csv(train_csv), pd.read_csv(val_csv)
+    eval_sets = {"val": (val_csv, val_df)}
+    if test_csv:
+        eval_sets["test"] = (test_csv, pd.read_csv(test_csv))
+
+    settings = {"pruned": (model_path, sparsity, 0), "clustered": (model_path, 0.0, clusters),
+                "pruned_clustered": (variant_path_for(model_path, "pruned"), 0.0, clusters)}
+    for variant in variants:
+        source_path, variant_sparsity, variant_clusters = settings[variant]
+        print(f"\n💡 Compressing: {variant} ({os.path.basename(source_path)})")
+        compress_variant(source_path, variant_path_for(model_path, variant), train_csv, val_csv, train_df, val_df,
+                         sparsity=variant_sparsity, clusters=variant_clusters,
+                         fine_tune_epochs=fine_tune_epochs, learning_rate=learning_rate)
+
+    print("\n⏱️ Measuring original and compressed models...")
+    rows = {"original": measure_model(model_path, eval_sets, latency_runs)}
+    for variant in variants:
+        rows[variant] = measure_model(variant_path_for(model_path, variant), eval_sets, latency_runs)
+
+    metric = "test_accuracy" if test_csv else "val_accuracy"
+    if accuracy_floor is None:
+        accuracy_floor = rows["original"][metric] - max_accuracy_drop
+    original_size = rows["original"]["archive_size_mb"]
+    for row in rows.values():
+        row["size_reduction"] = original_size / row["archive_size_mb"]
+        row["meets_floor"] = row[metric] >= accuracy_floor
+
+    candidates = [name for name, row in rows.items() if row["meets_floor"]]
+    report = {
+        "model": os.path.abspath(model_path),
+        "train_csv": os.path.abspath(train_csv),
+        "val_csv": os.path.abspath(val_csv),
+        "test_csv": os.path.abspath(test_csv) if test_csv else None,
+        "settings": {"sparsity": sparsity, "clusters": clusters, "fine_tune_epochs": fine_tune_epochs,
+                     "learning_rate": learning_rate},
+        "accuracy_metric": metric,
+        "accuracy_floor": accuracy_floor,
+        "models": rows,
+        "selected": min(candidates, key=lambda name: rows[name]["archive_size_mb"]) if candidates else None,
+    }
+
+    report_path = os.path.join(os.path.dirname(os.path.abspath(model_path)), "compression_report.json")
+    with open(report_path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    os.replace(report_path + ".tmp", report_path)
+    pd.DataFrame(rows).T.to_csv(os.path.join(os.path.dirname(report_path), "compression_report.csv"))
+    return report, report_path
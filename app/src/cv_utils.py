@@ -0,0 +1,132 @@
+# type: ignore
+import os
+import json
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
+from sklearn.model_selection import StratifiedKFold, StratifiedGroupKFold
+
+# Import custom modules
+from src.perf_utils import configure_tensorflow
+from src.integrity_utils import has_duplicate_groups
+
+# Import configurations
+from config import BATCH_SIZE
+
+# Stratified k-fold cross-validation. Images are decoded once into memory-mapped cache shards
+# covering the whole DataFrame; every fold (one worker process each) reads its rows from them.
+
+def init_worker(threads, seed):
+    configure_tensorflow(threads=threads, seed=seed)
+
+# Decode every image of the DataFrame once -> cache shard paths (row order)
+def build_shared_cache(data_df, cache_dir):
+    from src.cache_utils import ImageCache
+    from src.data_utils import decode_images
+
+    return ImageCache(cache_dir).get_shards(data_df['filepaths'].astype(str).tolist(), decode_images)
+
+# Stratified folds -> list of (train positions, validation positions).
+# Near-duplicate groups (Batch Creator integrity scan) are kept within one fold.
+def make_folds(data_df, k=5, seed=42):
+    if has_duplicate_groups(data_df):
+        splitter = StratifiedGroupKFold(n_splits=k, shuffle=True, random_state=seed)
+        return list(splitter.split(data_df, data_df['classes'], data_df['group']))
+    splitter = StratifiedKFold(n_splits=k, shuffle=True, random_state=seed)
+    return [(train_idx, val_idx) for train_idx, val_idx in splitter.split(data_df, data_df['classes'])]
+
+# Runs in a worker: train on the fold's train rows, predict its validation rows
+def run_fold(fold, data_df, shard_paths, train_idx, val_idx, model_name, num_epochs, batch_size, seed, fold_dir):
+    import tensorflow as tf
+    from src.data_utils import create_subset_dataset
+    from src.eval_utils import evaluate_model
+    from src.model_utils import select_model_by_name, build_model, create_callbacks
+
+    tf.keras.backend.clear_session()
+    train_gen = create_subset_dataset(data_df, train_idx, shard_paths, batch_size=batch_size, shuffle=True, seed=seed)
+    val_gen = create_subset_dataset(data_df, val_idx, shard_paths, batch_size=batch_size)
+
+    model_fn, model_name = select_model_by_name(model_name)
+    model = build_model(model_fn, len(train_gen.class_indices))
+    os.makedirs(fold_dir, exist_ok=True)
+
+    start = time.perf_counter()
+    history = model.fit(train_gen, epochs=num_epochs, validation_data=val_gen, verbose=2,
+                        callbacks=create_callbacks(model_name, fold_dir, checkpoint=False))
+    train_time = time.perf_counter() - start
+    pd.DataFrame(history.history).to_csv(os.path.join(fold_dir, "training_history.csv"), index=False)
+
+    # EarlyStopping restored the best weights
+    evaluator = evaluate_model(model, val_gen, verbose=0, keep_predictions=True)
+    y_true, probs = evaluator.predictions()
+    _, _, f1, _ = evaluator.per_class_metrics()
+    return {
+        "fold": fold,
+        "samples": len(val_idx),
+        "epochs": len(history.epoch),
+        "val_accuracy": float(evaluator.accuracy),
+        "val_loss": float(evaluator.loss),
+        "macro_f1": float(f1.mean()),
+        "train_time_s": train_time,
+        "y_true": y_true,
+        "probs": probs,
+    }
+
+# Folds trained concurrently; threads = thread_budget // workers per process
+def cross_validate(data_df, cache_dir, model_name, output_dir, k=5, num_epochs=10, batch_size=BATCH_SIZE,
+                   workers=None, thread_budget=None, seed=42, log=print):
+    from src.data_utils import get_class_indices
+
+    os.makedirs(output_dir, exist_ok=True)
+    data_df = data_df.reset_index(drop=True)
+    workers = min(workers or k, k)
+    threads = max(1, (thread_budget or os.cpu_count()) // workers)
+    folds = make_folds(data_df, k, seed)
+    log(f"⚙️ {k} folds of {model_name}, {workers} workers x {threads} threads")
+
+    start = time.perf_counter()
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=init_worker,
+                             initargs=(threads, seed)) as pool:
+        shard_paths = pool.submit(build_shared_cache, data_df, cache_dir).result()
+        log(f"📦 Shared image cache ready: {len(shard_paths)} shards ({time.perf_counter() - start:.1f}s)")
+        futures = [pool.submit(run_fold, fold, data_df, shard_paths, train_idx, val_idx, model_name, num_epochs,
+                               batch_size, seed, os.path.join(output_dir, f"fold_{fold}"))
+                   for fold, (train_idx, val_idx) in enumerate(folds)]
+        results = []
+        for future in futures:
+            result = future.result()
+            log(f"   Fold {result['fold']}: val_accuracy={result['val_accuracy']:.4f} ({result['epochs']} epochs)")
+            results.append(result)
+
+    return aggregate_folds(results, get_class_indices(data_df), model_name, output_dir,
+                           time.perf_counter() - start)
+
+# Mean/std over folds, summed confusion matrix and the report of all out-of-fold predictions
+def aggregate_folds(results, class_indices, model_name, output_dir, wall_time_s):
+    from src.eval_utils import StreamingEvaluator
+    from src.model_utils import plot_confusion_matrix
+
+    folds_df = pd.DataFrame([{key: value for key, value in result.items() if key not in ("y_true", "probs")}
+                             for result in results])
+    folds_df.to_csv(os.path.join(output_dir, "folds.csv"), index=False)
+
+    evaluator = StreamingEvaluator.from_predictions(class_indices,
+                                                    np.concatenate([result["y_true"] for result in results]),
+                                                    np.concatenate([result["probs"] for result in results]))
+    report = evaluator.classification_report()
+    with open(os.path.join(output_dir, "classification_report.txt"), "w", encoding="utf-8") as f:
+        f.write(report)
+    image_path = plot_confusion_matrix(evaluator.cm, class_indices, f"{model_name} ({len(results)}-fold CV)",
+                                       output_dir)
+
+    summary = {"model": model_name, "folds": len(results), "wall_time_s": wall_time_s,
+               "train_time_s": float(folds_df["train_time_s"].sum()), "confusion_matrix": evaluator.cm.tolist()}
+    for metric in ("val_accuracy", "val_loss", "macro_f1"):
+        summary[f"{metric}_mean"] = float(folds_df[metric].mean())
+        summary[f"{metric}_std"] = float(folds_df[metric].std(ddof=1)) if len(folds_df) > 1 else 0.0
+    with open(os.path.join(output_dir, "cv_report.json"), "w", encoding="utf-8") as f:
+        json.dump(summary, f, indent=2)
+    return summary, report, image_path
@@ -1,10 +1,21 @@
 # type: ignore
 import os
 import shutil
+import hashlib
+import numpy as np
 import pandas as pd
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, StratifiedGroupKFold
 import tensorflow as tf
-from tensorflow.keras.preprocessing.image import ImageDataGenerator
+
+# Import configurations
+from config import IMG_SHAPE, BATCH_SIZE
+
+# Import custom modules
+from src.cache_utils import ImageCache, SHARD_SIZE, image_cache_dir
+from src.shard_utils import load_meta, packed_split_dir
+from src.integrity_utils import has_duplicate_groups
+
+AUTOTUNE = tf.data.AUTOTUNE
 
 # filepaths and labels extractor
 def get_filepaths_and_labels(directory):
@@ -26,11 +37,22 @@ def create_dataframes(data_path):
     return data_df
 
 # Train = 60%, Val = 20%, Test = 20%
+# With near-duplicate groups ('group' column), every group ends up in a single split
 def split_data(data_df, test_size=0.2, val_size=0.25):
+    if has_duplicate_groups(data_df):
+        train_data, test_df = group_split(data_df, test_size)
+        train_df, val_df = group_split(train_data, val_size)
+        return train_df, val_df, test_df
     train_data, test_df = train_test_split(data_df, test_size=test_size, random_state=42, stratify=data_df['classes'])
     train_df, val_df = train_test_split(train_data, test_size=val_size, random_state=42, stratify=train_data['classes'])
     return train_df, val_df, test_df
 
+# Stratified, group-aware holdout: one fold of round(1 / size) folds
+def group_split(data_df, size, seed=42):
+    splitter = StratifiedGroupKFold(n_splits=max(2, round(1 / size)), shuffle=True, random_state=seed)
+    train_idx, holdout_idx = next(splitter.split(data_df, data_df['classes'], data_df['group']))
+    return data_df.iloc[train_idx], data_df.iloc[holdout_idx]
+
 # Save images sets (Train, Val, Test)
 def save_images(test_df, base_dir, subset_name):
     output_dir = os.path.join(base_dir, subset_name)
@@ -50,10 +72,143 @@ def save_images(test_df, base_dir, subset_name):
         dest_path = os.path.join(dest_dir, filename)
         shutil.copy2(src_path, dest_path)
 
+# Hash of a dataset CSV and of the (path, mtime) of every image it references
+def dataset_fingerprint(csv_path, data_df=None):
+    digest = hashlib.sha1(repr(tuple(IMG_SHAPE)).encode())
+    with open(csv_path, "rb") as f:
+        digest.update(f.read())
+    if data_df is None:
+        data_df = pd.read_csv(csv_path)
+    for path in data_df['filepaths'].astype(str):
+        digest.update(f"{path}|{os.stat(path).st_mtime_ns}\n".encode())
+    return digest.hexdigest()
+
+# Class name -> index (alphabetical order, same mapping as flow_from_dataframe)
+def get_class_indices(data_df):
+    return {cls: idx for idx, cls in enumerate(sorted(data_df['classes'].unique()))}
+
+# Path -> decoded and resized uint8 tensor (nearest, as load_img did)
+def load_image(path):
+    raw = tf.io.read_file(path)
+    img = tf.io.decode_image(raw, channels=3, expand_animations=False)
+    img = tf.image.resize(img, IMG_SHAPE[:2], method='nearest')
+    img.set_shape(IMG_SHAPE)
+    return img
+
+# uint8 image -> model input
+def preprocess_image(img):
+    return tf.keras.applications.mobilenet_v2.preprocess_input(tf.cast(img, tf.float32))
+
+# File paths -> uint8 images, decoded in parallel (used to fill the image cache)
+def decode_images(filepaths, batch_size=64):
+    data = tf.data.Dataset.from_tensor_slices(list(filepaths))
+    data = data.map(load_image, num_parallel_calls=AUTOTUNE).batch(batch_size).prefetch(AUTOTUNE)
+    for batch in data.as_numpy_iterator():
+        yield from batch
+
+# Row index -> uint8 image read from the memory-mapped cache shards
+def cached_image_loader(filepaths, cache_dir):
+    return shard_image_loader(ImageCache(cache_dir).get_shards(filepaths, decode_images))
+
+# Shard files (SHARD_SIZE images each, in row order) -> memory-mapped row loader
+def shard_image_loader(shard_paths):
+    shards = [np.load(shard, mmap_mode='r') for shard in shard_paths]
+
+    def read(idx):
+        return np.array(shards[idx // SHARD_SIZE][idx % SHARD_SIZE])
+
+    def load(idx):
+        img = tf.numpy_function(read, [idx], tf.uint8)
+        img.set_shape(IMG_SHAPE)
+        return img
+
+    return load
+
 # batch_size=16 (limited performance), batch_size=32 (normal)
-def create_image_generators(data_df):
-    image_gen = ImageDataGenerator(preprocessing_function=tf.keras.applications.mobilenet_v2.preprocess_input)
-    data = image_gen.flow_from_dataframe(dataframe=data_df, x_col="filepaths", y_col="classes",
-                                          target_size=(256, 256), color_mode='rgb',
-                                          class_mode="categorical", batch_size=16, shuffle=False)
-    return data
\ No newline at end of file
+# cache_dir: stream decoded images from an ImageCache instead of decoding the files
+# targets: optional per-row float array appended to the one-hot label (e.g. teacher soft targets)
+def create_image_generators(data_df, batch_size=BATCH_SIZE, shuffle=False, seed=42, cache_dir=None, targets=None):
+    class_indices = get_class_indices(data_df)
+    num_classes = len(class_indices)
+    filepaths = data_df['filepaths'].astype(str).tolist()
+    labels = [class_indices[cls] for cls in data_df['classes']]
+
+    if cache_dir:
+        sources, load_fn = np.arange(len(filepaths), dtype=np.int64), cached_image_loader(filepaths, cache_dir)
+    else:
+        sources, load_fn = filepaths, load_image
+
+    if targets is None:
+        data = tf.data.Dataset.from_tensor_slices((sources, labels))
+        parse = lambda source, label: (preprocess_image(load_fn(source)), tf.one_hot(label, num_classes))
+    else:
+        data = tf.data.Dataset.from_tensor_slices((sources, labels, np.asarray(targets, dtype=np.float32)))
+        parse = lambda source, label, target: (preprocess_image(load_fn(source)),
+                                               tf.concat([tf.one_hot(label, num_classes), target], axis=0))
+    if shuffle:
+        data = data.shuffle(len(filepaths), seed=seed, reshuffle_each_iteration=True)
+    data = data.map(parse, num_parallel_calls=AUTOTUNE)
+    data = data.batch(batch_size).prefetch(AUTOTUNE)
+
+    # Keep the generator attributes used by training and evaluation
+    data.class_indices = class_indices
+    data.samples = len(filepaths)
+    data.filenames = filepaths
+    return data
+
+# Rows of a DataFrame (positions in `indices`) read from the cache shards of the whole DataFrame.
+# Subsets such as cross-validation folds share the same decoded images instead of decoding them again.
+def create_subset_dataset(data_df, indices, shard_paths, batch_size=BATCH_SIZE, shuffle=False, seed=42):
+    class_indices = get_class_indices(data_df)
+    num_classes = len(class_indices)
+    indices = np.asarray(indices, dtype=np.int64)
+    labels = np.array([class_indices[cls] for cls in data_df['classes']])[indices]
+    load_fn = shard_image_loader(shard_paths)
+
+    data = tf.data.Dataset.from_tensor_slices((indices, labels))
+    if shuffle:
+        data = data.shuffle(len(indices), seed=seed, reshuffle_each_iteration=True)
+    data = data.map(lambda idx, label: (preprocess_image(load_fn(idx)), tf.one_hot(label, num_classes)),
+                    num_parallel_calls=AUTOTUNE)
+    data = data.batch(batch_size).prefetch(AUTOTUNE)
+
+    data.class_indices = class_indices
+    data.samples = len(indices)
+    data.filenames = data_df['filepaths'].astype(str).to_numpy()[indices].tolist()
+    return data
+
+# Packed shards (Batch Creator) -> same batches as create_image_generators.
+# Shards are read sequentially; when shuffling, several shards are interleaved.
+def create_shard_dataset(split_dir, batch_size=BATCH_SIZE, shuffle=False, seed=42, cycle_length=4):
+    meta = load_meta(split_dir)
+    class_indices = meta["class_indices"]
+    num_classes = len(class_indices)
+    shards = [os.path.join(split_dir, name) for name in meta["shards"]]
+
+    def parse(record):
+        raw = tf.io.decode_raw(record, tf.uint8)
+        img = tf.reshape(raw[1:], IMG_SHAPE)
+        return preprocess_image(img), tf.one_hot(tf.cast(raw[0], tf.int32), num_classes)
+
+    files = tf.data.Dataset.from_tensor_slices(shards)
+    if shuffle:
+        files = files.shuffle(len(shards), seed=seed, reshuffle_each_iteration=True)
+        data = files.interleave(lambda f: tf.data.FixedLengthRecordDataset(f, meta["record_bytes"], buffer_size=1 << 22),
+                                cycle_length=cycle_length, num_parallel_calls=AUTOTUNE, deterministic=False)
+        data = data.shuffle(4 * batch_size * cycle_length, seed=seed, reshuffle_each_iteration=True)
+    else:
+        data = tf.data.FixedLengthRecordDataset(shards, meta["record_bytes"], buffer_size=1 << 22)
+    data = data.map(parse, num_parallel_calls=AUTOTUNE).batch(batch_size).prefetch(AUTOTUNE)
+
+    data.class_indices = class_indices
+    data.samples = meta["count"]
+    data.filenames = meta["filepaths"]
+    return data
+
+# Input pipeline for a split CSV: packed shards if Batch Creator wrote them, else the images (cached)
+def create_split_dataset(csv_path, data_df, batch_size=BATCH_SIZE, shuffle=False, seed=42):
+    split_dir = packed_split_dir(csv_path, data_df)
+    if split_dir:
+        return create_shard_dataset(split_dir, batch_size=batch_size, shuffle=shuffle, seed=seed)
+    return create_image_generators(data_df, batch_size=batch_size, shuffle=shuffle, seed=seed,
+                                   cache_dir=image_cache_dir(csv_path))
\ No newline at end of file
@@ -0,0 +1,154 @@
+# type: ignore
+import os
+import time
+import hashlib
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+
+# Import custom modules
+from src.data_utils import create_split_dataset, create_image_generators, dataset_fingerprint
+from src.cache_utils import image_cache_dir
+from src.eval_cache import model_hash
+from src.eval_utils import evaluate_model
+from src.model_cache import model_memory_bytes
+from src.model_utils import select_model_by_name, build_model, compile_model, create_callbacks, plot_training_history
+from src.run_registry import get_registry
+from src.perf_utils import time_calls
+
+# Import configurations
+from config import MODELS_DIRECTORY, BATCH_SIZE, IMG_SHAPE
+
+EPSILON = 1e-7
+
+# .../models/<teacher>/soft_targets/<hash of teacher file + dataset>.npy
+def soft_targets_path(teacher_path, csv_path, data_df):
+    teacher_name = os.path.splitext(os.path.basename(teacher_path))[0]
+    key = hashlib.sha1(f"{model_hash(teacher_path)}|{dataset_fingerprint(csv_path, data_df)}".encode()).hexdigest()
+    return os.path.join(MODELS_DIRECTORY, teacher_name, "soft_targets", f"{key}.npy")
+
+# Teacher probabilities for every row of a CSV (CSV order), predicted once and cached
+def get_soft_targets(teacher, teacher_path, csv_path, data_df):
+    cache_path = soft_targets_path(teacher_path, csv_path, data_df)
+    if os.path.exists(cache_path):
+        print(f"📦 Using cached soft targets: {cache_path}")
+        return np.load(cache_path)
+
+    print(f"🔄 Predicting soft targets: {os.path.basename(csv_path)}")
+    data = create_split_dataset(csv_path, data_df)
+    probs = np.concatenate([teacher.predict_on_batch(images) for images, _ in data])
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path[:-len(".npy")] + ".tmp.npy"
+    np.save(tmp_path, probs.astype(np.float32))
+    os.replace(tmp_path, cache_path)
+    return probs
+
+# Softmax outputs -> temperature-softened distribution (log-probabilities act as logits)
+def soften(probs, temperature):
+    return tf.nn.softmax(tf.math.log(tf.clip_by_value(probs, EPSILON, 1.0)) / temperature)
+
+# y = [one-hot label | teacher probabilities]:
+# alpha * T^2 * KL(teacher_T || student_T) + (1 - alpha) * cross-entropy with the label
+def distillation_loss(num_classes, temperature=4.0, alpha=0.7):
+    kl = tf.keras.losses.KLDivergence(reduction=tf.keras.losses.Reduction.NONE)
+
+    def loss(y, probs):
+        hard, soft = y[:, :num_classes], y[:, num_classes:]
+        kd = kl(soften(soft, temperature), soften(probs, temperature)) * temperature ** 2
+        ce = tf.keras.losses.categorical_crossentropy(hard, probs)
+        return alpha * kd + (1 - alpha) * ce
+    return loss
+
+# Accuracy against the hard label part of y (same history key as the normal training)
+def distillation_accuracy(num_classes):
+    def accuracy(y, probs):
+        return tf.keras.metrics.categorical_accuracy(y[:, :num_classes], probs)
+    return accuracy
+
+# Cost of one model: single-image latency, weight memory, file size, parameters
+def serving_costs(model, model_path, latency_runs=50):
+    single = np.zeros((1,) + tuple(IMG_SHAPE), dtype=np.float32)
+    latencies = time_calls(lambda: model.predict_on_batch(single), latency_runs, warmup=3)
+    return {
+        "latency_p50_ms": float(np.percentile(latencies, 50)),
+        "latency_p99_ms": float(np.percentile(latencies, 99)),
+        "memory_mb": model_memory_bytes(model) / 1024 ** 2,
+        "file_size_mb": os.path.getsize(model_path) / 1024 ** 2,
+        "params": int(model.count_params()),
+    }
+
+# Train a small student on the cached soft targets of a trained teacher.
+# The student is saved as a normal .keras model (standard loss) in models/<student>/<date>/.
+def distill(teacher_path, train_csv, val_csv, test_csv=None, student_name="MobileNetV2", num_epochs=20,
+            temperature=4.0, alpha=0.7, learning_rate=0.001, batch_size=BATCH_SIZE, latency_runs=50):
+    date_str = time.strftime("%Y-%m-%d_%H-%M")
+    train_df, val_df = pd.read_csv(train_csv), pd.read_csv(val_csv)
+    num_classes = train_df['classes'].nunique()
+
+    teacher = load_model(teacher_path)
+    train_targets = get_soft_targets(teacher, teacher_path, train_csv, train_df)
+    val_targets = get_soft_targets(teacher, teacher_path, val_csv, val_df)
+
+    # Row-aligned targets: loose/cached images (packed shards are interleaved, no row order)
+    train_gen = create_image_generators(train_df, batch_size=batch_size, shuffle=True,
+                                        cache_dir=image_cache_dir(train_csv), targets=train_targets)
+    val_gen = create_image_generators(val_df, batch_size=batch_size, cache_dir=image_cache_dir(val_csv),
+                                      targets=val_targets)
+
+    model_fn, student_name = select_model_by_name(student_name)
+    student = build_model(model_fn, num_classes)
+    student.compile(optimizer=tf.keras.optimizers.Adamax(learning_rate=learning_rate),
+                    loss=distillation_loss(num_classes, temperature, alpha),
+                    metrics=[distillation_accuracy(num_classes)])
+
+    model_directory = os.path.join(MODELS_DIRECTORY, student_name, date_str)
+    os.makedirs(model_directory, exist_ok=True)
+    print(f"\n💡 Distilling {os.path.basename(teacher_path)} -> {student_name} (T={temperature}, alpha={alpha})")
+    history = student.fit(train_gen, epochs=num_epochs, validation_data=val_gen,
+                          callbacks=create_callbacks(student_name, model_directory, checkpoint=False))
+
+    # Export with the standard loss so the model loads without custom objects
+    student_path = os.path.join(model_directory, f"{student_name}.keras")
+    compile_model(student, learning_rate=learning_rate).save(student_path)
+    pd.DataFrame(history.history).to_csv(os.path.join(model_directory, "training_history.csv"), index=False)
+    plot_training_history(history, student_name, model_directory)
+    print(f"💾 Student saved: {student_path}")
+
+    try:
+        get_registry().record_training_run(
+            student_name, model_directory, train_csv, val_csv, history.history, model_path=student_path,
+            params={"training_mode": "Distillation", "teacher": os.path.abspath(teacher_path),
+                    "temperature": temperature, "alpha": alpha, "epochs": int(num_epochs)})
+    except Exception as e:
+        print(f"⚠️ Run not registered: {e}")
+
+    report = {
+        "teacher": os.path.abspath(teacher_path),
+        "student": student_path,
+        "temperature": temperature,
+        "alpha": alpha,
+        "epochs": len(history.epoch),
+        "best_val_accuracy": float(max(history.history["val_accuracy"])),
+    }
+
+    costs = {"teacher": serving_costs(teacher, teacher_path, latency_runs),
+             "student": serving_costs(student, student_path, latency_runs)}
+    report["costs"] = costs
+    report["speedup"] = costs["teacher"]["latency_p50_ms"] / costs["student"]["latency_p50_ms"]
+    report["memory_reduction"] = costs["teacher"]["memory_mb"] / costs["student"]["memory_mb"]
+
+    if test_csv:
+        test_df = pd.read_csv(test_csv)
+        teacher_eval = evaluate_model(teacher, create_split_dataset(test_csv, test_df), verbose=0, keep_predictions=True)
+        student_eval = evaluate_model(student, create_split_dataset(test_csv, test_df), verbose=0, keep_predictions=True)
+        _, teacher_probs = teacher_eval.predictions()
+        _, student_probs = student_eval.predictions()
+        report["test"] = {
+            "teacher_accuracy": float(teacher_eval.accuracy),
+            "student_accuracy": float(student_eval.accuracy),
+            "agreement": float(np.mean(teacher_probs.argmax(axis=1) == student_probs.argmax(axis=1))),
+        }
+
+    return report, history, model_directory
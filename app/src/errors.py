@@ -0,0 +1,6 @@
+# type: ignore
+
+# Expected failure of a pipeline stage (invalid input, missing model...). The message is shown as is:
+# the UI turns it into a gr.Error, the command line prints it and exits with a non-zero code.
+class PipelineError(Exception):
+    pass
@@ -0,0 +1,178 @@
+# type: ignore
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
+
+# Import custom modules
+from src.data_utils import dataset_fingerprint
+from src.run_registry import file_hash
+from src.file_utils import file_lock, load_json, save_json
+
+# Import configurations
+from config import MODELS_DIRECTORY, EVAL_CACHE, EVAL_CACHE_MAX_MB
+
+INDEX_FILENAME = "index.json"
+PREDICTIONS_FILENAME = "predictions.npz"
+REPORT_FILENAME = "report.txt"
+META_FILENAME = "meta.json"
+
+_model_hashes = {}  # (path, mtime, size) -> sha1, large .keras files are hashed once per process
+_model_hashes_lock = threading.Lock()
+
+def model_hash(model_path):
+    stat = os.stat(model_path)
+    memo_key = (os.path.abspath(model_path), stat.st_mtime_ns, stat.st_size)
+    with _model_hashes_lock:
+        if memo_key not in _model_hashes:
+            _model_hashes[memo_key] = file_hash(model_path)
+        return _model_hashes[memo_key]
+
+# Model file content + test CSV content + referenced image mtimes (+ evaluation options, e.g. TTA views)
+def eval_cache_key(model_path, test_csv, test_df=None, variant=None):
+    digest = hashlib.sha1(model_hash(model_path).encode())
+    digest.update(dataset_fingerprint(test_csv, test_df).encode())
+    if variant:
+        digest.update(f"|{variant}".encode())
+    return digest.hexdigest()
+
+# One folder per (model, test set): predictions.npz, predictions.csv, report.txt, confusion plot, meta.json.
+# The index keeps the size of every entry; the last access is the mtime of its predictions.npz, so a hit
+# does not rewrite the index. Index updates (UI process and eval job subprocesses) hold a file lock.
+class EvalCache:
+    def __init__(self, cache_dir, max_bytes=None):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes if max_bytes is not None else int(EVAL_CACHE_MAX_MB * 1024 ** 2)
+        self.index_path = os.path.join(cache_dir, INDEX_FILENAME)
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _load_index(self):
+        return load_json(self.index_path, {})
+
+    def _save_index(self, index):
+        save_json(self.index_path, index)
+
+    def _predictions_path(self, key):
+        return os.path.join(self.entry_dir(key), PREDICTIONS_FILENAME)
+
+    def _last_access(self, key):
+        try:
+            return os.path.getmtime(self._predictions_path(key))
+        except OSError:
+            return 0.0
+
+    def entry_dir(self, key):
+        return os.path.join(self.cache_dir, key)
+
+    # Entry folder if the predictions are cached (marks it as recently used), else None
+    def get(self, key):
+        if key not in self._load_index():
+            return None
+        try:
+            os.utime(self._predictions_path(key))
+        except OSError:  # Evicted meanwhile
+            return None
+        return self.entry_dir(key)
+
+    def load_predictions(self, key):
+        with np.load(os.path.join(self.entry_dir(key), PREDICTIONS_FILENAME)) as cached:
+            return cached["filepaths"].tolist(), cached["y_true"], cached["probs"]
+
+    def load_meta(self, key):
+        with open(os.path.join(self.entry_dir(key), META_FILENAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def load_report(self, key):
+        report_path = os.path.join(self.entry_dir(key), REPORT_FILENAME)
+        if not os.path.exists(report_path):
+            return None
+        with open(report_path, "r", encoding="utf-8") as f:
+            return f.read()
+
+    # Store the predictions and the outputs derived from them; files are copied into the entry
+    def put(self, key, filepaths, y_true, probs, class_names, meta, report=None, files=()):
+        entry_dir = self.entry_dir(key)
+        tmp_dir = tempfile.mkdtemp(prefix=f"{key}.", suffix=".tmp", dir=self.cache_dir)  # One per writer
+
+        try:
+            np.savez(os.path.join(tmp_dir, PREDICTIONS_FILENAME), filepaths=np.asarray(filepaths, dtype=str),
+                     y_true=y_true, probs=probs)
+            write_predictions_csv(os.path.join(tmp_dir, "predictions.csv"), filepaths, y_true, probs, class_names)
+            with open(os.path.join(tmp_dir, META_FILENAME), "w", encoding="utf-8") as f:
+                json.dump(meta, f, indent=2)
+            if report is not None:
+                with open(os.path.join(tmp_dir, REPORT_FILENAME), "w", encoding="utf-8") as f:
+                    f.write(report)
+            for path in files:
+                if path and os.path.exists(path):
+                    shutil.copy2(path, tmp_dir)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        with file_lock(self.index_path):
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            os.replace(tmp_dir, entry_dir)
+            index = self._load_index()
+            index[key] = {"bytes": _dir_size(entry_dir)}
+            self._evict(index, keep=key)
+            self._save_index(index)
+        return entry_dir
+
+    # Outputs regenerated inside an entry folder (e.g. a missing plot) count towards its size
+    def refresh_size(self, key):
+        with file_lock(self.index_path):
+            index = self._load_index()
+            if key in index:
+                index[key]["bytes"] = _dir_size(self.entry_dir(key))
+                self._save_index(index)
+
+    def save_report(self, key, report):
+        with open(os.path.join(self.entry_dir(key), REPORT_FILENAME), "w", encoding="utf-8") as f:
+            f.write(report)
+        self.refresh_size(key)
+
+    # Least recently used entries go first
+    def _evict(self, index, keep):
+        total = sum(entry["bytes"] for entry in index.values())
+        for key, entry in sorted(index.items(), key=lambda item: self._last_access(item[0])):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= entry["bytes"]
+            index.pop(key)
+            shutil.rmtree(self.entry_dir(key), ignore_errors=True)
+
+def _dir_size(path):
+    return sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+
+# filepath, true class, predicted class, confidence and one probability column per class
+def write_predictions_csv(csv_path, filepaths, y_true, probs, class_names):
+    predictions_df = pd.DataFrame({
+        "filepaths": filepaths,
+        "classes": [class_names[i] for i in np.argmax(y_true, axis=1)],
+        "predicted": [class_names[i] for i in np.argmax(probs, axis=1)],
+        "confidence": np.max(probs, axis=1),
+    })
+    for i, name in enumerate(class_names):
+        predictions_df[f"prob_{name}"] = probs[:, i]
+    predictions_df.to_csv(csv_path, index=False)
+    return csv_path
+
+_cache = None
+_cache_lock = threading.Lock()
+
+# Shared cache under MODELS_DIRECTORY/eval_cache (None if disabled)
+def get_eval_cache():
+    global _cache
+    if not EVAL_CACHE:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = EvalCache(os.path.join(MODELS_DIRECTORY, "eval_cache"))
+        return _cache
@@ -0,0 +1,107 @@
+# type: ignore
+import numpy as np
+import tensorflow as tf
+
+EPSILON = 1e-7  # Same clipping as Keras categorical_crossentropy
+
+# Accuracy, loss and confusion matrix built batch by batch (memory does not grow with the test set)
+# keep_predictions also stores every label/probability row (used by the evaluation cache).
+class StreamingEvaluator:
+    def __init__(self, class_indices, keep_predictions=False):
+        self.class_names = [name for name, _ in sorted(class_indices.items(), key=lambda item: item[1])]
+        num_classes = len(self.class_names)
+        self.cm = np.zeros((num_classes, num_classes), dtype=np.int64)
+        self.loss_sum = 0.0
+        self.count = 0
+        self.keep_predictions = keep_predictions
+        self._labels, self._probs = [], []
+
+    # Rebuild the metrics from stored predictions (no inference)
+    @classmethod
+    def from_predictions(cls, class_indices, y_true, probs):
+        evaluator = cls(class_indices, keep_predictions=True)
+        evaluator.update(y_true, probs)
+        return evaluator
+
+    def update(self, y_true, probs):
+        y_true = np.asarray(y_true)
+        probs = np.asarray(probs, dtype=np.float64)
+        np.add.at(self.cm, (y_true.argmax(axis=1), probs.argmax(axis=1)), 1)
+        if self.keep_predictions:
+            self._labels.append(y_true.astype(np.float32))
+            self._probs.append(probs.astype(np.float32))
+
+        probs = np.clip(probs / probs.sum(axis=1, keepdims=True), EPSILON, 1 - EPSILON)
+        self.loss_sum += float(-(y_true * np.log(probs)).sum())
+        self.count += len(y_true)
+
+    # (y_true one-hot, probabilities) of every sample seen, in order
+    def predictions(self):
+        num_classes = len(self.class_names)
+        if not self._probs:
+            return np.zeros((0, num_classes), np.float32), np.zeros((0, num_classes), np.float32)
+        return np.concatenate(self._labels), np.concatenate(self._probs)
+
+    @property
+    def loss(self):
+        return self.loss_sum / self.count if self.count else 0.0
+
+    @property
+    def accuracy(self):
+        return np.trace(self.cm) / self.count if self.count else 0.0
+
+    # Precision, recall, F1 and support per class (zero when undefined)
+    def per_class_metrics(self):
+        tp = np.diag(self.cm).astype(np.float64)
+        support = self.cm.sum(axis=1)
+        predicted = self.cm.sum(axis=0)
+        precision = np.divide(tp, predicted, out=np.zeros_like(tp), where=predicted > 0)
+        recall = np.divide(tp, support, out=np.zeros_like(tp), where=support > 0)
+        # 2tp / (support + predicted), as sklearn computes it (same rounding in the report)
+        f1 = np.divide(2 * tp, support + predicted, out=np.zeros_like(tp), where=(support + predicted) > 0)
+        return precision, recall, f1, support
+
+    # Same text layout as sklearn.metrics.classification_report
+    def classification_report(self, digits=2):
+        precision, recall, f1, support = self.per_class_metrics()
+        present = (self.cm.sum(axis=1) + self.cm.sum(axis=0)) > 0
+        names = [name for name, keep in zip(self.class_names, present) if keep]
+        precision, recall, f1, support = precision[present], recall[present], f1[present], support[present]
+
+        headers = ["precision", "recall", "f1-score", "support"]
+        width = max(max(len(name) for name in names), len("weighted avg"), digits)
+        head_fmt = "{:>{width}s} " + " {:>9}" * len(headers)
+        row_fmt = "{:>{width}s} " + " {:>9.{digits}f}" * 3 + " {:>9}\n"
+
+        report = head_fmt.format("", *headers, width=width) + "\n\n"
+        for row in zip(names, precision, recall, f1, support):
+            report += row_fmt.format(*row, width=width, digits=digits)
+        report += "\n"
+
+        total = int(support.sum())
+        accuracy = np.diag(self.cm)[present].sum() / total if total else 0.0
+        acc_fmt = "{:>{width}s} " + " {:>9.{digits}}" * 2 + " {:>9.{digits}f}" + " {:>9}\n"
+        report += acc_fmt.format("accuracy", "", "", accuracy, total, width=width, digits=digits)
+
+        report += row_fmt.format("macro avg", precision.mean(), recall.mean(), f1.mean(), total,
+                                 width=width, digits=digits)
+        def weighted(values):  # np.average, as sklearn
+            return np.average(values, weights=support) if total else 0.0
+
+        report += row_fmt.format("weighted avg", weighted(precision), weighted(recall), weighted(f1), total,
+                                 width=width, digits=digits)
+        return report
+
+# One pass over the data: every batch is predicted once and folded into the evaluator
+def evaluate_model(model, data, verbose=1, keep_predictions=False):
+    evaluator = StreamingEvaluator(data.class_indices, keep_predictions=keep_predictions)
+    steps = int(data.cardinality().numpy())
+    progbar = tf.keras.utils.Progbar(steps if steps > 0 else None, verbose=verbose,
+                                     stateful_metrics=["loss", "accuracy"])
+
+    for step, (images, labels) in enumerate(data, start=1):
+        probs = model.predict_on_batch(images)
+        evaluator.update(labels.numpy(), probs)
+        progbar.update(step, values=[("loss", evaluator.loss), ("accuracy", evaluator.accuracy)])
+
+    return evaluator
@@ -0,0 +1,53 @@
+# type: ignore
+import os
+import json
+import tempfile
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: no inter-process lock, unique tmp files still keep every write atomic
+    fcntl = None
+
+# Exclusive lock on <path>.lock, held during a read-modify-write of path.
+# Shared by the UI process, job subprocesses and worker pools (each opening of the file is its own lock holder).
+@contextmanager
+def file_lock(path):
+    with open(path + ".lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+# Unique tmp file next to path (one per writer, so concurrent writers never share it)
+def unique_tmp_path(path, suffix=".tmp"):
+    fd, tmp_path = tempfile.mkstemp(prefix=f"{os.path.basename(path)}.", suffix=suffix,
+                                    dir=os.path.dirname(os.path.abspath(path)))
+    os.close(fd)
+    return tmp_path
+
+# Write through a unique tmp file, then rename it over path
+@contextmanager
+def atomic_write(path, mode="w", suffix=".tmp", **open_kwargs):
+    tmp_path = unique_tmp_path(path, suffix)
+    try:
+        with open(tmp_path, mode, **open_kwargs) as f:
+            yield f
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def load_json(path, default=None):
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return default
+
+def save_json(path, data, **dump_kwargs):
+    with atomic_write(path, encoding="utf-8") as f:
+        json.dump(data, f, **dump_kwargs)
@@ -0,0 +1,78 @@
+# type: ignore
+import os
+import numpy as np
+
+# Import custom modules
+from src.data_utils import create_split_dataset, dataset_fingerprint
+from src.model_utils import build_backbone, build_head, attach_head, compile_model, create_callbacks, merge_histories
+
+# Import configurations
+from config import MODELS_DIRECTORY, BATCH_SIZE
+
+# .../models/<model>/features/<dataset hash>.npz
+def feature_cache_path(model_name, csv_path, data_df):
+    return os.path.join(MODELS_DIRECTORY, model_name, "features", f"{dataset_fingerprint(csv_path, data_df)}.npz")
+
+# Pooled backbone features for every image of a CSV, computed once per (architecture, dataset)
+def get_features(backbone, model_name, csv_path, data_df):
+    cache_path = feature_cache_path(model_name, csv_path, data_df)
+    if os.path.exists(cache_path):
+        print(f"📦 Using cached features: {cache_path}")
+        with np.load(cache_path) as cached:
+            return cached["features"], cached["labels"]
+
+    print(f"🔄 Extracting features: {os.path.basename(csv_path)}")
+    data = create_split_dataset(csv_path, data_df)
+    features, labels = [], []
+    for images, batch_labels in data:
+        features.append(backbone.predict_on_batch(images))
+        labels.append(batch_labels.numpy())
+    features, labels = np.concatenate(features), np.concatenate(labels)
+
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    tmp_path = cache_path[:-len(".npz")] + ".tmp.npz"
+    np.savez(tmp_path, features=features, labels=labels)
+    os.replace(tmp_path, cache_path)
+    return features, labels
+
+# Linear probe: frozen backbone, only the softmax head is trained (on cached features).
+# Optional fine-tuning of the whole network afterwards. The best model is saved as
+# <model_directory>/<model_name>.keras, the same file create_callbacks would write.
+def train_head_only(model_fn, model_name, model_directory, train_set, val_set, train_df, val_df,
+                    num_epochs, fine_tune_epochs=0, fine_tune_lr=1e-4, batch_size=BATCH_SIZE,
+                    extra_callbacks=()):
+    backbone = build_backbone(model_fn)
+    backbone.trainable = False
+
+    x_train, y_train = get_features(backbone, model_name, train_set, train_df)
+    x_val, y_val = get_features(backbone, model_name, val_set, val_df)
+
+    head = build_head(x_train.shape[1], y_train.shape[1])
+    print("\n💡 Training classification head on cached features...")
+    history = head.fit(x_train, y_train, epochs=num_epochs, batch_size=batch_size, shuffle=True,
+                       validation_data=(x_val, y_val),
+                       callbacks=create_callbacks(model_name, model_directory, checkpoint=False)
+                       + list(extra_callbacks))
+
+    model = attach_head(backbone, head)
+    checkpoint_path = os.path.join(model_directory, f'{model_name}.keras')
+    model.save(checkpoint_path)
+    print(f"💾 Model saved: {checkpoint_path}")
+
+    if fine_tune_epochs <= 0:
+        return model, history
+
+    # Fine-tune the whole network, only overwriting the export if val_accuracy improves
+    backbone.trainable = True
+    compile_model(model, learning_rate=fine_tune_lr)
+    train_gen = create_split_dataset(train_set, train_df, batch_size=batch_size, shuffle=True)
+    val_gen = create_split_dataset(val_set, val_df, batch_size=batch_size)
+
+    print("\n💡 Fine-tuning the full network...")
+    head_epochs = len(history.epoch)
+    callbacks = create_callbacks(model_name, model_directory,
+                                 initial_value_threshold=max(history.history['val_accuracy']))
+    callbacks += list(extra_callbacks)
+    fine_history = model.fit(train_gen, epochs=head_epochs + fine_tune_epochs, initial_epoch=head_epochs,
+                             validation_data=val_gen, callbacks=callbacks)
+    return model, merge_histories(history, fine_history)
@@ -0,0 +1,88 @@
+# type: ignore
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+
+# Import custom modules
+from src.model_cache import get_model
+
+# Import configurations
+from config import INFERENCE_MAX_BATCH, INFERENCE_MAX_WAIT_MS
+
+# Dynamic micro-batching in front of the models.
+# Requests from any thread are queued per model on an asyncio loop, grouped into one batch
+# (up to max_batch_size images or max_wait_ms after the first request) and run in a single
+# forward pass. Each caller gets back the rows for its own images.
+class MicroBatcher:
+    def __init__(self, max_batch_size=INFERENCE_MAX_BATCH, max_wait_ms=INFERENCE_MAX_WAIT_MS):
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queues = {}  # model path -> asyncio.Queue
+        self._executor = ThreadPoolExecutor(max_workers=1)  # One forward pass at a time
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    # Blocking call, safe from any thread. images: (n, H, W, 3) preprocessed array
+    def predict(self, model_path, images):
+        future = asyncio.run_coroutine_threadsafe(self._submit(model_path, images), self._loop)
+        return future.result()
+
+    async def _submit(self, model_path, images):
+        queue = self._queues.get(model_path)
+        if queue is None:
+            queue = self._queues[model_path] = asyncio.Queue()
+            self._loop.create_task(self._worker(model_path, queue))
+
+        result = self._loop.create_future()
+        await queue.put((np.asarray(images, dtype=np.float32), result))
+        return await result
+
+    async def _collect(self, queue):
+        items = [await queue.get()]
+        size = len(items[0][0])
+        deadline = self._loop.time() + self.max_wait
+        while size < self.max_batch_size:
+            timeout = deadline - self._loop.time()
+            if timeout <= 0:
+                break
+            try:
+                item = await asyncio.wait_for(queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+            items.append(item)
+            size += len(item[0])
+        return items
+
+    async def _worker(self, model_path, queue):
+        while True:
+            items = await self._collect(queue)
+            batch = np.concatenate([images for images, _ in items])
+            try:
+                model = await self._loop.run_in_executor(self._executor, get_model, model_path)
+                preds = await self._loop.run_in_executor(self._executor, model.predict_on_batch, batch)
+            except Exception as e:
+                for _, result in items:
+                    if not result.done():
+                        result.set_exception(e)
+                continue
+
+            start = 0
+            for images, result in items:
+                if not result.done():
+                    result.set_result(np.asarray(preds[start:start + len(images)]))
+                start += len(images)
+
+_batcher = None
+_batcher_lock = threading.Lock()
+
+def get_batcher():
+    global _batcher
+    with _batcher_lock:
+        if _batcher is None:
+            _batcher = MicroBatcher()
+        return _batcher
+
+def predict(model_path, images):
+    return get_batcher().predict(model_path, images)
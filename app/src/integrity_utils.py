@@ -0,0 +1,139 @@
+# type: ignore
+import os
+import csv
+import multiprocessing as mp
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image
+
+# Import custom modules
+from src.manifest_utils import manifest_dir
+from src.file_utils import file_lock, atomic_write
+
+INTEGRITY_FILENAME = "integrity.csv"
+INTEGRITY_FIELDS = ["filepaths", "size", "mtime", "ok", "error", "dhash"]
+HASH_SIZE = 8  # 8x8 difference hash -> 64 bits
+NEAR_DUPLICATE_DISTANCE = 4  # Max differing bits between near-duplicates
+
+# Runs in a worker process: decodability check + 64-bit difference hash (grayscale 9x8 gradients)
+def scan_image(path):
+    stat = os.stat(path)
+    try:
+        with Image.open(path) as img:
+            img.verify()  # Truncated/corrupt headers
+        with Image.open(path) as img:
+            small = img.convert("L").resize((HASH_SIZE + 1, HASH_SIZE), Image.BILINEAR)
+            pixels = list(small.getdata())
+        bits = 0
+        for row in range(HASH_SIZE):
+            for col in range(HASH_SIZE):
+                left = pixels[row * (HASH_SIZE + 1) + col]
+                bits = (bits << 1) | (left > pixels[row * (HASH_SIZE + 1) + col + 1])
+        return [path, stat.st_size, stat.st_mtime_ns, 1, "", f"{bits:016x}"]
+    except Exception as e:
+        return [path, stat.st_size, stat.st_mtime_ns, 0, f"{type(e).__name__}: {e}", ""]
+
+def _load_results(cache_path):
+    try:
+        with open(cache_path, "r", newline="", encoding="utf-8") as f:
+            return {row["filepaths"]: row for row in csv.DictReader(f)}
+    except OSError:
+        return {}
+
+# Scan results for every path, cached per file by (size, mtime): only new or changed files are decoded
+def scan_images(images_set, filepaths, workers=None, chunksize=64):
+    cache_path = os.path.join(manifest_dir(images_set), INTEGRITY_FILENAME)
+    cached = _load_results(cache_path)
+
+    results, to_scan = {}, []
+    for path in filepaths:
+        row = cached.get(path)
+        try:
+            stat = os.stat(path)
+        except OSError as e:
+            results[path] = {"filepaths": path, "size": 0, "mtime": 0, "ok": "0", "error": str(e), "dhash": ""}
+            continue
+        if row and int(row["size"]) == stat.st_size and int(row["mtime"]) == stat.st_mtime_ns:
+            results[path] = row
+        else:
+            to_scan.append(path)
+
+    if to_scan:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=mp.get_context("spawn")) as pool:
+            for values in pool.map(scan_image, to_scan, chunksize=chunksize):
+                results[values[0]] = dict(zip(INTEGRITY_FIELDS, [str(value) for value in values]))
+
+    # Keep the results of files outside this scan (e.g. other samples of the same tree, saved meanwhile)
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    with file_lock(cache_path):
+        cached = _load_results(cache_path)
+        cached.update(results)
+        with atomic_write(cache_path, newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=INTEGRITY_FIELDS)
+            writer.writeheader()
+            writer.writerows(cached.values())
+    return [results[path] for path in filepaths], len(to_scan)
+
+class _UnionFind:
+    def __init__(self, size):
+        self.parent = list(range(size))
+
+    def find(self, i):
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i, j):
+        self.parent[self.find(i)] = self.find(j)
+
+# Hashes within max_distance bits -> same group id (connected components).
+# Multi-index hashing: the 64 bits are cut into max_distance + 1 bands; two hashes within
+# max_distance bits agree on at least one band, so only hashes sharing a band are compared.
+def group_near_duplicates(hashes, max_distance=NEAR_DUPLICATE_DISTANCE):
+    num_bands = max_distance + 1
+    bits = HASH_SIZE * HASH_SIZE
+    bounds = [round(i * bits / num_bands) for i in range(num_bands + 1)]
+    values = [int(h, 16) for h in hashes]
+
+    buckets = defaultdict(list)
+    for idx, value in enumerate(values):
+        for band in range(num_bands):
+            width = bounds[band + 1] - bounds[band]
+            buckets[(band, (value >> bounds[band]) & ((1 << width) - 1))].append(idx)
+
+    groups = _UnionFind(len(values))
+    for members in buckets.values():
+        for i, a in enumerate(members):
+            for b in members[i + 1:]:
+                if groups.find(a) != groups.find(b) and bin(values[a] ^ values[b]).count("1") <= max_distance:
+                    groups.union(a, b)
+    return [groups.find(idx) for idx in range(len(values))]
+
+# Group-aware splitting only matters when some group holds more than one image
+def has_duplicate_groups(data_df):
+    return 'group' in data_df and bool(data_df['group'].duplicated().any())
+
+# DataFrame (filepaths, classes) -> (readable rows with a 'group' column, unreadable rows, scan stats)
+def check_dataset(images_set, data_df, max_distance=NEAR_DUPLICATE_DISTANCE, workers=None):
+    results, scanned = scan_images(images_set, data_df['filepaths'].astype(str).tolist(), workers=workers)
+    ok = [row["ok"] == "1" for row in results]
+
+    corrupt_df = data_df[[not flag for flag in ok]].copy()
+    corrupt_df['error'] = [row["error"] for row, flag in zip(results, ok) if not flag]
+
+    clean_df = data_df[ok].copy()
+    roots = group_near_duplicates([row["dhash"] for row, flag in zip(results, ok) if flag], max_distance)
+    clean_df['group'] = roots
+
+    group_sizes = clean_df['group'].map(clean_df['group'].value_counts())
+    stats = {
+        "scanned": scanned,
+        "cached": len(results) - scanned,
+        "corrupt": len(corrupt_df),
+        "duplicate_groups": int(clean_df.loc[group_sizes > 1, 'group'].nunique()),
+        "duplicate_images": int((group_sizes > 1).sum()),
+        "mixed_class_groups": int((clean_df.groupby('group')['classes'].nunique() > 1).sum()),
+        "largest_group": int(group_sizes.max()) if len(clean_df) else 0,
+    }
+    return clean_df, corrupt_df, stats
@@ -0,0 +1,171 @@
+# type: ignore
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import threading
+import subprocess
+from collections import OrderedDict
+from datetime import datetime
+
+# Import custom modules
+from src.log_utils import collapse_console
+
+# Import configurations
+from config import MODELS_DIRECTORY, JOB_MAX_CONCURRENT, JOB_THREADS
+
+# Job kind -> (module, function) executed by src/job_runner.py
+JOB_TYPES = {
+    "train": ("train_val", "train_val_func"),
+    "eval": ("test_eval", "test_eval_func"),
+}
+
+EPOCH_PATTERN = re.compile(r"Epoch (\d+)/(\d+)")
+APP_DIRECTORY = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Training/evaluation jobs executed in worker processes.
+# At most max_concurrent jobs run at once, each one with its own TensorFlow thread budget
+# and its own log file (.../models/jobs/<job id>/job.log).
+class JobManager:
+    def __init__(self, jobs_directory, max_concurrent=JOB_MAX_CONCURRENT, threads_per_job=JOB_THREADS):
+        self.jobs_directory = jobs_directory
+        self.max_concurrent = max_concurrent
+        self.threads_per_job = threads_per_job
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+        self._progress_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._scheduler = threading.Thread(target=self._schedule, daemon=True)
+        self._scheduler.start()
+
+    def submit(self, kind, *args):
+        if kind not in JOB_TYPES:
+            raise ValueError(f"Unknown job type: {kind}")
+
+        job_id = f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+        job_dir = os.path.join(self.jobs_directory, job_id)
+        os.makedirs(job_dir, exist_ok=True)
+
+        module, function = JOB_TYPES[kind]
+        job = {
+            "id": job_id,
+            "kind": kind,
+            "description": " | ".join(os.path.basename(str(arg)) for arg in args),
+            "status": "queued",
+            "created": time.time(),
+            "started": None,
+            "finished": None,
+            "log_path": os.path.join(job_dir, "job.log"),
+            "spec_path": os.path.join(job_dir, "job.json"),
+            "result_path": os.path.join(job_dir, "result.json"),
+            "process": None,
+            "epoch": "",  # Last "Epoch x/y" seen in the log, read up to log_offset
+            "log_offset": 0,
+        }
+        with open(job["spec_path"], "w", encoding="utf-8") as f:
+            json.dump({"module": module, "function": function, "args": list(args),
+                       "threads": self.threads_per_job, "result_path": job["result_path"]}, f)
+
+        with self._lock:
+            self._jobs[job_id] = job
+        self._wakeup.set()
+        return job_id
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job["status"] not in ("queued", "running"):
+                return False
+            if job["process"] is not None:
+                job["process"].terminate()
+            job["status"] = "cancelled"
+            job["finished"] = time.time()
+        self._wakeup.set()
+        return True
+
+    def _start(self, job):
+        env = dict(os.environ)
+        env["PYTHONPATH"] = os.pathsep.join(filter(None, [APP_DIRECTORY, env.get("PYTHONPATH")]))
+        env["PYTHONIOENCODING"] = "utf-8"
+        log_file = open(job["log_path"], "a", encoding="utf-8")
+        job["process"] = subprocess.Popen([sys.executable, "-u", "-m", "src.job_runner", job["spec_path"]],
+                                          stdout=log_file, stderr=subprocess.STDOUT, env=env)
+        log_file.close()  # The child keeps its own handle
+        job["status"] = "running"
+        job["started"] = time.time()
+
+    def _schedule(self):
+        while True:
+            self._wakeup.wait(timeout=1.0)
+            self._wakeup.clear()
+            with self._lock:
+                for job in self._jobs.values():
+                    process = job["process"]
+                    if job["status"] == "running" and process.poll() is not None:
+                        job["status"] = "finished" if process.returncode == 0 else "failed"
+                        job["finished"] = time.time()
+
+                running = sum(job["status"] == "running" for job in self._jobs.values())
+                for job in self._jobs.values():
+                    if running >= self.max_concurrent:
+                        break
+                    if job["status"] == "queued":
+                        self._start(job)
+                        running += 1
+
+    def read_log(self, job_id, max_chars=20000):
+        job = self._jobs.get(job_id)
+        if job is None or not os.path.exists(job["log_path"]):
+            return ""
+        with open(job["log_path"], "r", encoding="utf-8", errors="replace") as f:
+            f.seek(max(0, os.path.getsize(job["log_path"]) - max_chars))
+            return collapse_console(f.read())
+
+    # Last "Epoch x/y" line printed by Keras. Only the part of the log written since the previous
+    # call is scanned (progress bar redraws can push the Epoch line far back), up to its last full line.
+    def progress(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None or not os.path.exists(job["log_path"]):
+            return ""
+        with self._progress_lock:
+            with open(job["log_path"], "rb") as f:
+                f.seek(job["log_offset"])
+                chunk = f.read()
+            end = max(chunk.rfind(b"\n"), chunk.rfind(b"\r")) + 1
+            matches = EPOCH_PATTERN.findall(chunk[:end].decode("utf-8", errors="replace"))
+            if matches:
+                job["epoch"] = f"{matches[-1][0]}/{matches[-1][1]}"
+            job["log_offset"] += end
+            return job["epoch"]
+
+    def result(self, job_id):
+        job = self._jobs.get(job_id)
+        if job is None or not os.path.exists(job["result_path"]):
+            return None
+        with open(job["result_path"], "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def list_jobs(self):
+        def fmt(ts):
+            return datetime.fromtimestamp(ts).strftime("%Y-%m-%d %H:%M:%S") if ts else ""
+
+        with self._lock:
+            jobs = list(self._jobs.values())
+        return [[job["id"], job["kind"], job["description"], job["status"], self.progress(job["id"]),
+                 fmt(job["created"]), fmt(job["started"]), fmt(job["finished"])] for job in jobs]
+
+    def job_ids(self):
+        with self._lock:
+            return list(self._jobs)
+
+_manager = None
+_manager_lock = threading.Lock()
+
+def get_job_manager():
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager(os.path.join(MODELS_DIRECTORY, "jobs"))
+        return _manager
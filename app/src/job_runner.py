@@ -0,0 +1,38 @@
+# type: ignore
+import sys
+import json
+import importlib
+import traceback
+
+# Import custom modules
+from src.perf_utils import configure_tensorflow
+
+# Worker process for one queued job: python -u -m src.job_runner <job.json>
+# stdout/stderr are redirected to the job log by the JobManager.
+def main(spec_path):
+    with open(spec_path, "r", encoding="utf-8") as f:
+        spec = json.load(f)
+
+    # Per-job thread budget, before TensorFlow runs anything
+    configure_tensorflow(threads=spec.get("threads"))
+
+    # Any error -> exit code 1 (the job is shown as failed) with the error message as its result
+    try:
+        module = importlib.import_module(spec["module"])
+        func = getattr(module, spec["function"])
+        outputs = func(*spec["args"])
+    except Exception as e:
+        traceback.print_exc()
+        with open(spec["result_path"], "w", encoding="utf-8") as f:
+            json.dump([f"❌ Job failed: {e}"], f)
+        return 1
+
+    # Keep the text and file outputs (e.g. summary and plot path) for the UI
+    outputs = outputs if isinstance(outputs, tuple) else (outputs,)
+    result = [out if isinstance(out, (str, int, float)) or out is None else None for out in outputs]
+    with open(spec["result_path"], "w", encoding="utf-8") as f:
+        json.dump(result, f)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1]))
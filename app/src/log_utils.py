@@ -1,15 +1,178 @@
 # type: ignore
+import re
 import sys
+import json
+import time
+import queue
+import threading
+import contextvars
+from contextlib import contextmanager
 
-class Tee:
-    def __init__(self, file):
-        self.terminal = sys.__stdout__  # Terminal output
-        self.log_file = file  # File output
+# Log file of the run executing in the current context (thread / request), None outside a run
+_current_log = contextvars.ContextVar("current_log", default=None)
+_install_lock = threading.Lock()
+
+PROGRESS_PATTERN = re.compile(r"^\s*(\d+)/(\d+) \[")  # Keras progress bar line
+LINE_END_PATTERN = re.compile(r"(?<=[\r\n])")  # Split after every line end, kept with its line
+PROGRESS_INTERVAL = 5.0  # Seconds between progress lines kept in the log file
+
+# Installed once as sys.stdout: everything goes to the terminal, and also to the log file
+# of the run printing it. Concurrent runs (e.g. two Gradio requests) never mix their logs.
+# Threads started inside a run only write to its log when started with context_thread.
+class RoutingStdout:
+    def __init__(self, terminal):
+        self.terminal = terminal
 
     def write(self, message):
         self.terminal.write(message)
-        self.log_file.write(message)
+        log = _current_log.get()
+        if log is not None:
+            log.write(message)
+        return len(message)
 
     def flush(self):
         self.terminal.flush()
-        self.log_file.flush()
\ No newline at end of file
+
+    # fileno, encoding, isatty, buffer... of the real stdout (used by Keras, faulthandler, subprocess)
+    def __getattr__(self, name):
+        return getattr(self.terminal, name)
+
+def install():
+    with _install_lock:
+        if not isinstance(sys.stdout, RoutingStdout):
+            sys.stdout = RoutingStdout(sys.stdout)
+
+# Thread running target in a copy of the caller's context, so its prints reach the caller's run log
+def context_thread(target, args=(), daemon=True):
+    return threading.Thread(target=contextvars.copy_context().run, args=(target, *args), daemon=daemon)
+
+# Console text as a terminal shows it: backspaces dropped, each line reduced to the last
+# non-empty part after a carriage return (Keras redraws its progress bar in place)
+def collapse_console(text):
+    lines = []
+    for line in text.split("\n"):
+        parts = [part for part in line.replace("\b", "").split("\r") if part.strip()]
+        lines.append(parts[-1] if parts else "")
+    return "\n".join(lines)
+
+# Keeps one progress bar line every `interval` seconds (and the final one of each bar).
+# Keras redraws the bar in place (backspaces + carriage return, possibly in a separate write):
+# control characters are dropped and every kept bar is written as its own line.
+class ProgressThrottle:
+    def __init__(self, interval=PROGRESS_INTERVAL):
+        self.interval = interval
+        self._last = 0.0
+        self._after_bar = False  # A kept bar already ended the line
+
+    def filter(self, message):
+        kept = []
+        for line in LINE_END_PATTERN.split(message.replace("\b", "")):
+            text = line.rstrip("\r\n")
+            match = PROGRESS_PATTERN.match(text)
+            if match:
+                now = time.monotonic()
+                done = match.group(1) == match.group(2)
+                if not done and now - self._last < self.interval:
+                    continue
+                self._last = 0.0 if done else now
+                kept.append(text + "\n")
+                self._after_bar = True
+            elif text:
+                kept.append(text + "\n" if line.endswith("\n") else text)
+                self._after_bar = False
+            elif line.endswith("\n"):
+                if not self._after_bar:
+                    kept.append("\n")
+                self._after_bar = False
+        return "".join(kept)
+
+# Log file written by a background thread. Writes are grouped in memory (up to flush_bytes or
+# flush_interval seconds) and handed over as chunks; at most max_chunks wait, then writers block.
+class BufferedLogWriter:
+    def __init__(self, path, mode="w", flush_bytes=64 * 1024, flush_interval=1.0, max_chunks=64):
+        self._file = open(path, mode, encoding="utf-8")
+        self._queue = queue.Queue(maxsize=max_chunks)
+        self._buffer, self._size = [], 0
+        self._flush_bytes, self._flush_interval = flush_bytes, flush_interval
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._closed = False
+        self._throttle = ProgressThrottle()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def write(self, message):
+        message = self._throttle.filter(message)
+        if not message:
+            return
+        with self._lock:
+            if self._closed:  # Late print of a thread that outlived the run: terminal only
+                return
+            self._buffer.append(message)
+            self._size += len(message)
+            if self._size >= self._flush_bytes or time.monotonic() - self._last_flush >= self._flush_interval:
+                self._flush_locked()
+
+    def _flush_locked(self):
+        if self._buffer:
+            self._queue.put("".join(self._buffer))
+            self._buffer, self._size = [], 0
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _run(self):
+        while True:
+            chunk = self._queue.get()
+            if chunk is None:
+                break
+            self._file.write(chunk)
+            if self._queue.empty():
+                self._file.flush()
+
+    def close(self):
+        with self._lock:
+            self._flush_locked()
+            self._closed = True
+        self._queue.put(None)
+        self._thread.join()
+        self._file.close()
+
+# Route this context's prints to a log file for the duration of the block
+@contextmanager
+def run_log(path, mode="w"):
+    install()
+    log = BufferedLogWriter(path, mode)
+    token = _current_log.set(log)
+    try:
+        yield log
+    finally:
+        _current_log.reset(token)
+        log.close()
+
+# Keras callback: one JSON line per epoch (epoch number, wall time, all logged metrics).
+# mode applies to the first fit only; later fits with the same callback append.
+def jsonl_epoch_logger(path, mode="w"):
+    import tensorflow as tf
+
+    class JsonlEpochLogger(tf.keras.callbacks.Callback):
+        def __init__(self):
+            super().__init__()
+            self._mode = mode
+
+        def on_train_begin(self, logs=None):
+            self._file = open(path, self._mode, encoding="utf-8")
+            self._mode = "a"
+
+        def on_epoch_end(self, epoch, logs=None):
+            record = {"epoch": epoch + 1, "time": time.time()}
+            record.update({key: float(value) for key, value in (logs or {}).items()})
+            self._file.write(json.dumps(record) + "\n")
+            self._file.flush()
+
+        def on_train_end(self, logs=None):
+            self._file.close()
+
+    return JsonlEpochLogger()
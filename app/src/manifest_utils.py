@@ -0,0 +1,101 @@
+# type: ignore
+import os
+import csv
+import heapq
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+
+# Import custom modules
+from src.file_utils import file_lock, atomic_write, load_json, save_json
+
+# Import configurations
+from config import IMAGES_DIRECTORY
+
+MANIFEST_DIRNAME = ".manifests"
+INDEX_FILENAME = "index.json"
+MANIFEST_FIELDS = ["filepaths", "classes", "size", "mtime"]
+
+# One manifest folder per source image tree: .../images/.manifests/<hash of the tree path>
+def manifest_dir(images_set):
+    key = hashlib.sha1(os.path.abspath(images_set).encode()).hexdigest()[:16]
+    return os.path.join(IMAGES_DIRECTORY, MANIFEST_DIRNAME, key)
+
+# Class folder -> <class>.csv (path, class, size, mtime), streamed with os.scandir
+def scan_class_dir(class_dir, class_name, manifest_path):
+    count = 0
+    with atomic_write(manifest_path, newline="", encoding="utf-8") as f, os.scandir(class_dir) as entries:
+        writer = csv.writer(f)
+        writer.writerow(MANIFEST_FIELDS)
+        for entry in entries:
+            if entry.is_file():
+                stat = entry.stat()
+                writer.writerow([entry.path, class_name, stat.st_size, stat.st_mtime_ns])
+                count += 1
+    return count
+
+def class_manifest_file(cls):
+    return f"{hashlib.sha1(cls.encode()).hexdigest()[:16]}.csv"
+
+# Index the class folders of a tree in parallel; unchanged folders (same mtime) are not rescanned.
+# Runs on the same tree (e.g. UI and command line) are serialized by a lock on the index.
+def build_manifest(images_set, workers=8):
+    out_dir = manifest_dir(images_set)
+    os.makedirs(out_dir, exist_ok=True)
+    index_path = os.path.join(out_dir, INDEX_FILENAME)
+    with file_lock(index_path):
+        return _update_manifest(images_set, out_dir, index_path, workers)
+
+def _update_manifest(images_set, out_dir, index_path, workers):
+    index = load_json(index_path, {})
+
+    class_dirs = {}
+    with os.scandir(images_set) as entries:
+        for entry in entries:
+            if entry.is_dir() and not entry.name.startswith("."):
+                class_dirs[entry.name] = (entry.path, entry.stat().st_mtime_ns)
+
+    to_scan = [cls for cls, (_, mtime) in class_dirs.items()
+               if index.get(cls, {}).get("dir_mtime") != mtime
+               or not os.path.exists(os.path.join(out_dir, index[cls]["file"]))]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = {cls: pool.submit(scan_class_dir, class_dirs[cls][0], cls,
+                                    os.path.join(out_dir, class_manifest_file(cls)))
+                   for cls in to_scan}
+        for cls, future in futures.items():
+            index[cls] = {"dir_mtime": class_dirs[cls][1], "count": future.result(),
+                          "file": class_manifest_file(cls)}
+
+    # Classes whose folder was removed
+    for cls in [cls for cls in index if cls not in class_dirs]:
+        stale_path = os.path.join(out_dir, index.pop(cls)["file"])
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+
+    save_json(index_path, index, indent=2)
+    return index
+
+def iter_manifest(images_set, index, cls):
+    with open(os.path.join(manifest_dir(images_set), index[cls]["file"]), "r", newline="", encoding="utf-8") as f:
+        yield from csv.DictReader(f)
+
+# Seeded bottom-k reservoir: keeps the k rows with the smallest hash(seed, path).
+# Memory is O(k) and the result does not depend on the listing order.
+def reservoir_sample(rows, k, seed=42):
+    heap = []  # Max-heap on priority (negated)
+    for row in rows:
+        priority = int.from_bytes(hashlib.sha1(f"{seed}|{row['filepaths']}".encode()).digest()[:8], "big")
+        item = (-priority, row['filepaths'], row['classes'])
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item > heap[0]:
+            heapq.heapreplace(heap, item)
+    return sorted((path, cls) for _, path, cls in heap)
+
+# Up to set_size images per class -> DataFrame (filepaths, classes)
+def sample_manifest(images_set, index, set_size, seed=42):
+    rows = []
+    for cls in sorted(index):
+        rows.extend(reservoir_sample(iter_manifest(images_set, index, cls), set_size, seed))
+    return pd.DataFrame(rows, columns=['filepaths', 'classes'])
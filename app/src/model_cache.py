@@ -0,0 +1,88 @@
+# type: ignore
+import os
+import threading
+from collections import OrderedDict
+import numpy as np
+from tensorflow.keras.models import load_model
+
+# Import configurations
+from config import IMG_SHAPE, MODEL_CACHE_MAX_MB, MODEL_WARMUP
+
+# Import custom modules
+from src.tflite_utils import TFLiteModel
+
+# .keras -> Keras model, .tflite -> TFLite interpreter wrapper
+def load_any_model(path):
+    if path.endswith(".tflite"):
+        return TFLiteModel(path)
+    return load_model(path)
+
+# Approximate memory used by a model (its weights)
+def model_memory_bytes(model):
+    if hasattr(model, "memory_bytes"):
+        return model.memory_bytes
+    return sum(int(np.prod(w.shape)) * w.dtype.size for w in model.weights)
+
+# Run a dummy batch so the predict function is traced before the first real request
+def warmup_model(model, batch_size=1):
+    model.predict(np.zeros((batch_size,) + tuple(IMG_SHAPE), dtype=np.float32), verbose=0)
+
+# Loaded models shared by every tab, keyed by (path, mtime) with LRU eviction
+class ModelRegistry:
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._models = OrderedDict()  # (path, mtime) -> (model, bytes)
+        self._loading = {}  # (path, mtime) -> lock held while the model is loading
+        self._lock = threading.Lock()
+
+    def get(self, path, warmup=False):
+        path = os.path.abspath(path)
+        key = (path, os.path.getmtime(path))
+
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                return self._models[key][0]
+            key_lock = self._loading.setdefault(key, threading.Lock())
+
+        # Only one thread loads a given model, the others wait for it
+        with key_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key][0]
+
+            model = load_any_model(path)
+            if warmup:
+                warmup_model(model)
+
+            with self._lock:
+                # A newer file replaces the previous version of the same model
+                for old_key in [k for k in self._models if k[0] == path]:
+                    del self._models[old_key]
+                self._models[key] = (model, model_memory_bytes(model))
+                self._loading.pop(key, None)
+                self._evict(keep=key)
+        return model
+
+    def _evict(self, keep):
+        total = sum(size for _, size in self._models.values())
+        for key in list(self._models):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= self._models.pop(key)[1]
+
+    def clear(self):
+        with self._lock:
+            self._models.clear()
+
+    def cached_models(self):
+        with self._lock:
+            return [(path, size) for (path, _), (_, size) in self._models.items()]
+
+registry = ModelRegistry(MODEL_CACHE_MAX_MB * 1024 ** 2)
+
+def get_model(path, warmup=MODEL_WARMUP):
+    return registry.get(path, warmup=warmup)
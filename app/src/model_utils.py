@@ -2,14 +2,17 @@
 import os
 import tensorflow as tf
 from tensorflow.keras.models import Model
-from tensorflow.keras.layers import Dense
-from tensorflow.keras.applications import InceptionV3, ResNet50, ResNet50V2, ResNet101, ResNet101V2, ResNet152, ResNet152V2, VGG16, VGG19, Xception
-from tensorflow.keras.callbacks import ModelCheckpoint, EarlyStopping, ReduceLROnPlateau
+from tensorflow.keras.layers import Dense, Input
+from tensorflow.keras.applications import InceptionV3, ResNet50, ResNet50V2, ResNet101, ResNet101V2, ResNet152, ResNet152V2, VGG16, VGG19, Xception, MobileNetV2
+from tensorflow.keras.callbacks import EarlyStopping, ReduceLROnPlateau, History
 import matplotlib.pyplot as plt
 import seaborn as sns
 from sklearn.metrics import confusion_matrix
 import numpy as np
 
+# Import custom modules
+from src.checkpoint_utils import AsyncModelCheckpoint
+
 # Import configurations
 from config import IMG_SHAPE
 
@@ -24,39 +27,69 @@ MODEL_DICT = {
     "ResNet152V2": ResNet152V2,
     "VGG16": VGG16,
     "VGG19": VGG19,
-    "Xception": Xception
+    "Xception": Xception,
+    "MobileNetV2": MobileNetV2
 }
 
 # TRAINING
 def select_model_by_name(name):
     return MODEL_DICT[name], name
 
+def get_pooling(model_fn):
+    return 'max' if model_fn in (VGG16, VGG19) else 'avg'
+
+def compile_model(model, learning_rate=0.001):
+    model.compile(optimizer=tf.keras.optimizers.Adamax(learning_rate=learning_rate),
+                  loss='categorical_crossentropy',
+                  metrics=['accuracy'])
+    return model
+
+def build_backbone(model_fn):
+    return model_fn(include_top=False, weights="imagenet", input_shape=IMG_SHAPE, pooling=get_pooling(model_fn))
+
 def build_model(model_fn, num_classes):
-    if model_fn in (VGG16, VGG19):
-        autoPooling = 'max'
-        print("Pooling: max")
-    else:
-        autoPooling = 'avg'
-        print("Pooling: avg")
-
-    base_model = model_fn(include_top=False, weights="imagenet", input_shape=IMG_SHAPE, pooling=autoPooling)
+    print(f"Pooling: {get_pooling(model_fn)}")
+
+    base_model = build_backbone(model_fn)
     x = base_model.output
     predictions = Dense(num_classes, activation='softmax')(x)
     model = Model(inputs=base_model.input, outputs=predictions)
-    model.compile(optimizer=tf.keras.optimizers.Adamax(learning_rate=0.001),
-                  loss='categorical_crossentropy',
-                  metrics=['accuracy'])
-    return model
+    return compile_model(model)
+
+# Softmax head trained on pooled backbone features
+def build_head(feature_dim, num_classes):
+    inputs = Input(shape=(feature_dim,))
+    predictions = Dense(num_classes, activation='softmax')(inputs)
+    return compile_model(Model(inputs=inputs, outputs=predictions))
 
-def create_callbacks(model_name, model_directory):
+# Backbone + trained head -> same architecture as build_model
+def attach_head(base_model, head):
+    dense = Dense(head.output_shape[-1], activation='softmax')
+    predictions = dense(base_model.output)
+    dense.set_weights(head.layers[-1].get_weights())
+    model = Model(inputs=base_model.input, outputs=predictions)
+    return compile_model(model)
+
+# Concatenate the epochs of several fit() runs into one History
+def merge_histories(*histories):
+    merged = History()
+    merged.history = {}
+    for history in histories:
+        for key, values in history.history.items():
+            merged.history.setdefault(key, []).extend(values)
+    return merged
+
+# checkpoint=False when the trained model is not the one to export (e.g. head-only training)
+def create_callbacks(model_name, model_directory, checkpoint=True, initial_value_threshold=None):
     checkpoint_filepath = os.path.join(model_directory, f'{model_name}.keras')
 
-    model_checkpoint_callback = ModelCheckpoint(
+    # Best model written by a background thread (the training loop only snapshots the weights)
+    model_checkpoint_callback = AsyncModelCheckpoint(
         filepath=checkpoint_filepath,
         monitor='val_accuracy',
         verbose=1,
         mode='max',
-        save_best_only=True)
+        initial_value_threshold=initial_value_threshold)
     
     training_stop = EarlyStopping(monitor='val_loss',
                                   verbose=1, patience=10,
@@ -69,6 +102,8 @@ def create_callbacks(model_name, model_directory):
                                   mode='min',
                                   min_lr=1e-5)
     
+    if not checkpoint:
+        return [training_stop, reduce_lr]
     return [model_checkpoint_callback, training_stop, reduce_lr]
 
 def plot_training_history(history, model_name, plot_save_directory):
@@ -99,11 +134,14 @@ def plot_training_history(history, model_name, plot_save_directory):
 # TEST
 def confusion(test, y_test, pred2, model_name, plot_save_directory):
     cm = confusion_matrix(y_test, pred2)
+    return plot_confusion_matrix(cm, test.class_indices, model_name, plot_save_directory)
+
+def plot_confusion_matrix(cm, class_indices, model_name, plot_save_directory):
     plt.figure(figsize=(15, 10))
     sns.heatmap(cm, annot=True, fmt='g', vmin=0, cmap='Blues')
-    ticks = np.arange(0.5, len(test.class_indices) + 0.5, 1)
-    plt.xticks(ticks, rotation=25, labels=test.class_indices)
-    plt.yticks(ticks, rotation=0, labels=test.class_indices)
+    ticks = np.arange(0.5, len(class_indices) + 0.5, 1)
+    plt.xticks(ticks, rotation=25, labels=class_indices)
+    plt.yticks(ticks, rotation=0, labels=class_indices)
     plt.xlabel("Predicted")
     plt.ylabel("Actual")
     plt.title("Confusion Matrix: " + model_name)
@@ -0,0 +1,62 @@
+# type: ignore
+import os
+import sys
+import time
+import numpy as np
+
+try:
+    import psutil
+except ImportError:  # Optional, falls back to the resource module (Linux/macOS)
+    psutil = None
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+# Resident memory of this process in MB (None if it cannot be measured)
+def current_rss_mb():
+    if psutil is not None:
+        return psutil.Process().memory_info().rss / 1024 ** 2
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1024 ** 2
+    except (OSError, ValueError, AttributeError):
+        return None
+
+# Peak resident memory of this process in MB (None if it cannot be measured)
+def peak_rss_mb():
+    if resource is not None:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak / 1024 ** 2 if sys.platform == "darwin" else peak / 1024
+    if psutil is not None:
+        info = psutil.Process().memory_info()
+        return getattr(info, "peak_wset", info.rss) / 1024 ** 2
+    return None
+
+# Call fn() `runs` times after `warmup` calls -> latencies in ms
+def time_calls(fn, runs, warmup=1):
+    for _ in range(warmup):
+        fn()
+    latencies = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return np.array(latencies)
+
+# Must run before TensorFlow executes any op in this process.
+# threads=None keeps the TensorFlow defaults; cpu_only hides every GPU.
+def configure_tensorflow(threads=None, cpu_only=False, seed=None):
+    if cpu_only:
+        os.environ["CUDA_VISIBLE_DEVICES"] = "-1"
+    import tensorflow as tf
+
+    if cpu_only:
+        tf.config.set_visible_devices([], "GPU")
+    if threads:
+        tf.config.threading.set_intra_op_parallelism_threads(int(threads))
+        tf.config.threading.set_inter_op_parallelism_threads(max(1, int(threads) // 2))
+    if seed is not None:
+        tf.keras.utils.set_random_seed(seed)
+        tf.config.experimental.enable_op_determinism()
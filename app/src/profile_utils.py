@@ -0,0 +1,89 @@
+# type: ignore
+import time
+import numpy as np
+import tensorflow as tf
+
+# Import custom modules
+from src.perf_utils import current_rss_mb
+
+# Columns added to the training history (one value per epoch)
+PROFILE_COLUMNS = ["data_wait_ms", "compute_ms", "input_bound_pct", "images_per_s", "rss_mb", "epoch_time_s"]
+
+# Per-epoch input vs compute profile, added to the logs (and so to history.history).
+# A train step is split at the moment its batch leaves the input pipeline: the time before is
+# spent waiting for data, the time after is compute. The moment is stamped by instrument(dataset).
+# trace_steps=(first, last) also records a TensorFlow profiler trace of those global steps in trace_dir.
+class EpochProfiler(tf.keras.callbacks.Callback):
+    def __init__(self, samples, trace_steps=None, trace_dir=None):
+        super().__init__()
+        self.samples = samples
+        self.trace_steps = tuple(trace_steps) if trace_steps and trace_dir else None
+        self.trace_dir = trace_dir
+        self.global_step = 0
+        self._ready = None
+        self._tracing = False
+
+    # Last map of the pipeline, executed when the train step pulls the batch
+    def instrument(self, data):
+        def stamp():
+            self._ready = time.perf_counter()
+            return np.int64(0)
+
+        def mark(images, labels):
+            with tf.control_dependencies([tf.numpy_function(stamp, [], tf.int64)]):
+                return tf.identity(images), labels
+
+        instrumented = data.map(mark)
+        for attr in ("class_indices", "samples", "filenames"):
+            if hasattr(data, attr):
+                setattr(instrumented, attr, getattr(data, attr))
+        return instrumented
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self._waits, self._computes = [], []
+        self._val_time = 0.0
+        self._epoch_start = time.perf_counter()
+
+    def on_train_batch_begin(self, batch, logs=None):
+        if self.trace_steps and self.global_step == self.trace_steps[0]:
+            tf.profiler.experimental.start(self.trace_dir)
+            self._tracing = True
+        self._ready = None
+        self._step_start = time.perf_counter()
+
+    def on_train_batch_end(self, batch, logs=None):
+        end = time.perf_counter()
+        ready = self._ready if self._ready is not None else self._step_start  # Not instrumented: all compute
+        ready = min(max(ready, self._step_start), end)
+        self._waits.append(ready - self._step_start)
+        self._computes.append(end - ready)
+
+        if self._tracing and self.global_step >= self.trace_steps[1]:
+            tf.profiler.experimental.stop()
+            self._tracing = False
+            print(f"\n🔬 Profiler trace saved: {self.trace_dir}")
+        self.global_step += 1
+
+    def on_test_begin(self, logs=None):
+        self._val_start = time.perf_counter()
+
+    def on_test_end(self, logs=None):
+        self._val_time += time.perf_counter() - self._val_start
+
+    def on_epoch_end(self, epoch, logs=None):
+        if logs is None or not self._waits:
+            return
+        epoch_time = time.perf_counter() - self._epoch_start
+        wait, compute = float(np.sum(self._waits)), float(np.sum(self._computes))
+        train_time = max(epoch_time - self._val_time, 1e-9)
+        logs["data_wait_ms"] = 1000 * wait / len(self._waits)
+        logs["compute_ms"] = 1000 * compute / len(self._computes)
+        logs["input_bound_pct"] = 100 * wait / (wait + compute) if wait + compute > 0 else 0.0
+        logs["images_per_s"] = self.samples / train_time
+        logs["rss_mb"] = current_rss_mb() or float("nan")
+        logs["epoch_time_s"] = epoch_time
+
+    def on_train_end(self, logs=None):
+        if self._tracing:
+            tf.profiler.experimental.stop()
+            self._tracing = False
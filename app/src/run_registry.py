@@ -0,0 +1,226 @@
+# type: ignore
+import os
+import re
+import json
+import sqlite3
+import hashlib
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+import pandas as pd
+
+# Import configurations
+from config import MODELS_DIRECTORY
+
+DATE_FORMAT = "%Y-%m-%d_%H-%M"
+TEST_ACCURACY_PATTERN = re.compile(r"Test Accuracy: ([\d.]+)%")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    architecture TEXT NOT NULL,
+    run_dir TEXT NOT NULL UNIQUE,
+    created TEXT NOT NULL,
+    dataset TEXT,
+    train_hash TEXT,
+    val_hash TEXT,
+    test_hash TEXT,
+    model_path TEXT,
+    params TEXT
+);
+CREATE TABLE IF NOT EXISTS epoch_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    epoch INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, epoch, name)
+);
+CREATE TABLE IF NOT EXISTS run_metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    value REAL,
+    PRIMARY KEY (run_id, name)
+);
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    path TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_runs_dataset ON runs (kind, dataset, architecture);
+CREATE INDEX IF NOT EXISTS idx_runs_hashes ON runs (kind, train_hash, test_hash);
+CREATE INDEX IF NOT EXISTS idx_run_metrics_name ON run_metrics (name, value);
+CREATE INDEX IF NOT EXISTS idx_artifacts_run ON artifacts (run_id);
+"""
+
+# sha1 of a file's bytes (None if the path is unknown)
+def file_hash(path):
+    if not path or not os.path.exists(path):
+        return None
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+# .../images/<dataset>/train_df.csv -> <dataset>
+def dataset_name(csv_path):
+    return os.path.basename(os.path.dirname(os.path.abspath(csv_path))) if csv_path else None
+
+# Training/test runs, their per-epoch metrics, final metrics and artifacts in one SQLite file
+class RunRegistry:
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(SCHEMA)
+
+    # One connection per operation (safe from any thread), committed and closed on exit
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            with conn:
+                yield conn
+        finally:
+            conn.close()
+
+    def _insert_run(self, conn, kind, architecture, run_dir, created, dataset=None, train_csv=None,
+                    val_csv=None, test_csv=None, model_path=None, params=None):
+        conn.execute("DELETE FROM runs WHERE run_dir = ?", (os.path.abspath(run_dir),))
+        cursor = conn.execute(
+            "INSERT INTO runs (kind, architecture, run_dir, created, dataset, train_hash, val_hash, test_hash, "
+            "model_path, params) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (kind, architecture, os.path.abspath(run_dir), created, dataset, file_hash(train_csv),
+             file_hash(val_csv), file_hash(test_csv), model_path and os.path.abspath(model_path),
+             json.dumps(params or {})))
+        return cursor.lastrowid
+
+    def _insert_children(self, conn, run_id, history=None, metrics=None, artifacts=None):
+        if history:
+            conn.executemany(
+                "INSERT INTO epoch_metrics (run_id, epoch, name, value) VALUES (?, ?, ?, ?)",
+                [(run_id, epoch, name, float(value)) for name, values in history.items()
+                 for epoch, value in enumerate(values, start=1) if pd.notna(value)])
+        if metrics:
+            conn.executemany("INSERT INTO run_metrics (run_id, name, value) VALUES (?, ?, ?)",
+                             [(run_id, name, float(value)) for name, value in metrics.items() if pd.notna(value)])
+        if artifacts:
+            conn.executemany("INSERT INTO artifacts (run_id, kind, path) VALUES (?, ?, ?)",
+                             [(run_id, kind, os.path.abspath(path)) for kind, path in artifacts.items() if path])
+
+    # history: {"loss": [...], "val_accuracy": [...], ...} as returned by model.fit
+    def record_training_run(self, architecture, run_dir, train_csv, val_csv, history, model_path=None,
+                            artifacts=None, params=None, created=None):
+        metrics = {}
+        if history.get("val_accuracy"):
+            metrics["best_val_accuracy"] = max(history["val_accuracy"])
+        if history.get("val_loss"):
+            metrics["best_val_loss"] = min(history["val_loss"])
+        metrics["epochs"] = len(next(iter(history.values()), []))
+
+        with self._lock, self._connect() as conn:
+            run_id = self._insert_run(conn, "train", architecture, run_dir, created or datetime.now().isoformat(),
+                                      dataset_name(train_csv), train_csv=train_csv, val_csv=val_csv,
+                                      model_path=model_path, params=params)
+            self._insert_children(conn, run_id, history=history, metrics=metrics, artifacts=artifacts)
+        return run_id
+
+    def record_test_run(self, architecture, run_dir, test_csv, model_path, metrics, artifacts=None,
+                        params=None, created=None):
+        with self._lock, self._connect() as conn:
+            run_id = self._insert_run(conn, "test", architecture, run_dir, created or datetime.now().isoformat(),
+                                      dataset_name(test_csv), test_csv=test_csv, model_path=model_path,
+                                      params=params)
+            self._insert_children(conn, run_id, metrics=metrics, artifacts=artifacts)
+        return run_id
+
+    def query(self, sql, params=()):
+        with self._connect() as conn:
+            return pd.read_sql_query(sql, conn, params=params)
+
+    # Best val_accuracy per architecture (optionally on one dataset)
+    def best_training_runs(self, dataset=None):
+        return self.query(
+            "SELECT r.architecture, r.id AS run_id, r.dataset, r.created, r.run_dir, r.model_path, "
+            "MAX(m.value) AS best_val_accuracy "
+            "FROM runs r JOIN run_metrics m ON m.run_id = r.id AND m.name = 'best_val_accuracy' "
+            "WHERE r.kind = 'train' AND (? IS NULL OR r.dataset = ?) "
+            "GROUP BY r.architecture ORDER BY best_val_accuracy DESC",
+            (dataset, dataset))
+
+    # Test runs with their metrics as columns (optionally on one dataset)
+    def test_results(self, dataset=None):
+        df = self.query(
+            "SELECT r.id AS run_id, r.architecture, r.dataset, r.created, r.model_path, m.name, m.value "
+            "FROM runs r JOIN run_metrics m ON m.run_id = r.id "
+            "WHERE r.kind = 'test' AND (? IS NULL OR r.dataset = ?)",
+            (dataset, dataset))
+        if df.empty:
+            return df
+        index = ["run_id", "architecture", "dataset", "created", "model_path"]
+        df[index] = df[index].fillna("")  # Imported runs have no dataset/model path
+        return df.pivot_table(index=index, columns="name", values="value").reset_index()
+
+    # Per-epoch metrics of one run as a DataFrame (one row per epoch)
+    def epoch_history(self, run_id):
+        df = self.query("SELECT epoch, name, value FROM epoch_metrics WHERE run_id = ? ORDER BY epoch", (run_id,))
+        if df.empty:
+            return df
+        return df.pivot(index="epoch", columns="name", values="value").reset_index(drop=True)
+
+    def has_run(self, run_dir):
+        with self._connect() as conn:
+            return conn.execute("SELECT 1 FROM runs WHERE run_dir = ?", (os.path.abspath(run_dir),)).fetchone() is not None
+
+    # Existing folders: models/<model>/<date>/training_history.csv and models/<model>/test/<date>/testing_log.txt
+    def import_existing_runs(self, models_directory=MODELS_DIRECTORY):
+        imported = 0
+        for architecture in sorted(os.listdir(models_directory)):
+            arch_dir = os.path.join(models_directory, architecture)
+            if not os.path.isdir(arch_dir):
+                continue
+            for date_str in sorted(os.listdir(arch_dir)):
+                run_dir = os.path.join(arch_dir, date_str)
+                history_path = os.path.join(run_dir, "training_history.csv")
+                if os.path.exists(history_path) and not self.has_run(run_dir):
+                    model_path = os.path.join(run_dir, f"{architecture}.keras")
+                    self.record_training_run(
+                        architecture, run_dir, None, None, pd.read_csv(history_path).to_dict("list"),
+                        model_path=model_path if os.path.exists(model_path) else None,
+                        artifacts={"history": history_path, "log": os.path.join(run_dir, "training_log.txt")},
+                        created=_folder_date(date_str), params={"imported": True})
+                    imported += 1
+
+            test_root = os.path.join(arch_dir, "test")
+            for date_str in sorted(os.listdir(test_root)) if os.path.isdir(test_root) else []:
+                run_dir = os.path.join(test_root, date_str)
+                log_path = os.path.join(run_dir, "testing_log.txt")
+                if os.path.exists(log_path) and not self.has_run(run_dir):
+                    with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+                        match = TEST_ACCURACY_PATTERN.search(f.read())
+                    metrics = {"test_accuracy": float(match.group(1)) / 100} if match else {}
+                    self.record_test_run(architecture, run_dir, None, None, metrics,
+                                         artifacts={"log": log_path}, created=_folder_date(date_str),
+                                         params={"imported": True})
+                    imported += 1
+        return imported
+
+def _folder_date(date_str):
+    try:
+        return datetime.strptime(date_str, DATE_FORMAT).isoformat()
+    except ValueError:
+        return date_str
+
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_registry():
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = RunRegistry(os.path.join(MODELS_DIRECTORY, "runs.sqlite"))
+        return _registry
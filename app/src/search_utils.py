@@ -0,0 +1,203 @@
+# type: ignore
+import os
+import math
+import json
+import time
+import random
+import shutil
+import itertools
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import pandas as pd
+
+# Import custom modules
+from src.perf_utils import configure_tensorflow
+
+# Successive halving over (architecture, learning rate, batch size) trials.
+# Trials run in spawned worker processes, each with its share of the CPU thread budget;
+# a trial promoted to the next rung resumes from its saved model (weights + optimizer state).
+
+# Runs once per worker process, before TensorFlow executes anything
+def init_worker(threads, seed):
+    configure_tensorflow(threads=threads, seed=seed)
+
+# Decode the train/val images once into the shared image cache (packed shards are used as they are)
+def warm_input_cache(csv_paths):
+    from src.data_utils import create_split_dataset
+
+    for csv_path in csv_paths:
+        create_split_dataset(csv_path, pd.read_csv(csv_path))
+    return True
+
+# Train one trial up to target_epochs (continuing from its previous rung)
+def run_trial(trial, train_csv, val_csv, target_epochs, seed):
+    import tensorflow as tf
+    from tensorflow.keras.models import load_model
+    from src.data_utils import create_split_dataset
+    from src.model_utils import select_model_by_name, build_model, compile_model
+
+    tf.keras.backend.clear_session()
+    train_df, val_df = pd.read_csv(train_csv), pd.read_csv(val_csv)
+    train_gen = create_split_dataset(train_csv, train_df, batch_size=trial["batch_size"], shuffle=True, seed=seed)
+    val_gen = create_split_dataset(val_csv, val_df, batch_size=trial["batch_size"])
+
+    model_path = os.path.join(trial["trial_dir"], "model.keras")
+    if trial["epochs_done"] > 0 and os.path.exists(model_path):
+        model = load_model(model_path)
+    else:
+        model_fn, _ = select_model_by_name(trial["model"])
+        model = compile_model(build_model(model_fn, train_df['classes'].nunique()), learning_rate=trial["learning_rate"])
+
+    start = time.perf_counter()
+    history = model.fit(train_gen, epochs=target_epochs, initial_epoch=trial["epochs_done"],
+                        validation_data=val_gen, verbose=2)
+    train_time = time.perf_counter() - start
+    model.save(model_path)
+
+    epochs = target_epochs - trial["epochs_done"]
+    return {
+        **trial,
+        "epochs_done": target_epochs,
+        "val_accuracy": float(history.history["val_accuracy"][-1]),
+        "val_loss": float(history.history["val_loss"][-1]),
+        "train_time_s": trial.get("train_time_s", 0.0) + train_time,
+        "s_per_epoch": train_time / max(1, epochs),
+        "images_per_s": epochs * len(train_df) / train_time if train_time > 0 else None,
+    }
+
+# Random sample of the (model, learning rate, batch size) grid (the whole grid if num_trials covers it)
+def sample_configs(models, learning_rates, batch_sizes, num_trials=None, seed=42):
+    grid = list(itertools.product(models, learning_rates, batch_sizes))
+    if num_trials and num_trials < len(grid):
+        grid = random.Random(seed).sample(grid, num_trials)
+    return [{"trial_id": f"{i:03d}_{model}_lr{lr:g}_bs{bs}", "model": model, "learning_rate": lr, "batch_size": bs}
+            for i, (model, lr, bs) in enumerate(grid)]
+
+# Rung targets (cumulative epochs): min_epochs, min_epochs*eta, ... capped at max_epochs
+def rung_schedule(min_epochs, max_epochs, eta):
+    rungs, epochs = [], min_epochs
+    while epochs < max_epochs:
+        rungs.append(epochs)
+        epochs *= eta
+    rungs.append(max_epochs)
+    return rungs
+
+# Hyperband brackets: (trials, starting epochs), from many short trials to a few long ones
+def hyperband_brackets(max_epochs, eta):
+    s_max = int(math.log(max_epochs) / math.log(eta) + 1e-9)
+    return [(int(math.ceil((s_max + 1) / (s + 1) * eta ** s)), max(1, int(max_epochs * eta ** -s)))
+            for s in range(s_max, -1, -1)]
+
+# One successive-halving bracket: train every trial to the rung target, keep the best 1/eta, repeat
+def successive_halving(pool, configs, train_csv, val_csv, output_dir, min_epochs, max_epochs, eta, seed, log=print):
+    trials = [{**config, "epochs_done": 0, "trial_dir": os.path.join(output_dir, "trials", config["trial_id"])}
+              for config in configs]
+    for trial in trials:
+        os.makedirs(trial["trial_dir"], exist_ok=True)
+
+    records = []
+    rungs = rung_schedule(min_epochs, max_epochs, eta)
+    for rung, target_epochs in enumerate(rungs):
+        log(f"\n🪜 Rung {rung}: {len(trials)} trials -> {target_epochs} epochs")
+        futures = [pool.submit(run_trial, trial, train_csv, val_csv, target_epochs, seed) for trial in trials]
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:  # A failing configuration (e.g. out of memory) is dropped
+                log(f"⚠️ Trial failed: {e}")
+        results.sort(key=lambda result: result["val_accuracy"], reverse=True)
+        for result in results:
+            log(f"   {result['trial_id']}: val_accuracy={result['val_accuracy']:.4f} "
+                f"({result['s_per_epoch']:.1f}s/epoch)")
+            records.append({**result, "rung": rung})
+
+        if not results:
+            return None, records
+        keep = results if rung == len(rungs) - 1 else results[:max(1, len(results) // eta)]
+        for dropped in results[len(keep):]:
+            os.remove(os.path.join(dropped["trial_dir"], "model.keras"))  # Free the disk early
+        trials = keep
+        if len(trials) == 1 and rung < len(rungs) - 1:
+            # Single survivor: train it to the full budget
+            log(f"\n🪜 Final: {trials[0]['trial_id']} -> {max_epochs} epochs")
+            try:
+                result = pool.submit(run_trial, trials[0], train_csv, val_csv, max_epochs, seed).result()
+            except Exception as e:  # Keep the survivor as trained at this rung
+                log(f"⚠️ Trial failed: {e}")
+                return trials[0], records
+            records.append({**result, "rung": rung + 1})
+            return result, records
+
+    return trials[0], records
+
+# Search driver. hyperband=True runs several brackets (different trade-offs between the number
+# of trials and the epochs each one gets) and keeps the best winner.
+def run_search(configs, train_csv, val_csv, output_dir, min_epochs=1, max_epochs=27, eta=3,
+               workers=2, thread_budget=None, hyperband=False, seed=42, log=print):
+    os.makedirs(output_dir, exist_ok=True)
+    thread_budget = thread_budget or os.cpu_count()
+    threads = max(1, thread_budget // workers)
+    log(f"⚙️ {len(configs)} configurations, {workers} workers x {threads} threads")
+
+    start = time.perf_counter()
+    ctx = mp.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=ctx, initializer=init_worker,
+                             initargs=(threads, seed)) as pool:
+        pool.submit(warm_input_cache, [train_csv, val_csv]).result()
+
+        if hyperband:
+            brackets = hyperband_brackets(max_epochs, eta)
+            rng = random.Random(seed)
+            plan = [(rng.sample(configs, min(n, len(configs))), epochs) for n, epochs in brackets]
+        else:
+            plan = [(configs, min_epochs)]
+
+        winners, records = [], []
+        for bracket, (bracket_configs, start_epochs) in enumerate(plan):
+            bracket_dir = os.path.join(output_dir, f"bracket_{bracket}") if hyperband else output_dir
+            winner, bracket_records = successive_halving(pool, bracket_configs, train_csv, val_csv, bracket_dir,
+                                                         start_epochs, max_epochs, eta, seed, log=log)
+            records.extend({**record, "bracket": bracket} for record in bracket_records)
+            if winner:
+                winners.append(winner)
+
+    # Every completed rung is listed, also when the search ends without a winner
+    if records:
+        pd.DataFrame(records).drop(columns=["trial_dir"]).to_csv(os.path.join(output_dir, "trials.csv"),
+                                                                 index=False)
+    if not winners:
+        raise RuntimeError("Every trial failed.")
+    winner = max(winners, key=lambda result: result["val_accuracy"])
+    report = search_report(winner, records, configs, max_epochs, time.perf_counter() - start)
+
+    winner_path = os.path.join(output_dir, f"{winner['model']}.keras")
+    shutil.copy2(os.path.join(winner["trial_dir"], "model.keras"), winner_path)
+    report["winner_model_path"] = winner_path
+
+    with open(os.path.join(output_dir, "search_report.json"), "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    return report
+
+# Compute actually spent vs training every configuration for max_epochs
+def search_report(winner, records, configs, max_epochs, wall_time_s):
+    records_df = pd.DataFrame(records)
+    last = records_df.sort_values("epochs_done").groupby(["bracket", "trial_id"]).last()
+    epochs_used = int(last["epochs_done"].sum())
+    epochs_exhaustive = len(configs) * max_epochs  # Hyperband brackets may retrain a configuration: can go below 0% saved
+    # Exhaustive time estimated from the measured seconds/epoch of each architecture
+    s_per_epoch = records_df.groupby("model")["s_per_epoch"].median()
+    exhaustive_s = sum(s_per_epoch.get(config["model"], s_per_epoch.mean()) * max_epochs for config in configs)
+    used_s = float(last["train_time_s"].sum())
+    return {
+        "winner": {key: winner[key] for key in ("trial_id", "model", "learning_rate", "batch_size",
+                                                 "epochs_done", "val_accuracy", "val_loss")},
+        "trials": len(configs),
+        "epochs_used": epochs_used,
+        "epochs_exhaustive": epochs_exhaustive,
+        "epochs_saved_pct": 100 * (1 - epochs_used / epochs_exhaustive),
+        "train_time_s": used_s,
+        "exhaustive_time_estimate_s": float(exhaustive_s),
+        "time_saved_pct": 100 * (1 - used_s / exhaustive_s) if exhaustive_s else None,
+        "wall_time_s": wall_time_s,
+    }
@@ -0,0 +1,108 @@
+# type: ignore
+import os
+import json
+import shutil
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+
+# Import custom modules
+from src.file_utils import save_json
+from src.perf_utils import configure_tensorflow
+
+# Import configurations
+from config import IMG_SHAPE
+
+META_FILENAME = "meta.json"
+SHARD_SIZE = 1024  # Records per shard
+
+# CSV written by Batch Creator -> split folder holding its packed shards
+SPLIT_NAMES = {"train_df.csv": "Train", "val_df.csv": "Val", "test_df.csv": "Test"}
+
+# Fixed-length record: 1 label byte + IMG_SHAPE uint8 pixels (readable with tf.data.FixedLengthRecordDataset)
+def record_bytes(shape=IMG_SHAPE):
+    return 1 + int(np.prod(shape))
+
+# Same pixels as the image input pipeline: decoded and resized by load_image itself
+def encode_record(path, label):
+    from src.data_utils import load_image
+
+    return bytes([label]) + load_image(path).numpy().tobytes()
+
+# Runs in a worker process (TensorFlow on one CPU thread): one shard file, written sequentially
+def write_shard(shard_path, filepaths, labels):
+    tmp_path = shard_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        for path, label in zip(filepaths, labels):
+            f.write(encode_record(path, label))
+    os.replace(tmp_path, shard_path)
+    return len(filepaths)
+
+# (size, mtime) of every source image, compared by packed_split_dir to detect edited images
+def source_stats(filepaths):
+    stats = []
+    for path in filepaths:
+        stat = os.stat(path)
+        stats.append([stat.st_size, stat.st_mtime_ns])
+    return stats
+
+# Split DataFrame -> <split_dir>/shard-XXXXX-of-YYYYY.bin + meta.json, shards written in parallel.
+# Records keep the DataFrame order.
+def write_packed_split(split_df, split_dir, shard_size=SHARD_SIZE, workers=None):
+    if os.path.exists(split_dir):
+        shutil.rmtree(split_dir)
+    os.makedirs(split_dir, exist_ok=True)
+
+    class_indices = {cls: idx for idx, cls in enumerate(sorted(split_df['classes'].unique()))}
+    if len(class_indices) > 256:
+        raise ValueError("Packed shards support up to 256 classes.")
+
+    filepaths = split_df['filepaths'].astype(str).tolist()
+    labels = [class_indices[cls] for cls in split_df['classes']]
+    num_shards = max(1, -(-len(filepaths) // shard_size))
+    shard_names = [f"shard-{i:05d}-of-{num_shards:05d}.bin" for i in range(num_shards)]
+    sources = source_stats(filepaths)  # Before encoding: an edit made meanwhile makes the shards stale
+
+    with ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=mp.get_context("spawn"),
+                             initializer=configure_tensorflow, initargs=(1, True)) as pool:
+        futures = [pool.submit(write_shard, os.path.join(split_dir, name),
+                               filepaths[i * shard_size:(i + 1) * shard_size],
+                               labels[i * shard_size:(i + 1) * shard_size])
+                   for i, name in enumerate(shard_names)]
+        count = sum(future.result() for future in futures)
+
+    meta = {
+        "count": count,
+        "shape": list(IMG_SHAPE),
+        "record_bytes": record_bytes(),
+        "class_indices": class_indices,
+        "shards": shard_names,
+        "filepaths": filepaths,
+        "sources": sources,
+    }
+    save_json(os.path.join(split_dir, META_FILENAME), meta)
+    return meta
+
+def load_meta(split_dir):
+    with open(os.path.join(split_dir, META_FILENAME), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+# .../<dataset>/train_df.csv -> .../<dataset>/Train if packed shards for the same rows exist, else None.
+# Shards are stale when the rows, the image shape or the size/mtime of any source image changed.
+def packed_split_dir(csv_path, data_df):
+    split_name = SPLIT_NAMES.get(os.path.basename(csv_path))
+    if split_name is None:
+        return None
+    split_dir = os.path.join(os.path.dirname(os.path.abspath(csv_path)), split_name)
+    if not os.path.exists(os.path.join(split_dir, META_FILENAME)):
+        return None
+    meta = load_meta(split_dir)
+    filepaths = data_df['filepaths'].astype(str).tolist()
+    if meta["filepaths"] != filepaths or meta["shape"] != list(IMG_SHAPE):
+        return None
+    try:
+        if meta.get("sources") != source_stats(filepaths):
+            return None
+    except OSError:  # A source image was removed
+        return None
+    return split_dir
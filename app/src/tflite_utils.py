@@ -0,0 +1,139 @@
+# type: ignore
+import os
+import threading
+import numpy as np
+import pandas as pd
+import tensorflow as tf
+from tensorflow.keras.models import load_model
+
+# Import custom modules
+from src.data_utils import create_image_generators
+from src.eval_utils import evaluate_model
+from src.perf_utils import current_rss_mb, time_calls
+
+# Import configurations
+from config import IMG_SHAPE
+
+# Inference backends selectable in the UI -> quantization mode (None = float .keras model)
+BACKENDS = {"Keras": None, "TFLite (dynamic)": "dynamic", "TFLite (int8)": "int8"}
+QUANTIZATION_MODES = ("dynamic", "int8")
+
+# .../ResNet50.keras -> .../ResNet50.int8.tflite
+def tflite_path_for(model_path, mode):
+    return f"{os.path.splitext(model_path)[0]}.{mode}.tflite"
+
+# Selected .keras model + backend -> file to load
+def resolve_backend(model_path, backend="Keras"):
+    mode = BACKENDS.get(backend)
+    if mode is None:
+        return model_path
+    path = tflite_path_for(model_path, mode)
+    if not os.path.exists(path):
+        raise FileNotFoundError(f"No {backend} export found for {os.path.basename(model_path)} (expected {path})")
+    return path
+
+# TFLite interpreter with the predict/predict_on_batch interface used by the Keras paths
+class TFLiteModel:
+    def __init__(self, model_path, num_threads=None):
+        self.model_path = model_path
+        self.interpreter = tf.lite.Interpreter(model_path=model_path, num_threads=num_threads)
+        self.interpreter.allocate_tensors()
+        self.input_details = self.interpreter.get_input_details()[0]
+        self.output_details = self.interpreter.get_output_details()[0]
+        self._batch_size = self.input_details["shape"][0]
+        self._lock = threading.Lock()  # The interpreter is not thread-safe
+
+    @property
+    def memory_bytes(self):
+        return os.path.getsize(self.model_path)
+
+    def _quantize(self, images):
+        dtype = self.input_details["dtype"]
+        if dtype == np.float32:
+            return images.astype(np.float32)
+        scale, zero_point = self.input_details["quantization"]
+        info = np.iinfo(dtype)
+        return np.clip(np.round(images / scale + zero_point), info.min, info.max).astype(dtype)
+
+    def _dequantize(self, outputs):
+        if outputs.dtype == np.float32:
+            return outputs
+        scale, zero_point = self.output_details["quantization"]
+        return (outputs.astype(np.float32) - zero_point) * scale
+
+    def predict_on_batch(self, images):
+        images = np.asarray(images, dtype=np.float32)
+        with self._lock:
+            if len(images) != self._batch_size:
+                self.interpreter.resize_tensor_input(self.input_details["index"], (len(images),) + tuple(IMG_SHAPE))
+                self.interpreter.allocate_tensors()
+                self.input_details = self.interpreter.get_input_details()[0]
+                self.output_details = self.interpreter.get_output_details()[0]
+                self._batch_size = len(images)
+            self.interpreter.set_tensor(self.input_details["index"], self._quantize(images))
+            self.interpreter.invoke()
+            outputs = self.interpreter.get_tensor(self.output_details["index"])
+        return self._dequantize(outputs)
+
+    def predict(self, x, batch_size=32, verbose=0):
+        if isinstance(x, tf.data.Dataset):
+            return np.concatenate([self.predict_on_batch(images) for images, _ in x])
+        x = np.asarray(x, dtype=np.float32)
+        return np.concatenate([self.predict_on_batch(x[i:i + batch_size]) for i in range(0, len(x), batch_size)])
+
+# Calibration images for full-int8 quantization, sampled from the training CSV
+def representative_dataset(train_df, samples=200):
+    sample_df = train_df.sample(min(samples, len(train_df)), random_state=42)
+    data = create_image_generators(sample_df, batch_size=1)
+
+    def generator():
+        for images, _ in data:
+            yield [images]
+
+    return generator
+
+# Trained .keras checkpoint -> dynamic-range or full-int8 .tflite next to it
+def export_tflite(model_path, train_csv, mode="dynamic", samples=200):
+    if mode not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown quantization mode: {mode}")
+
+    model = load_model(model_path)
+    converter = tf.lite.TFLiteConverter.from_keras_model(model)
+    converter.optimizations = [tf.lite.Optimize.DEFAULT]
+    if mode == "int8":
+        converter.representative_dataset = representative_dataset(pd.read_csv(train_csv), samples)
+        converter.target_spec.supported_ops = [tf.lite.OpsSet.TFLITE_BUILTINS_INT8]
+        converter.inference_input_type = tf.int8
+        converter.inference_output_type = tf.int8
+
+    output_path = tflite_path_for(model_path, mode)
+    with open(output_path, "wb") as f:
+        f.write(converter.convert())
+    return output_path
+
+# Float vs quantized: accuracy, single-image latency, load memory and file size
+def compare_backends(model_path, tflite_path, eval_csv=None, latency_runs=50):
+    single = np.zeros((1,) + tuple(IMG_SHAPE), dtype=np.float32)
+    eval_gen = create_image_generators(pd.read_csv(eval_csv)) if eval_csv else None
+
+    report = {}
+    for name, path, loader in (("float", model_path, load_model), ("tflite", tflite_path, TFLiteModel)):
+        rss_before = current_rss_mb()
+        model = loader(path)
+        rss_after = current_rss_mb()
+        latencies = time_calls(lambda: model.predict_on_batch(single), latency_runs, warmup=3)
+        report[name] = {
+            "path": path,
+            "file_size_mb": os.path.getsize(path) / 1024 ** 2,
+            "load_memory_mb": rss_after - rss_before if rss_before is not None else None,
+            "latency_p50_ms": float(np.percentile(latencies, 50)),
+            "latency_p99_ms": float(np.percentile(latencies, 99)),
+            "accuracy": float(evaluate_model(model, eval_gen, verbose=0).accuracy) if eval_gen is not None else None,
+        }
+
+    float_report, tflite_report = report["float"], report["tflite"]
+    report["size_reduction"] = float_report["file_size_mb"] / tflite_report["file_size_mb"]
+    report["latency_speedup"] = float_report["latency_p50_ms"] / tflite_report["latency_p50_ms"]
+    if eval_gen is not None:
+        report["accuracy_delta"] = tflite_report["accuracy"] - float_report["accuracy"]
+    return report
@@ -0,0 +1,66 @@
+# type: ignore
+import numpy as np
+import tensorflow as tf
+
+# Test-time augmentation. The views of a batch are built with batched tensor ops, stacked
+# view-major into one larger batch and predicted in a single forward pass; the probabilities
+# of the views of each image are then averaged.
+
+# Order in which views are added (num_views=1 is the plain prediction)
+TTA_VIEWS = ["identity", "flip", "shift_right", "shift_left", "shift_down", "shift_up", "crop", "flip_crop"]
+SHIFT_PIXELS = 8
+CROP_FRACTION = 0.9
+
+# (n, H, W, C) preprocessed images -> (num_views * n, H, W, C), view-major
+def tta_views(images, num_views, shift=SHIFT_PIXELS, crop_fraction=CROP_FRACTION):
+    images = tf.convert_to_tensor(images, dtype=tf.float32)
+    height, width = images.shape[1], images.shape[2]
+    names = TTA_VIEWS[:max(1, int(num_views))]
+
+    padded = None
+    if any(name.startswith("shift") for name in names):
+        # Reflect padding: shifted views have no empty border
+        padded = tf.pad(images, [[0, 0], [shift, shift], [shift, shift], [0, 0]], mode="REFLECT")
+
+    def shifted(dy, dx):
+        return padded[:, shift - dy:shift - dy + height, shift - dx:shift - dx + width, :]
+
+    def cropped(batch):
+        return tf.image.resize(tf.image.central_crop(batch, crop_fraction), (height, width))
+
+    builders = {
+        "identity": lambda: images,
+        "flip": lambda: tf.image.flip_left_right(images),
+        "shift_right": lambda: shifted(0, shift),
+        "shift_left": lambda: shifted(0, -shift),
+        "shift_down": lambda: shifted(shift, 0),
+        "shift_up": lambda: shifted(-shift, 0),
+        "crop": lambda: cropped(images),
+        "flip_crop": lambda: cropped(tf.image.flip_left_right(images)),
+    }
+    return tf.concat([builders[name]() for name in names], axis=0)
+
+# predict_fn: (m, H, W, C) -> (m, classes). One call for all the views of all the images.
+def predict_tta(predict_fn, images, num_views):
+    images = np.asarray(images, dtype=np.float32)
+    if num_views <= 1:
+        return np.asarray(predict_fn(images))
+    probs = np.asarray(predict_fn(tta_views(images, num_views).numpy()))
+    return probs.reshape(-1, len(images), probs.shape[-1]).mean(axis=0)
+
+# Model wrapper: predict_on_batch averages num_views augmented views (usable by evaluate_model)
+class TTAModel:
+    def __init__(self, model, num_views):
+        self.model = model
+        self.num_views = int(num_views)
+
+    @property
+    def memory_bytes(self):
+        from src.model_cache import model_memory_bytes
+        return model_memory_bytes(self.model)
+
+    def predict_on_batch(self, images):
+        return predict_tta(self.model.predict_on_batch, images, self.num_views)
+
+    def predict(self, images, verbose=0):
+        return self.predict_on_batch(images)
@@ -1,25 +1,59 @@
 # type: ignore
 import os
-import sys
-import numpy as np
 from datetime import datetime
 import pandas as pd
-import gradio as gr
-from tensorflow.keras.models import load_model
-from sklearn.metrics import classification_report, accuracy_score
 
 # Import custom modules
-from src.data_utils import create_image_generators
-from src.log_utils import Tee
-from src.model_utils import confusion
+from src.data_utils import create_split_dataset
+from src.log_utils import run_log
+from src.model_utils import plot_confusion_matrix
+from src.eval_utils import StreamingEvaluator, evaluate_model
+from src.eval_cache import get_eval_cache, eval_cache_key, write_predictions_csv
+from src.model_cache import get_model
+from src.tflite_utils import resolve_backend
+from src.tta_utils import TTAModel
+from src.run_registry import get_registry
+from src.errors import PipelineError
 
 # Import configurations
-from config import MODELS_DIRECTORY
-
-def test_eval_func(test_set, mod):
-    final_msg = "⚠️ An error occurred during testing."
-    image_path = None
-
+from config import MODELS_DIRECTORY, BATCH_SIZE
+
+def results_message(test_df, report, test_acc, cached=False):
+    return (
+        f"✅ Testing evaluation completed{' (cached result)' if cached else ''}.\n"
+        f"📊 Labels Distribution:\n"
+        f"{test_df['classes'].value_counts().to_string()}\n"
+        f"📜 Classification Report:\n"
+        f"{report}\n"
+        f"🎯 Test Accuracy: {test_acc * 100:.2f}%"
+    )
+
+# Same model file and test set content: report, confusion matrix and predictions come from the cache.
+# Missing outputs are rebuilt from the cached predictions, without running the model.
+def cached_results(cache, cache_key, test_df, model_name):
+    entry_dir = cache.entry_dir(cache_key)
+    meta = cache.load_meta(cache_key)
+    _, y_true, probs = cache.load_predictions(cache_key)
+    evaluator = StreamingEvaluator.from_predictions(meta["class_indices"], y_true, probs)
+
+    report = cache.load_report(cache_key)
+    if report is None:
+        report = evaluator.classification_report()
+        cache.save_report(cache_key, report)
+
+    image_path = os.path.join(entry_dir, f"{model_name}_confusion.png")
+    if not os.path.exists(image_path):
+        image_path = plot_confusion_matrix(evaluator.cm, meta["class_indices"], model_name, entry_dir)
+        cache.refresh_size(cache_key)
+
+    print(f"📦 Using cached evaluation: {entry_dir}")
+    final_msg = results_message(test_df, report, evaluator.accuracy, cached=True)
+    final_msg += f"\n📄 Predictions: {os.path.join(entry_dir, 'predictions.csv')}"
+    return final_msg, image_path, evaluator.accuracy
+
+# tta_views > 1: each test image is predicted as the average of that many augmented views.
+# Results go to <output_dir>/<model>/test/<date>/ -> dict with the summary, confusion matrix and accuracy.
+def run_evaluation(test_set, mod, backend="Keras", tta_views=1, batch_size=BATCH_SIZE, output_dir=MODELS_DIRECTORY):
     try:
         date_str = datetime.now().strftime("%Y-%m-%d_%H-%M")
         
@@ -27,70 +61,100 @@ def test_eval_func(test_set, mod):
         test_df = pd.read_csv(test_set)
 
         if test_df.empty:
-            raise gr.Error("❌ Test set is empty.")
+            raise PipelineError("❌ Test set is empty.")
+
+        try:
+            model_path = resolve_backend(mod, backend)
+        except Exception as e:
+            raise PipelineError(f"❌ Error loading model: {e}")
+        model_name = os.path.splitext(os.path.basename(model_path))[0]
+        model_og = os.path.basename(mod).split('.')[0]
 
-        test_gen = create_image_generators(test_df)
+        # Memoized evaluation: no inference and no new test folder
+        cache = get_eval_cache()
+        tta_views = max(1, int(tta_views or 1))
+        variant = f"tta{tta_views}" if tta_views > 1 else None
+        cache_key = eval_cache_key(model_path, test_set, test_df, variant) if cache else None
+        if cache and cache.get(cache_key):
+            final_msg, image_path, test_acc = cached_results(cache, cache_key, test_df, model_name)
+            return {"message": final_msg, "image_path": image_path, "accuracy": float(test_acc),
+                    "test_directory": cache.entry_dir(cache_key), "samples": len(test_df), "cached": True}
+
+        test_gen = create_split_dataset(test_set, test_df, batch_size=int(batch_size))
 
         # Load model
         try:
-            model = load_model(mod)
+            model = get_model(model_path)
         except Exception as e:
-            raise gr.Error(f"❌ Error loading model: {e}")
+            raise PipelineError(f"❌ Error loading model: {e}")
+        if tta_views > 1:
+            model = TTAModel(model, tta_views)
 
         # Create test directory
-        model_name = os.path.splitext(os.path.basename(mod))[0]
-        model_og = os.path.basename(mod).split('.')[0]
-        model_directory = os.path.join(MODELS_DIRECTORY, model_og)
+        model_directory = os.path.join(output_dir, model_og)
         test_directory = os.path.join(model_directory, "test", date_str)
         os.makedirs(test_directory, exist_ok=True)
 
         log_path = os.path.join(test_directory, "testing_log.txt")
-        with open(log_path, "w", encoding="utf-8") as log_file:
-
-            sys.stdout = Tee(log_file)
+        with run_log(log_path):
 
             print("\n📊 Labels Distribution:")
             print(test_df["classes"].value_counts())
 
-            print("\n🔍 Evaluating model on test data...")
-            _, test_acc = model.evaluate(test_gen, verbose=1)
+            print("\n🔍 Evaluating model on test data..." + (f" (TTA: {tta_views} views)" if tta_views > 1 else ""))
+            # Single pass: loss, accuracy and confusion matrix from the same predictions
+            evaluator = evaluate_model(model, test_gen, verbose=1, keep_predictions=True)
+            test_acc = evaluator.accuracy
             print(f"✅ Test Accuracy: {test_acc * 100:.2f}%")
 
-            # Get predictions
-            pred = model.predict(test_gen)
-            if pred.ndim > 1:  # If it's a probability matrix
-                pred = np.argmax(pred, axis=1)
-
-            # Convert indices to labels
-            labels = {v: k for k, v in test_gen.class_indices.items()}
-            pred_labels = [labels[idx] for idx in pred]
-
-            # Convert y_test to list
-            y_test = test_df["classes"].tolist()
-
             # Classification report
+            report = evaluator.classification_report()
             print("\n📜 Classification Report:")
-            print(classification_report(y_test, pred_labels))
+            print(report)
 
-            print("\n🎯 Accuracy of the Model:", "{:.2f}%".format(accuracy_score(y_test, pred_labels) * 100))
+            print("\n🎯 Accuracy of the Model:", "{:.2f}%".format(test_acc * 100))
 
-            final_msg = (
-                f"✅ Testing evaluation completed.\n"
-                f"📊 Labels Distribution:\n"
-                f"{test_df['classes'].value_counts().to_string()}\n"
-                f"📜 Classification Report:\n"
-                f"{classification_report(y_test, pred_labels)}\n"
-                f"🎯 Test Accuracy: {test_acc * 100:.2f}%"
-            )
+            final_msg = results_message(test_df, report, test_acc)
 
             # Generate confusion matrix
-            image_path = confusion(test_gen, y_test, pred_labels, model_name, test_directory)
-
-    except gr.Error as ge:
-        raise ge
+            image_path = plot_confusion_matrix(evaluator.cm, test_gen.class_indices, model_name, test_directory)
+
+            # Per-image predictions
+            y_true, probs = evaluator.predictions()
+            predictions_path = write_predictions_csv(os.path.join(test_directory, "predictions.csv"),
+                                                     test_gen.filenames, y_true, probs, evaluator.class_names)
+            final_msg += f"\n📄 Predictions: {predictions_path}"
+
+            if cache:
+                cache.put(cache_key, test_gen.filenames, y_true, probs, evaluator.class_names,
+                          meta={"model_path": os.path.abspath(model_path), "test_csv": os.path.abspath(test_set),
+                                "class_indices": test_gen.class_indices, "accuracy": float(test_acc),
+                                "loss": float(evaluator.loss), "test_directory": test_directory,
+                                "tta_views": tta_views},
+                          report=report, files=[image_path])
+
+            # Register the run (metadata, test set hash, metrics, artifacts)
+            precision, recall, f1, _ = evaluator.per_class_metrics()
+            metrics = {"test_accuracy": test_acc, "test_loss": evaluator.loss, "macro_precision": precision.mean(),
+                       "macro_recall": recall.mean(), "macro_f1": f1.mean()}
+            metrics.update({f"f1_{name}": value for name, value in zip(evaluator.class_names, f1)})
+            try:
+                get_registry().record_test_run(model_og, test_directory, test_set, model_path, metrics,
+                                               artifacts={"log": log_path, "confusion": image_path,
+                                                          "predictions": predictions_path},
+                                               params={"backend": backend, "tta_views": tta_views})
+            except Exception as e:
+                print(f"⚠️ Run not registered: {e}")
+
+    except PipelineError:
+        raise
     except Exception as e:
         print(f"❌ Error during execution: {e}")
-        raise gr.Error(f"❌ Unexpected error: {str(e)}")
-    finally:
-        sys.stdout = sys.__stdout__
-        return final_msg, image_path
\ No newline at end of file
+        raise PipelineError(f"❌ Unexpected error: {str(e)}") from e
+
+    return {"message": final_msg, "image_path": image_path, "accuracy": float(test_acc),
+            "test_directory": test_directory, "samples": len(test_df), "cached": False}
+
+def test_eval_func(test_set, mod, backend="Keras", tta_views=1):
+    result = run_evaluation(test_set, mod, backend, tta_views)
+    return result["message"], result["image_path"]
\ No newline at end of file
@@ -1,23 +1,26 @@
 # type: ignore
 import os
-import sys
+import shutil
 from datetime import datetime
 import pandas as pd
-import gradio as gr
 
 # Import custom modules
-from src.data_utils import create_image_generators
-from src.log_utils import Tee
+from src.data_utils import create_split_dataset
+from src.log_utils import run_log, jsonl_epoch_logger
 from src.model_utils import select_model_by_name, build_model, create_callbacks, plot_training_history
+from src.head_utils import train_head_only
+from src.profile_utils import EpochProfiler, PROFILE_COLUMNS
+from src.checkpoint_utils import ResumeCheckpoint, load_resume_state, RESUME_DIRNAME
+from src.run_registry import get_registry
+from src.errors import PipelineError
 
 # Import configurations
-from config import MODELS_DIRECTORY
-
-def train_val_func(train_set, val_set, mod, num_epochs):
-    final_msg = "⚠️ An error occurred during training."
-    history_df = None
-    image_path = None
+from config import MODELS_DIRECTORY, PROFILE_TRACE_STEPS, CHECKPOINT_EVERY_EPOCHS, BATCH_SIZE
 
+# resume_from: resume/state.json (or the run folder) of an interrupted Full training run.
+# The run is saved in <output_dir>/<model>/<date>/ -> dict with the summary, history, plot and paths.
+def run_training(train_set, val_set, mod, num_epochs, training_mode="Full", fine_tune_epochs=0, resume_from=None,
+                 batch_size=BATCH_SIZE, output_dir=MODELS_DIRECTORY):
     try:
         date_str = datetime.now().strftime("%Y-%m-%d_%H-%M")
 
@@ -26,33 +29,48 @@ def train_val_func(train_set, val_set, mod, num_epochs):
         val_df = pd.read_csv(val_set)
 
         if train_df.empty or val_df.empty:
-            raise gr.Error("❌ Training or validation set is empty.")
+            raise PipelineError("❌ Training or validation set is empty.")
 
         num_classes = train_df['classes'].nunique()
         if num_classes < 2:
-            raise gr.Error("❌ Not enough classes for training.")
+            raise PipelineError("❌ Not enough classes for training.")
 
         # Create image generators
-        train_gen = create_image_generators(train_df)
+        train_gen = create_split_dataset(train_set, train_df, batch_size=int(batch_size), shuffle=True)
         print(train_gen.class_indices)
-        val_gen = create_image_generators(val_df)
+        val_gen = create_split_dataset(val_set, val_df, batch_size=int(batch_size))
 
-        # Build model
+        # Build model (head-only mode builds it from the trained head)
         model_fn, model_name = select_model_by_name(mod)
-        model = build_model(model_fn, num_classes)
-
-        # Create directory to save the model
-        model_directory = os.path.join(MODELS_DIRECTORY, model_name, date_str)
+        head_only = training_mode == "Head-only"
+
+        resume_state = None
+        if resume_from:
+            if head_only:
+                raise PipelineError("❌ Only Full training runs can be resumed.")
+            try:
+                resume_state = load_resume_state(resume_from)
+            except Exception as e:
+                raise PipelineError(f"❌ Error loading resume state: {e}")
+            if resume_state.get("model_name") != model_name:
+                raise PipelineError(f"❌ The run to resume trained {resume_state.get('model_name')}, not {model_name}.")
+
+        model = None if head_only else build_model(model_fn, num_classes)
+
+        # Create directory to save the model (a resumed run keeps its directory)
+        if resume_state:
+            model_directory = resume_state["model_directory"]
+        else:
+            model_directory = os.path.join(output_dir, model_name, date_str)
         os.makedirs(model_directory, exist_ok=True)
 
-        # Configure output redirection
+        # Output of this run (only this request's prints) -> training_log.txt, epochs -> training_log.jsonl
         log_path = os.path.join(model_directory, "training_log.txt")
         summary_path = os.path.join(model_directory, "model_summary.txt")
+        log_mode = "a" if resume_state else "w"
+        epoch_logger = jsonl_epoch_logger(os.path.join(model_directory, "training_log.jsonl"), log_mode)
 
-        with open(log_path, "w", encoding="utf-8") as log_file, \
-             open(summary_path, "w", encoding="utf-8") as summary_file:
-
-            sys.stdout = Tee(log_file)
+        with run_log(log_path, log_mode), open(summary_path, "w", encoding="utf-8") as summary_file:
 
             print("\n📊 Labels Distribution:")
             print("\nTraining Set:")
@@ -60,23 +78,57 @@ def train_val_func(train_set, val_set, mod, num_epochs):
             print("\nValidation Set:")
             print(val_df["classes"].value_counts())
 
+            if head_only:
+                # Frozen backbone: train the head on cached features, then optional fine-tuning
+                model, history = train_head_only(model_fn, model_name, model_directory, train_set, val_set,
+                                                 train_df, val_df, int(num_epochs), int(fine_tune_epochs or 0),
+                                                 batch_size=int(batch_size), extra_callbacks=[epoch_logger])
+            else:
+                # Create callbacks (profiler first: its columns are added before the LR) and train the model
+                profiler = EpochProfiler(train_gen.samples, trace_steps=PROFILE_TRACE_STEPS,
+                                         trace_dir=os.path.join(model_directory, "profile"))
+                train_gen = profiler.instrument(train_gen)
+                callbacks = [profiler] + create_callbacks(model_name, model_directory) + [epoch_logger]
+                # Resumable state, saved last (after the other callbacks updated their counters)
+                resume_checkpoint = ResumeCheckpoint(model_directory, callbacks, every=CHECKPOINT_EVERY_EPOCHS,
+                                                     state=resume_state,
+                                                     info={"model_name": model_name, "train_set": train_set,
+                                                           "val_set": val_set, "num_epochs": int(num_epochs)})
+                callbacks.append(resume_checkpoint)
+                print("\n💡 Training in progress...")
+                history = model.fit(train_gen, epochs=int(num_epochs), validation_data=val_gen, callbacks=callbacks,
+                                    initial_epoch=resume_state["epoch"] if resume_state else 0)
+                history.history = resume_checkpoint.history  # Includes the epochs before an interruption
+
+                # Completed: the resumable state is no longer needed
+                shutil.rmtree(os.path.join(model_directory, RESUME_DIRNAME), ignore_errors=True)
+
             # Save model summary to a separate file
             model.summary(print_fn=lambda x: summary_file.write(x + "\n"))
 
-            # Create callbacks and train the model
-            callbacks = create_callbacks(model_name, model_directory)
-            print("\n💡 Training in progress...")
-            history = model.fit(train_gen, epochs=num_epochs, validation_data=val_gen, callbacks=callbacks)
-
             # Save training history
             history_df = pd.DataFrame(history.history)
             history_df.to_csv(os.path.join(model_directory, 'training_history.csv'), index=False)
             history_df['lr'] = history_df['lr'].apply(lambda x: f"{x:.5f}")
             history_df = history_df.round({'loss':5, 'accuracy':5, 'val_loss':5, 'val_accuracy':5})
+            history_df = history_df.round({column: 2 for column in PROFILE_COLUMNS if column in history_df})
 
             # Plot training history
             image_path = plot_training_history(history, model_name, model_directory)
 
+            # Register the run (metadata, dataset hashes, per-epoch metrics, artifacts)
+            try:
+                get_registry().record_training_run(
+                    model_name, model_directory, train_set, val_set, history.history,
+                    model_path=os.path.join(model_directory, f"{model_name}.keras"),
+                    artifacts={"history": os.path.join(model_directory, 'training_history.csv'),
+                               "log": log_path, "epoch_log": os.path.join(model_directory, "training_log.jsonl"),
+                               "summary": summary_path, "plot": image_path},
+                    params={"epochs": int(num_epochs), "training_mode": training_mode,
+                            "fine_tune_epochs": int(fine_tune_epochs or 0), "resumed": bool(resume_state)})
+            except Exception as e:
+                print(f"⚠️ Run not registered: {e}")
+
             final_msg = (
                 f"✅ Training and validation completed.\n"
                 f"📊 Labels Distribution:\n"
@@ -86,11 +138,16 @@ def train_val_func(train_set, val_set, mod, num_epochs):
                 f"{val_df['classes'].value_counts().to_string()}\n"
             )
             
-    except gr.Error as ge:
-        raise ge  # Errores de Gradio los dejamos pasar
+    except PipelineError:
+        raise
     except Exception as e:
         print(f"❌ Error during execution: {e}")
-        raise gr.Error(f"❌ Unexpected error: {str(e)}")
-    finally:
-        sys.stdout = sys.__stdout__
-        return final_msg, history_df, image_path
\ No newline at end of file
+        raise PipelineError(f"❌ Unexpected error: {str(e)}") from e
+
+    return {"message": final_msg, "history_df": history_df, "image_path": image_path,
+            "model_directory": model_directory, "model_path": os.path.join(model_directory, f"{model_name}.keras"),
+            "train_samples": len(train_df), "epochs": len(history_df)}
+
+def train_val_func(train_set, val_set, mod, num_epochs, training_mode="Full", fine_tune_epochs=0, resume_from=None):
+    result = run_training(train_set, val_set, mod, num_epochs, training_mode, fine_tune_epochs, resume_from)
+    return result["message"], result["history_df"], result["image_path"]
\ No newline at end of file